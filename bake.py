@@ -0,0 +1,112 @@
+"""Pre-render /api/run responses for every problem to static files.
+
+For each problem's default params (plus any extra param sets given with
+--params) and each option set in core.response_cache.WARM_OPTIONS, writes
+<out>/<key>.json, <key>.json.br and <key>.json.gz, where <key> is the
+response cache key, and a manifest.json describing them. main.py serves
+these files directly when BAKED_DIR points at <out>; a plain static
+server or CDN can serve them using the manifest.
+
+Usage: python bake.py [--out baked] [--jobs N] [--params extra.json]
+
+extra.json maps problem names to lists of param objects, e.g.
+{"N-Queens": [{"n": 4}, {"n": 10}]}.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from core.response_cache import WARM_BR_LEVEL, WARM_GZIP_LEVEL, WARM_OPTIONS, CachedResponse, cache_key
+from core.runner import collect_steps, encode_body, normalize_params
+from problems.registry import discover_problems
+
+MANIFEST_VERSION = 1
+
+_problems = discover_problems()
+
+
+def _write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def bake_one(out: str, name: str, params: dict[str, Any], options: dict[str, Any]) -> dict[str, Any]:
+    """Render one run and write its artifacts; returns its manifest entry."""
+    cls = _problems[name]
+    params = normalize_params(params)
+    key = cache_key(cls, {"problem": name, "params": params, "binary": False, **options})
+    started = time.perf_counter()
+    body, mimetype = encode_body(cls, collect_steps(cls, params), options, binary=False)
+    entry = CachedResponse.build(body, mimetype, WARM_BR_LEVEL, WARM_GZIP_LEVEL)
+    base = Path(out)
+    _write(base / f"{key}.json", body)
+    _write(base / f"{key}.json.br", entry.br)
+    _write(base / f"{key}.json.gz", entry.gzip)
+    return {
+        "key": key,
+        "problem": name,
+        "params": params,
+        "options": options,
+        "mimetype": mimetype,
+        "etag": entry.etag,
+        "bytes": {"json": len(body), "br": len(entry.br), "gz": len(entry.gzip)},
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="baked", help="output directory")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--params", help="JSON file of extra param sets per problem")
+    args = parser.parse_args()
+
+    extra: dict[str, list[dict]] = {}
+    if args.params:
+        extra = json.loads(Path(args.params).read_text())
+        unknown = sorted(set(extra) - set(_problems))
+        if unknown:
+            parser.error(f"unknown problems in {args.params}: {', '.join(unknown)}")
+        for name, param_sets in extra.items():
+            for params in param_sets:
+                unknown = sorted(set(params) - set(_problems[name].default_params()))
+                if unknown:
+                    parser.error(f"unknown params for {name} in {args.params}: {', '.join(unknown)}")
+
+    jobs = []
+    for name, cls in sorted(_problems.items()):
+        for params in [cls.default_params(), *extra.get(name, [])]:
+            for options in WARM_OPTIONS:
+                jobs.append((name, params, options))
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(bake_one, str(out), *job) for job in jobs]
+        runs = [f.result() for f in futures]
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "runs": runs,
+    }
+    _write(out / "manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+    total = sum(r["bytes"]["br"] for r in runs)
+    print(
+        f"Baked {len(runs)} runs into {out}/ in {time.perf_counter() - started:.1f}s "
+        f"({total / 1024:.0f} KB brotli)"
+    )
+
+
+if __name__ == "__main__":
+    main()
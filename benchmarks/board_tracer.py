@@ -0,0 +1,76 @@
+"""Micro-benchmark Board2DTracer mutations, clears and snapshots on a large grid.
+
+Simulates a search over a --size x --size board: every step selects and
+patches a few cells, marks a short path and some overlays, snapshots, then
+calls every clear_all_* / deselect_all / depatch_all helper, as the board
+problems do in their inner loops.
+
+Usage: python -m benchmarks.board_tracer [--size 200] [--steps 2000] [--touched 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from core.tracer import Board2DTracer
+
+
+def run(size: int, steps: int, touched: int, seed: int = 0) -> dict[str, float]:
+    rng = random.Random(seed)
+    cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(steps * touched)]
+    tracer = Board2DTracer(size, size)
+    timings = {"mutate": 0.0, "snapshot": 0.0, "clear": 0.0}
+
+    start = time.perf_counter()
+    tracer.snapshot(0)
+    timings["first_snapshot"] = time.perf_counter() - start
+
+    for s in range(steps):
+        batch = cells[s * touched:(s + 1) * touched]
+        t0 = time.perf_counter()
+        for i, (r, c) in enumerate(batch):
+            tracer.set_value(r, c, s)
+            tracer.select(r, c)
+            if i % 2:
+                tracer.patch(r, c)
+            if i % 3 == 0:
+                tracer.mark_on_path(r, c)
+            if i % 4 == 0:
+                tracer.set_overlay(r, c, str(s), "#f00")
+                tracer.set_arrow(r, c, "right")
+            if i % 5 == 0:
+                tracer.mark_error(r, c)
+        t1 = time.perf_counter()
+        tracer.snapshot(s + 1)
+        t2 = time.perf_counter()
+        tracer.deselect_all()
+        tracer.depatch_all()
+        tracer.clear_all_errors()
+        tracer.clear_all_paths()
+        tracer.clear_all_overlays()
+        t3 = time.perf_counter()
+        timings["mutate"] += t1 - t0
+        timings["snapshot"] += t2 - t1
+        timings["clear"] += t3 - t2
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--touched", type=int, default=8, help="cells touched per step")
+    args = parser.parse_args()
+
+    timings = run(args.size, args.steps, args.touched)
+    print(f"{args.size}x{args.size} board, {args.steps} steps, {args.touched} cells/step")
+    for phase in ("first_snapshot", "mutate", "snapshot", "clear", "total"):
+        per_step = "" if phase == "first_snapshot" else f"  ({timings[phase] / args.steps * 1e6:.1f} us/step)"
+        print(f"  {phase:15} {timings[phase] * 1000:10.2f} ms{per_step}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Micro-benchmark GraphTracer edge mutations, clears and snapshots on a dense graph.
+
+Simulates a relaxation loop over an undirected complete graph on --nodes
+nodes: every step selects, classes and patches a few edges (named in either
+orientation), snapshots, then calls deselect_all_edges / depatch_all_edges
+/ clear_all_edge_errors, as the shortest-path and MST problems do.
+
+Usage: python -m benchmarks.graph_tracer [--nodes 150] [--steps 2000] [--touched 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from core.tracer import GraphTracer
+
+
+def run(nodes: int, steps: int, touched: int, seed: int = 0) -> dict[str, float]:
+    rng = random.Random(seed)
+    pairs = [tuple(rng.sample(range(nodes), 2)) for _ in range(steps * touched)]
+    tracer = GraphTracer(list(range(nodes)), directed=False)
+    for u in range(nodes):
+        for v in range(u + 1, nodes):
+            tracer.add_edge(u, v, u + v)
+    timings = {"mutate": 0.0, "snapshot": 0.0, "clear": 0.0}
+
+    start = time.perf_counter()
+    tracer.snapshot(0)
+    timings["first_snapshot"] = time.perf_counter() - start
+
+    for s in range(steps):
+        batch = pairs[s * touched:(s + 1) * touched]
+        t0 = time.perf_counter()
+        for i, (u, v) in enumerate(batch):
+            tracer.select_edge(u, v)
+            if i % 2:
+                tracer.set_edge_class(u, v, "relaxed")
+                tracer.patch_edge(u, v)
+            if i % 5 == 0:
+                tracer.mark_edge_error(u, v)
+        t1 = time.perf_counter()
+        tracer.snapshot(s + 1)
+        t2 = time.perf_counter()
+        tracer.deselect_all_edges()
+        tracer.depatch_all_edges()
+        tracer.clear_all_edge_errors()
+        t3 = time.perf_counter()
+        timings["mutate"] += t1 - t0
+        timings["snapshot"] += t2 - t1
+        timings["clear"] += t3 - t2
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=150)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--touched", type=int, default=8, help="edges touched per step")
+    args = parser.parse_args()
+
+    timings = run(args.nodes, args.steps, args.touched)
+    edges = args.nodes * (args.nodes - 1) // 2
+    print(f"{args.nodes} nodes, {edges} edges, {args.steps} steps, {args.touched} edges/step")
+    for phase in ("first_snapshot", "mutate", "snapshot", "clear", "total"):
+        per_step = "" if phase == "first_snapshot" else f"  ({timings[phase] / args.steps * 1e6:.1f} us/step)"
+        print(f"  {phase:15} {timings[phase] * 1000:10.2f} ms{per_step}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark GraphTracer.set_force_layout and set_layered_layout on random sparse graphs.
+
+For each --sizes node count this lays out a random connected graph with
+1.5 edges per node (directed from lower to higher node, so it is a DAG),
+cold (best of --repeat, memo cleared) and memoized, with both layouts, and
+reports which backend (NumPy or pure Python) the force layout used. A cold
+layout slower than --budget seconds is marked FAIL and makes the exit
+status 1.
+
+Usage: python -m benchmarks.layout [--sizes 100,1000,5000] [--repeat 3] [--budget 1.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+from core import layout
+from core.tracer import GraphTracer
+
+
+def random_graph(n: int, seed: int = 0) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    tree = [(rng.randrange(i), i) for i in range(1, n)]
+    extra = (sorted(rng.sample(range(n), 2)) for _ in range(n // 2))
+    return tree + [(u, v) for u, v in extra]
+
+
+def bench(tracer: GraphTracer, method: str, repeat: int) -> tuple[float, float]:
+    """Cold (best of ``repeat``) and memoized seconds of ``tracer.<method>()``."""
+    cold = float("inf")
+    for _ in range(repeat):
+        layout._cache.clear()
+        start = time.perf_counter()
+        getattr(tracer, method)()
+        cold = min(cold, time.perf_counter() - start)
+    start = time.perf_counter()
+    getattr(tracer, method)()
+    return cold, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma-separated node counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.0, help="max seconds for a cold layout")
+    args = parser.parse_args()
+
+    print(f"force layout backend: {'numpy' if layout.np is not None else 'pure Python'}")
+    print(f"  {'nodes':>6} {'iters':>5} {'force ms':>10} {'memo ms':>10} {'layered ms':>11} {'memo ms':>10}  "
+          f"budget {args.budget:g}s")
+    failed = False
+    for n in (int(s) for s in args.sizes.split(",")):
+        tracer = GraphTracer(list(range(n)), directed=True)
+        for u, v in random_graph(n):
+            tracer.add_edge(u, v)
+        force, force_memo = bench(tracer, "set_force_layout", args.repeat)
+        layered, layered_memo = bench(tracer, "set_layered_layout", args.repeat)
+        ok = max(force, layered) <= args.budget
+        failed |= not ok
+        print(f"  {n:>6} {layout.default_iterations(n):>5} {force * 1000:>10.2f} {force_memo * 1000:>10.2f} "
+              f"{layered * 1000:>11.2f} {layered_memo * 1000:>10.2f}  {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure step-generation memory per problem with tracemalloc.
+
+For each problem this reports the tracemalloc peak while running
+generate_steps, the memory retained by the resulting steps, and the
+retained size of an equivalent trace in which every cell/node/edge/panel
+state is a separate object (what the tracers produced before interning).
+
+Usage: python -m benchmarks.memory [--top N] [--all]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import resource
+import tracemalloc
+from dataclasses import fields, is_dataclass, replace
+from typing import Any
+
+from problems.registry import discover_problems
+
+
+def _unshared(obj: Any) -> Any:
+    """Rebuild ``obj`` so that no frozen state instance is shared."""
+    if isinstance(obj, tuple):
+        return tuple(_unshared(o) for o in obj)
+    if is_dataclass(obj):
+        return replace(obj, **{
+            f.name: _unshared(getattr(obj, f.name))
+            for f in fields(obj)
+            if isinstance(getattr(obj, f.name), tuple)
+        })
+    return obj
+
+
+def _traced(fn) -> tuple[Any, int, int]:
+    """Run ``fn`` under tracemalloc; return (result, peak bytes, retained bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=10, help="show the N heaviest problems")
+    parser.add_argument("--all", action="store_true", help="show every problem")
+    args = parser.parse_args()
+
+    rows = []
+    for name, cls in sorted(discover_problems().items()):
+        steps, peak, retained = _traced(lambda: cls.generate_steps(**cls.default_params()))
+        unshared, _, unshared_retained = _traced(lambda: [_unshared(s) for s in steps])
+        del unshared
+        rows.append((name, len(steps), peak, retained, unshared_retained))
+
+    rows.sort(key=lambda r: r[4], reverse=True)
+    if not args.all:
+        rows = rows[: args.top]
+
+    mb = 1024 * 1024
+    header = f"{'problem':34} {'steps':>6} {'peak MB':>9} {'retained MB':>12} {'unshared MB':>12} {'ratio':>6}"
+    print(header)
+    print("-" * len(header))
+    for name, count, peak, retained, unshared_retained in rows:
+        ratio = unshared_retained / retained if retained else 0.0
+        print(
+            f"{name[:34]:34} {count:>6} {peak / mb:>9.2f} {retained / mb:>12.2f} "
+            f"{unshared_retained / mb:>12.2f} {ratio:>5.1f}x"
+        )
+    # ru_maxrss is KiB on Linux.
+    print(f"\nprocess peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
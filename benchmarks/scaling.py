@@ -0,0 +1,170 @@
+"""Sweep problems over increasing input sizes and fit their growth.
+
+For every problem that declares Problem.scaling_inputs() (random grids,
+graphs or boards of increasing size, see problems/_inputs.py), this runs
+each input size and measures generate_steps time (best of --repeat), step
+count and tracemalloc peak. A size that raises (e.g. RecursionError from a
+recursive DFS) ends that problem's sweep and is reported as where it
+breaks; so is a size slower than --max-seconds, after it is measured.
+
+It fits time, steps and memory against size both as a power law (size^k)
+and as an exponential (b^size), and reports whichever fits better (R^2).
+At the largest size it also profiles the run and reports the share of
+time spent in the tracers (core/tracer.py, core/step.py), flagging
+problems where tracing rather than the algorithm dominates.
+
+Usage: python -m benchmarks.scaling [--problem NAME] [--repeat N] [--max-seconds S] [--json PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import gc
+import json
+import math
+import os
+import pstats
+import tracemalloc
+
+from benchmarks.suite import _best_time
+from problems.registry import discover_problems
+
+_TRACING_FILES = (os.path.join("core", "tracer.py"), os.path.join("core", "step.py"))
+
+
+def _fit(xs: list[float], ys: list[float]) -> tuple[float, float]:
+    """Least-squares slope and R^2 of ys against xs."""
+    n = len(xs)
+    mx, my = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mx) ** 2 for x in xs)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    syy = sum((y - my) ** 2 for y in ys)
+    if sxx == 0:
+        return 0.0, 0.0
+    slope = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy else 1.0
+    return slope, r2
+
+
+def growth(sizes: list[int], values: list[float]) -> str:
+    """Describe how ``values`` grow with ``sizes``: ``O(n^k)`` or ``O(b^n)``."""
+    points = [(s, v) for s, v in zip(sizes, values) if s > 0 and v > 0]
+    if len(points) < 3:
+        return "n/a"
+    xs, ys = [p[0] for p in points], [math.log(p[1]) for p in points]
+    power, power_r2 = _fit([math.log(x) for x in xs], ys)
+    base, exp_r2 = _fit(xs, ys)
+    if exp_r2 > power_r2 and base > 0.05:
+        return f"O({math.exp(base):.2f}^n) r2={exp_r2:.2f}"
+    return f"O(n^{power:.2f}) r2={power_r2:.2f}"
+
+
+def _is_tracing(filename: str) -> bool:
+    return filename.endswith(_TRACING_FILES)
+
+
+def tracing_share(cls, params: dict) -> float:
+    """Fraction of profiled time spent in tracer/step code (and builtins it calls)."""
+    profile = cProfile.Profile()
+    profile.enable()
+    cls.generate_steps(**params)
+    profile.disable()
+    stats = pstats.Stats(profile).stats
+    total = tracing = 0.0
+    for (filename, _, _), (_, _, tottime, _, callers) in stats.items():
+        total += tottime
+        if _is_tracing(filename):
+            tracing += tottime
+        elif filename == "~":
+            # Builtins: attribute the time spent on behalf of tracer callers.
+            tracing += sum(c[2] for (f, _, _), c in callers.items() if _is_tracing(f))
+    return tracing / total if total else 0.0
+
+
+def _peak_memory(fn) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def sweep(cls, repeat: int, max_seconds: float) -> dict:
+    points = []
+    stopped = None
+    for size, params in cls.scaling_inputs():
+        try:
+            ms, steps = _best_time(lambda: cls.generate_steps(**params), repeat)
+            seconds = ms / 1000
+        except Exception as exc:
+            stopped = f"fails at size {size}: {type(exc).__name__}: {exc}"
+            break
+        peak = _peak_memory(lambda: cls.generate_steps(**params))
+        points.append({"size": size, "params": params, "seconds": seconds, "steps": len(steps), "peak_bytes": peak})
+        if seconds > max_seconds:
+            stopped = f"stopped after size {size}: {seconds:.1f}s > --max-seconds"
+            break
+    sizes = [p["size"] for p in points]
+    return {
+        "points": points,
+        "stopped": stopped,
+        "time_growth": growth(sizes, [p["seconds"] for p in points]),
+        "steps_growth": growth(sizes, [p["steps"] for p in points]),
+        "memory_growth": growth(sizes, [p["peak_bytes"] for p in points]),
+        "tracing_share": tracing_share(cls, points[-1]["params"]) if points else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--problem", action="append", help="only sweep these problems (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--overhead", type=float, default=0.5, help="flag tracing shares above this (default 0.5)")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="stop a sweep after a slower size (default 10)")
+    parser.add_argument("--json", help="write results to this path")
+    args = parser.parse_args()
+
+    problems = discover_problems()
+    names = sorted(args.problem or problems)
+    unknown = [n for n in names if n not in problems]
+    if unknown:
+        parser.error(f"unknown problems: {', '.join(unknown)}")
+
+    results = {}
+    fixed = []
+    for name in names:
+        cls = problems[name]
+        if cls.scaling_inputs():
+            results[name] = sweep(cls, args.repeat, args.max_seconds)
+        else:
+            fixed.append(name)
+
+    for name, r in results.items():
+        flag = "  <- tracing dominates" if r["tracing_share"] > args.overhead else ""
+        print(f"{name}: time {r['time_growth']}, steps {r['steps_growth']}, "
+              f"memory {r['memory_growth']}, tracing {r['tracing_share']:.0%}{flag}")
+        print(f"  {'size':>6} {'ms':>10} {'steps':>9} {'peak MB':>9} {'us/step':>8}")
+        for p in r["points"]:
+            per_step = p["seconds"] / p["steps"] * 1e6 if p["steps"] else 0.0
+            print(f"  {p['size']:>6} {p['seconds'] * 1000:>10.2f} {p['steps']:>9} "
+                  f"{p['peak_bytes'] / (1024 * 1024):>9.2f} {per_step:>8.1f}")
+        if r["stopped"]:
+            print(f"  {r['stopped']}")
+    limited = {name: r["stopped"] for name, r in results.items() if r["stopped"]}
+    if limited:
+        print(f"\nNot safe at the largest swept size ({len(limited)}):")
+        for name, reason in limited.items():
+            print(f"  {name}: {reason}")
+    if fixed:
+        print(f"\n{len(fixed)} problems only run fixed preset inputs (no scaling_inputs()); not swept.")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"swept": results, "fixed": fixed}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
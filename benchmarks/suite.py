@@ -0,0 +1,154 @@
+"""End-to-end benchmark of every registered problem, with a regression check.
+
+For each problem's default params this measures generate_steps,
+Step.to_dict(compact=True/False) over all steps, JSON encoding of the
+compact steps and of the app's /api/run body (core.encoding.encode_run
+with the options static/js/app.js requests), and brotli/gzip compression
+of that body, plus step counts and payload sizes. Times are the best of
+--repeat runs.
+
+Usage:
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json [--threshold 0.25]
+
+--compare exits with status 1 if any problem's time or size metric grew by
+more than --threshold (relative) versus the baseline. Time increases
+smaller than --min-ms are ignored as noise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+import time
+
+import brotli
+
+from core.encoding import encode_run
+from problems.registry import discover_problems
+
+# What main.py stores and what static/js/app.js asks for.
+BROTLI_QUALITY = 9
+GZIP_LEVEL = 6
+APP_OPTIONS = {"compact": True, "delta": True, "header": True, "board_format": "columnar", "log_timeline": True}
+
+TIME_METRICS = ("generate_ms", "to_dict_compact_ms", "to_dict_full_ms", "json_ms", "encode_run_ms", "br_ms", "gzip_ms")
+SIZE_METRICS = ("json_bytes", "body_bytes", "br_bytes", "gzip_bytes")
+
+
+def _best_time(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def bench_problem(cls, repeat: int) -> dict:
+    params = cls.default_params()
+    generate_ms, steps = _best_time(lambda: cls.generate_steps(**params), repeat)
+    compact_ms, compact = _best_time(lambda: [s.to_dict(compact=True) for s in steps], repeat)
+    full_ms, _ = _best_time(lambda: [s.to_dict(compact=False) for s in steps], repeat)
+    json_ms, json_body = _best_time(lambda: json.dumps(compact, separators=(",", ":")).encode("utf-8"), repeat)
+
+    def app_body() -> bytes:
+        run = {
+            "source_code": cls.source_code(),
+            "renderer_type": cls.renderer_type(),
+            **encode_run(steps, **APP_OPTIONS),
+        }
+        return json.dumps(run, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    encode_run_ms, body = _best_time(app_body, repeat)
+    br_ms, br = _best_time(lambda: brotli.compress(body, quality=BROTLI_QUALITY), repeat)
+    gzip_ms, gz = _best_time(lambda: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), repeat)
+    return {
+        "steps": len(steps),
+        "generate_ms": generate_ms,
+        "to_dict_compact_ms": compact_ms,
+        "to_dict_full_ms": full_ms,
+        "json_ms": json_ms,
+        "encode_run_ms": encode_run_ms,
+        "br_ms": br_ms,
+        "gzip_ms": gzip_ms,
+        "json_bytes": len(json_body),
+        "body_bytes": len(body),
+        "br_bytes": len(br),
+        "gzip_bytes": len(gz),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_ms: float) -> list[str]:
+    """Return a line per metric that regressed beyond ``threshold``."""
+    regressions = []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if row["steps"] != base["steps"]:
+            print(f"note: {name} step count changed {base['steps']} -> {row['steps']}")
+        for metric in (*TIME_METRICS, *SIZE_METRICS):
+            old, new = base.get(metric), row[metric]
+            if not old:
+                continue
+            if metric in TIME_METRICS and new - old < min_ms:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--problem", action="append", help="only run these problems (repeatable)")
+    parser.add_argument("--save", help="write results to this baseline path")
+    parser.add_argument("--compare", help="baseline to check against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative growth (default 0.25)")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="ignore time increases below this (default 2ms)")
+    args = parser.parse_args()
+
+    problems = discover_problems()
+    names = sorted(args.problem or problems)
+    unknown = [n for n in names if n not in problems]
+    if unknown:
+        parser.error(f"unknown problems: {', '.join(unknown)}")
+
+    results = {name: bench_problem(problems[name], args.repeat) for name in names}
+
+    header = (
+        f"{'problem':34} {'steps':>6} {'gen ms':>8} {'dict ms':>8} {'json ms':>8} "
+        f"{'body ms':>8} {'br ms':>7} {'gz ms':>7} {'body KB':>9} {'br KB':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name[:34]:34} {r['steps']:>6} {r['generate_ms']:>8.2f} {r['to_dict_compact_ms']:>8.2f} "
+            f"{r['json_ms']:>8.2f} {r['encode_run_ms']:>8.2f} {r['br_ms']:>7.2f} {r['gzip_ms']:>7.2f} "
+            f"{r['body_bytes'] / 1024:>9.1f} {r['br_bytes'] / 1024:>7.1f}"
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nbaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
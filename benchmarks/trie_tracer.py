@@ -0,0 +1,75 @@
+"""Micro-benchmark TrieTracer inserts, flag clears and snapshots on a growing trie.
+
+Inserts --words random lowercase words (length 3-10) one by one, the way
+the trie problems do: every character selects the node it walks through
+and every new node adds an edge and snapshots. After each word the
+selection is cleared and the word's end node is patched.
+
+Usage: python -m benchmarks.trie_tracer [--words 300] [--alphabet 6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from core.tracer import TrieTracer
+
+
+def run(words: int, alphabet: int, seed: int = 0) -> dict[str, float]:
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase[:alphabet]
+    vocab = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(words)]
+    tracer = TrieTracer()
+    root = tracer.add_node(label="")
+    children: dict[tuple[int, str], int] = {}
+    timings = {"insert": 0.0, "snapshot": 0.0, "clear": 0.0}
+    steps = 0
+
+    start = time.perf_counter()
+    for word in vocab:
+        node = root
+        for ch in word:
+            t0 = time.perf_counter()
+            nxt = children.get((node, ch))
+            if nxt is None:
+                nxt = children[(node, ch)] = tracer.add_node(label=ch)
+                tracer.add_edge(node, nxt, ch)
+            tracer.select_node(nxt)
+            tracer.select_edge(node, nxt)
+            t1 = time.perf_counter()
+            tracer.snapshot(steps)
+            t2 = time.perf_counter()
+            timings["insert"] += t1 - t0
+            timings["snapshot"] += t2 - t1
+            steps += 1
+            node = nxt
+        t0 = time.perf_counter()
+        tracer.set_end(node)
+        tracer.deselect_all_nodes()
+        tracer.deselect_all_edges()
+        tracer.patch_node(node)
+        timings["clear"] += time.perf_counter() - t0
+    timings["total"] = time.perf_counter() - start
+    timings["steps"] = steps
+    timings["nodes"] = len(children) + 1
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--alphabet", type=int, default=6, help="distinct letters used")
+    args = parser.parse_args()
+
+    timings = run(args.words, args.alphabet)
+    steps = int(timings["steps"])
+    print(f"{args.words} words, {int(timings['nodes'])} nodes, {steps} snapshots")
+    for phase in ("insert", "snapshot", "clear", "total"):
+        print(f"  {phase:10} {timings[phase] * 1000:10.2f} ms  ({timings[phase] / steps * 1e6:.1f} us/step)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare the JSON and binary /api/run encodings for every problem.
+
+Usage: python -m benchmarks.wire_format [--repeat N] [--json PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import brotli
+
+from core.wire import encode_binary
+from problems.registry import discover_problems
+
+# Flask-Compress defaults to brotli quality 4 for responses.
+BROTLI_QUALITY = 4
+
+
+def _best_time(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write per-problem results to this path")
+    args = parser.parse_args()
+
+    rows = []
+    for name, cls in sorted(discover_problems().items()):
+        steps = cls.generate_steps(**cls.default_params())
+        meta = {"source_code": cls.source_code(), "renderer_type": cls.renderer_type()}
+
+        def encode_json() -> bytes:
+            payload = {**meta, "steps": [s.to_dict(compact=True) for s in steps]}
+            return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+        json_s, json_body = _best_time(encode_json, args.repeat)
+        bin_s, bin_body = _best_time(lambda: encode_binary(steps, meta), args.repeat)
+        rows.append({
+            "problem": name,
+            "steps": len(steps),
+            "json_ms": json_s * 1000,
+            "binary_ms": bin_s * 1000,
+            "json_bytes": len(json_body),
+            "binary_bytes": len(bin_body),
+            "json_br_bytes": len(brotli.compress(json_body, quality=BROTLI_QUALITY)),
+            "binary_br_bytes": len(brotli.compress(bin_body, quality=BROTLI_QUALITY)),
+        })
+
+    header = f"{'problem':34} {'steps':>6} {'json ms':>9} {'bin ms':>8} {'json KB':>9} {'bin KB':>8} {'json br':>8} {'bin br':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['problem'][:34]:34} {r['steps']:>6} {r['json_ms']:>9.2f} {r['binary_ms']:>8.2f} "
+            f"{r['json_bytes'] / 1024:>9.1f} {r['binary_bytes'] / 1024:>8.1f} "
+            f"{r['json_br_bytes'] / 1024:>8.1f} {r['binary_br_bytes'] / 1024:>8.1f}"
+        )
+    totals = {k: sum(r[k] for r in rows) for k in rows[0] if k != "problem"}
+    print("-" * len(header))
+    print(
+        f"{'TOTAL':34} {totals['steps']:>6} {totals['json_ms']:>9.2f} {totals['binary_ms']:>8.2f} "
+        f"{totals['json_bytes'] / 1024:>9.1f} {totals['binary_bytes'] / 1024:>8.1f} "
+        f"{totals['json_br_bytes'] / 1024:>8.1f} {totals['binary_br_bytes'] / 1024:>8.1f}"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from core.metrics import Metrics
+
+
+class AdmissionRejected(Exception):
+    """The run queue is full (or the wait timed out); retry after ``retry_after`` seconds.
+
+    ``reason`` is ``"full"`` or ``"timeout"``.
+    """
+
+    def __init__(self, retry_after: int, reason: str = "full") -> None:
+        self.retry_after = retry_after
+        self.reason = reason
+        super().__init__(f"Server busy, retry in {retry_after}s")
+
+
+class AdmissionControl:
+    """Limit concurrent uncached runs, queueing a bounded number of the rest.
+
+    At most ``max_active`` callers hold a slot at once; up to ``max_queued``
+    more wait (each for at most ``queue_timeout`` seconds) and anything beyond
+    that is rejected immediately. ``Retry-After`` hints are estimated from the
+    average run time and the current backlog.
+
+    With ``metrics`` set, queue depth, active runs, queue waits and rejections
+    are also recorded there as ``algoviz_admission_*`` series.
+    """
+
+    def __init__(
+        self, max_active: int, max_queued: int, queue_timeout: float, metrics: Metrics | None = None,
+    ) -> None:
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.gauge("algoviz_admission_active", "Uncached runs holding an admission slot.")
+            metrics.gauge("algoviz_admission_queued", "Uncached runs waiting for an admission slot.")
+            metrics.histogram("algoviz_admission_wait_seconds", "Time admitted runs waited in the queue.")
+            metrics.counter("algoviz_admission_rejected_total", "Runs rejected with a 429, by reason (full, timeout).")
+        self._cond = threading.Condition()
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._avg_run_seconds = 1.0
+
+    def _record(self, waited: float | None = None, rejected: str | None = None) -> None:
+        # Called with the condition held, so gauge updates land in order.
+        if self.metrics is None:
+            return
+        self.metrics.set("algoviz_admission_active", {}, self.active)
+        self.metrics.set("algoviz_admission_queued", {}, self.queued)
+        if waited is not None:
+            self.metrics.observe("algoviz_admission_wait_seconds", {}, waited)
+        if rejected is not None:
+            self.metrics.inc("algoviz_admission_rejected_total", {"reason": rejected})
+
+    def _retry_after(self) -> int:
+        backlog = self.active + self.queued + 1
+        return max(1, math.ceil(self._avg_run_seconds * backlog / self.max_active))
+
+    def acquire(self) -> float:
+        """Take a slot, waiting in the queue if needed; returns the time waited."""
+        with self._cond:
+            if self.active < self.max_active and self.queued == 0:
+                self.active += 1
+                self.admitted += 1
+                self._record(waited=0.0)
+                return 0.0
+            if self.queued >= self.max_queued:
+                self.rejected += 1
+                self._record(rejected="full")
+                raise AdmissionRejected(self._retry_after())
+            self.queued += 1
+            self._record()
+            started = time.monotonic()
+            deadline = started + self.queue_timeout
+            try:
+                while self.active >= self.max_active:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        self.timed_out += 1
+                        self._record(rejected="timeout")
+                        raise AdmissionRejected(self._retry_after(), "timeout")
+                    self._cond.wait(remaining)
+            finally:
+                self.queued -= 1
+                self._record()
+            waited = time.monotonic() - started
+            self.active += 1
+            self.admitted += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            self._record(waited=waited)
+            return waited
+
+    def release(self, run_seconds: float) -> None:
+        with self._cond:
+            self.active -= 1
+            self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * run_seconds
+            self._record()
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[float]:
+        """Hold a slot for the duration of the block; yields the time waited."""
+        waited = self.acquire()
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(time.monotonic() - started)
+
+    def stats(self) -> dict[str, float]:
+        with self._cond:
+            return {
+                "active": self.active,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "wait_seconds_total": round(self.wait_seconds, 3),
+                "wait_seconds_max": round(self.max_wait_seconds, 3),
+            }
@@ -0,0 +1,441 @@
+from __future__ import annotations
+
+import base64
+import sys
+from array import array
+from dataclasses import replace
+from itertools import compress
+from operator import attrgetter
+from typing import Any, Iterable
+
+from core.step import CellState, GraphEdge, GraphNode, Step, TrieEdge, TrieNode, trie_positions
+from core.tracer import MAX_LOG_MESSAGES_PER_STEP
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+
+# Longest run of appended entries the tail op will search for. Log windows and
+# queue-like aux panels grow by a handful of entries per step.
+_MAX_TAIL_APPEND = 8
+
+_NO_CHANGE = object()
+
+
+def _is_container(d: dict) -> bool:
+    return any(isinstance(v, (list, dict)) for v in d.values())
+
+
+def _tail_op(prev: list, cur: list) -> list | None:
+    """Return ["T", drop, appended] if cur == prev[drop:] + appended."""
+    # A growing list needs added >= len(cur) - len(prev); keeping nothing is a plain replace.
+    for added in range(max(0, len(cur) - len(prev)), min(len(cur) - 1, _MAX_TAIL_APPEND) + 1):
+        kept = len(cur) - added
+        drop = len(prev) - kept
+        if prev[drop:] == cur[:kept]:
+            return ["T", drop, cur[kept:]]
+    return None
+
+
+def _diff_list(prev: list, cur: list) -> list:
+    if len(prev) == len(cur):
+        patch: list[Any] = []
+        for i, (p, c) in enumerate(zip(prev, cur)):
+            op = _diff(p, c)
+            if op is not _NO_CHANGE:
+                patch.append(i)
+                patch.append(op)
+        if len(patch) <= len(cur):
+            return ["L", patch]
+    tail = _tail_op(prev, cur)
+    if tail is not None:
+        return tail
+    return ["=", cur]
+
+
+def _diff_dict(prev: dict, cur: dict) -> list:
+    changed: dict[str, Any] = {}
+    for key, value in cur.items():
+        if key not in prev:
+            changed[key] = ["=", value]
+            continue
+        op = _diff(prev[key], value)
+        if op is not _NO_CHANGE:
+            changed[key] = op
+    removed = [key for key in prev if key not in cur]
+    return ["O", changed, removed]
+
+
+def _diff(prev: Any, cur: Any) -> Any:
+    """Diff two JSON-ready values.
+
+    Ops: ["=", value] replaces, ["L", [i, op, ...]] patches a list by index,
+    ["T", drop, items] drops a prefix and appends, ["O", {key: op}, [removed]]
+    patches a dict. Leaf dicts (cells, nodes, edges) are always replaced whole.
+    """
+    if type(prev) is type(cur) and prev == cur:
+        return _NO_CHANGE
+    if isinstance(prev, list) and isinstance(cur, list):
+        return _diff_list(prev, cur)
+    if isinstance(prev, dict) and isinstance(cur, dict) and _is_container(cur):
+        return _diff_dict(prev, cur)
+    return ["=", cur]
+
+
+class DeltaEncoder:
+    """Stateful encoder for delta frames, so runs can be encoded in chunks.
+
+    Every ``keyframe_interval``-th frame is ``{"k": step}``; the others are
+    ``{"d": {key: op}}`` (plus ``"x": [removed keys]``) against the previous
+    step, so the client can seek by replaying from the nearest keyframe.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+        self.interval = max(1, keyframe_interval)
+        self.count = 0
+        self._prev: dict | None = None
+
+    def frame(self, cur: dict) -> dict:
+        if self._prev is None or self.count % self.interval == 0:
+            frame: dict[str, Any] = {"k": cur}
+        else:
+            _, changed, removed = _diff_dict(self._prev, cur)
+            frame = {"d": changed}
+            if removed:
+                frame["x"] = removed
+        self._prev = cur
+        self.count += 1
+        return frame
+
+
+def encode_delta(
+    step_dicts: list[dict], keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+) -> list[dict]:
+    """Encode serialized steps as keyframes plus per-step diffs (see DeltaEncoder)."""
+    encoder = DeltaEncoder(keyframe_interval)
+    return [encoder.frame(d) for d in step_dicts]
+
+
+def _flags(d: dict, item: Any, compact: bool) -> dict:
+    if not compact or item.selected:
+        d["selected"] = item.selected
+    if not compact or item.patched:
+        d["patched"] = item.patched
+    if not compact or item.error:
+        d["error"] = item.error
+    return d
+
+
+class RunHeader:
+    """Run-level tables for graph/trie structure that rarely changes.
+
+    Each distinct (id, label, x, y) node and (source, target, directed,
+    weight) edge is stored once; steps then reference rows by index and only
+    carry their dynamic flags.
+    """
+
+    def __init__(self, compact: bool = True) -> None:
+        self.compact = compact
+        self._tables: dict[str, list[dict]] = {}
+        self._index: dict[str, dict[tuple, int]] = {}
+
+    def _row(self, table: str, key: tuple, fields: tuple[str, ...]) -> int:
+        index = self._index.setdefault(table, {})
+        row = index.get(key)
+        if row is None:
+            rows = self._tables.setdefault(table, [])
+            row = index[key] = len(rows)
+            rows.append({f: v for f, v in zip(fields, key) if v is not None})
+        return row
+
+    def graph_node(self, node: GraphNode) -> dict:
+        d = _flags({"n": self._row(
+            "graph_nodes", (node.id, node.label, node.x, node.y), ("id", "label", "x", "y"),
+        )}, node, self.compact)
+        if node.color:
+            d["color"] = node.color
+        if node.badge:
+            d["badge"] = node.badge
+        if node.badge_color:
+            d["badge_color"] = node.badge_color
+        if node.group is not None:
+            d["group"] = node.group
+        return d
+
+    def graph_edge(self, edge: GraphEdge) -> dict:
+        d = _flags({"e": self._row(
+            "graph_edges", (edge.source, edge.target, edge.directed, edge.weight),
+            ("source", "target", "directed", "weight"),
+        )}, edge, self.compact)
+        if edge.label:
+            d["label"] = edge.label
+        if edge.edge_class:
+            d["edge_class"] = edge.edge_class
+        if edge.curve_offset != 0.0:
+            d["curve_offset"] = edge.curve_offset
+        return d
+
+    def trie_node(self, node: TrieNode, position: tuple[float, float]) -> dict:
+        d = _flags({"n": self._row(
+            "trie_nodes", (node.id, node.label, *position), ("id", "label", "x", "y"),
+        )}, node, self.compact)
+        if not self.compact or node.is_end:
+            d["is_end"] = node.is_end
+        return d
+
+    def trie_edge(self, edge: TrieEdge) -> dict:
+        return _flags({"e": self._row(
+            "trie_edges", (edge.source, edge.target, edge.label), ("source", "target", "label"),
+        )}, edge, self.compact)
+
+    def fill(self, step: Step, d: dict) -> None:
+        """Add header-referencing graph/trie items for ``step`` to ``d``."""
+        if step.graph_nodes is not None:
+            d["graph_nodes"] = [self.graph_node(n) for n in step.graph_nodes]
+            if not self.compact or step.graph_edges:
+                d["graph_edges"] = [self.graph_edge(e) for e in (step.graph_edges or ())]
+        if step.trie_nodes is not None:
+            positions = trie_positions(step.trie_nodes)
+            d["trie_nodes"] = [self.trie_node(n, positions[n.id]) for n in step.trie_nodes]
+            if not self.compact or step.trie_edges:
+                d["trie_edges"] = [self.trie_edge(e) for e in (step.trie_edges or ())]
+
+    def to_dict(self) -> dict:
+        return dict(self._tables)
+
+
+class LogTimeline:
+    """One append-only log for a whole run, replacing per-step log windows.
+
+    Each step's ``log_messages`` window is the tail of its tracer's log, so
+    consecutive steps only add ``log_count`` deltas. Steps then carry
+    ``log_end`` (and ``log_start`` when the window doesn't simply reach back
+    ``window`` entries or to the start of the log). A new segment is started
+    whenever a window doesn't continue the previous one, e.g. when a problem
+    switches to a fresh tracer.
+    """
+
+    def __init__(self, window: int = MAX_LOG_MESSAGES_PER_STEP) -> None:
+        self.window = window
+        self.messages: list[str] = []
+        self._segment_start = 0
+        self._count = 0
+
+    def _continues(self, window: tuple[str, ...], added: int) -> bool:
+        kept = len(window) - added
+        if added < 0 or kept < 0 or kept > len(self.messages) - self._segment_start:
+            return False
+        return kept == 0 or self.messages[-kept:] == list(window[:kept])
+
+    def cursor(self, step: Step) -> dict:
+        window = step.log_messages
+        added = step.log_count - self._count
+        if not self._continues(window, added):
+            self._segment_start = len(self.messages)
+            added = len(window)
+        self.messages.extend(window[len(window) - added:])
+        self._count = step.log_count
+        end = len(self.messages)
+        start = end - len(window)
+        d = {"log_end": end}
+        if start != max(0, end - self.window):
+            d["log_start"] = start
+        return d
+
+
+def _pack_bits(bits: list[bool]) -> str:
+    packed = bytearray((len(bits) + 7) >> 3)
+    for i in compress(range(len(bits)), bits):
+        packed[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(packed).decode("ascii")
+
+
+def _pack_uints(values: list[int]) -> tuple[str, int]:
+    """Pack non-negative ints as little-endian base64; returns (data, byte width)."""
+    top = max(values, default=0)
+    if top < 1 << 8:
+        return base64.b64encode(bytes(values)).decode("ascii"), 1
+    packed = array("H" if top < 1 << 16 else "I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii"), packed.itemsize
+
+
+class ColumnarBoard:
+    """Columnar encoding for ``Step.board``.
+
+    A board becomes ``{"rows", "cols", "values"}`` in row-major order, where
+    values index the run-level value table. Standalone runs pack values as
+    base64 little-endian uints of ``value_width`` bytes; delta runs keep a
+    plain int list so diffs can patch single cells. Boolean flags become
+    base64 bitmask planes (bit i = cell i, LSB first) and overlay/arrow
+    strings are sparse ``[cell, string index, ...]`` pairs into the run-level
+    string table. All-false/empty planes are omitted.
+    """
+
+    BIT_PLANES = ("selected", "patched", "error", "on_path")
+    STRING_PLANES = ("overlay_text", "overlay_color", "arrow_dir")
+
+    def __init__(self, packed: bool = True) -> None:
+        self.packed = packed
+        self._values: list[Any] = []
+        self._value_index: dict[tuple[type, Any], int] = {}
+        self._strings: list[str] = [""]
+        self._string_index: dict[str, int] = {"": 0}
+
+    def _value(self, value: Any) -> int:
+        key = (value.__class__, value)
+        index = self._value_index.get(key)
+        if index is None:
+            index = self._value_index[key] = len(self._values)
+            self._values.append(value)
+        return index
+
+    def _value_indices(self, column: list[Any]) -> list[int]:
+        if len(set(map(type, column))) <= 1:
+            # One value type, so plain equality can't merge e.g. 1 and True.
+            lookup = {v: self._value(v) for v in dict.fromkeys(column)}
+            return list(map(lookup.__getitem__, column))
+        return [self._value(v) for v in column]
+
+    def _string(self, text: str) -> int:
+        index = self._string_index.get(text)
+        if index is None:
+            index = self._string_index[text] = len(self._strings)
+            self._strings.append(text)
+        return index
+
+    def encode(self, board: tuple[tuple[CellState, ...], ...]) -> dict:
+        cells = [cell for row in board for cell in row]
+        values = self._value_indices(list(map(attrgetter("value"), cells)))
+        d: dict[str, Any] = {"rows": len(board), "cols": len(board[0]) if board else 0}
+        if self.packed:
+            d["values"], d["value_width"] = _pack_uints(values)
+        else:
+            d["values"] = values
+        for plane in self.BIT_PLANES:
+            bits = list(map(attrgetter(plane), cells))
+            if any(bits):
+                d[plane] = _pack_bits(bits)
+        for plane in self.STRING_PLANES:
+            texts = list(map(attrgetter(plane), cells))
+            if any(texts):
+                pairs: list[int] = []
+                for i in compress(range(len(texts)), texts):
+                    pairs.append(i)
+                    pairs.append(self._string(texts[i]))
+                d[plane] = pairs
+        return d
+
+    def to_dict(self) -> dict:
+        return {"values": list(self._values), "strings": list(self._strings)}
+
+
+def _appended(tables: dict[str, list], sent: dict[str, int]) -> dict[str, list]:
+    """Rows added to each table since the last call (all rows on the first)."""
+    new: dict[str, list] = {}
+    for name, rows in tables.items():
+        start = sent.get(name, 0)
+        if len(rows) > start or name not in sent:
+            new[name] = rows[start:]
+            sent[name] = len(rows)
+    return new
+
+
+class RunEncoder:
+    """Incrementally serializes a run's steps into ``/api/run`` payload fields.
+
+    ``meta()`` holds the fields that are fixed for the run; each ``chunk()``
+    call encodes the next batch of steps and carries only the run-level
+    table rows (header, board tables, log) added since the previous chunk.
+    A single chunk over all steps plus ``meta()`` is the regular payload.
+    """
+
+    def __init__(
+        self,
+        *,
+        compact: bool = True,
+        delta: bool = False,
+        header: bool = False,
+        board_format: str = "cells",
+        log_timeline: bool = False,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ) -> None:
+        self.compact = compact
+        self.header = RunHeader(compact=compact) if header else None
+        self.columnar = ColumnarBoard(packed=not delta) if board_format == "columnar" else None
+        self.timeline = LogTimeline() if log_timeline else None
+        self.delta = DeltaEncoder(keyframe_interval) if delta else None
+        self.step_count = 0
+        self._sent: dict[str, dict[str, int]] = {"header": {}, "board_tables": {}, "log": {}}
+
+    def meta(self) -> dict:
+        meta: dict[str, Any] = {}
+        if self.columnar:
+            meta["board_format"] = "columnar"
+        if self.timeline:
+            meta["log_window"] = self.timeline.window
+        if self.delta:
+            meta["encoding"] = "delta"
+            meta["keyframe_interval"] = self.delta.interval
+        return meta
+
+    def step_to_dict(self, step: Step) -> dict:
+        overrides: dict[str, Any] = {}
+        if self.header and (step.graph_nodes is not None or step.trie_nodes is not None):
+            overrides.update(graph_nodes=None, graph_edges=None, trie_nodes=None, trie_edges=None)
+        if self.columnar and step.board is not None:
+            overrides["board"] = None
+        if self.timeline:
+            overrides["log_messages"] = ()
+        if not overrides:
+            return step.to_dict(compact=self.compact)
+        d = replace(step, **overrides).to_dict(compact=self.compact)
+        if "graph_nodes" in overrides:
+            self.header.fill(step, d)
+        if "board" in overrides:
+            d["board"] = self.columnar.encode(step.board)
+        if self.timeline:
+            d.pop("log_messages", None)
+            d.update(self.timeline.cursor(step))
+        return d
+
+    def chunk(self, steps: Iterable[Step]) -> dict:
+        step_dicts = [self.step_to_dict(s) for s in steps]
+        self.step_count += len(step_dicts)
+        chunk: dict[str, Any] = {}
+        if self.header:
+            chunk["header"] = _appended(self.header.to_dict(), self._sent["header"])
+        if self.columnar:
+            chunk["board_tables"] = _appended(self.columnar.to_dict(), self._sent["board_tables"])
+        if self.timeline:
+            chunk["log"] = _appended({"log": self.timeline.messages}, self._sent["log"])["log"]
+        if self.delta:
+            chunk["frames"] = [self.delta.frame(d) for d in step_dicts]
+        else:
+            chunk["steps"] = step_dicts
+        return chunk
+
+
+def encode_run(
+    steps: list[Step],
+    *,
+    compact: bool = True,
+    delta: bool = False,
+    header: bool = False,
+    board_format: str = "cells",
+    log_timeline: bool = False,
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+) -> dict:
+    """Serialize a run's steps into the ``/api/run`` payload fields."""
+    encoder = RunEncoder(
+        compact=compact,
+        delta=delta,
+        header=header,
+        board_format=board_format,
+        log_timeline=log_timeline,
+        keyframe_interval=keyframe_interval,
+    )
+    payload = encoder.meta()
+    payload.update(encoder.chunk(steps))
+    if delta:
+        payload["step_count"] = encoder.step_count
+    return payload
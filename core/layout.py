@@ -0,0 +1,626 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python fallback: same algorithm, slower.
+    np = None
+
+# Graphs up to this many nodes get exact pairwise repulsion; larger ones use
+# the Barnes-Hut grid approximation below.
+EXACT_MAX_NODES = 256
+
+# Target number of nodes per finest Barnes-Hut grid cell.
+_LEAF_SIZE = 4
+
+# Pull towards the centre, so disconnected components don't drift apart.
+_GRAVITY = 1.0
+
+# Laid out positions are scaled into [_MARGIN, 1 - _MARGIN], like
+# GraphTracer's circular layout, and rounded (sub-pixel on any canvas).
+_MARGIN = 0.12
+_DIGITS = 4
+
+# Layered layouts split long arcs with dummy nodes only while there are at
+# most this many dummies per node and arc.
+_DUMMY_BUDGET = 4
+
+_CACHE_SIZE = 64
+_cache: OrderedDict[str, list[tuple[float, float]]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+Coords = list[tuple[float, float]]
+
+
+def default_iterations(n: int) -> int:
+    """Rounds of force_directed_layout when not given.
+
+    Large graphs get fewer (50 at 1k nodes, 22 at 5k, never under 15), so a
+    5k-node layout stays within a second with NumPy. Extra rounds there only
+    shave a little off edge lengths.
+    """
+    if n <= EXACT_MAX_NODES:
+        return 100
+    return max(15, min(50, int(50 * math.sqrt(1000 / n))))
+
+
+def topology_key(n: int, pairs: Sequence[tuple[int, int]], *params: Any) -> str:
+    """Hash of a graph's shape (node count and index pairs) plus layout params."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((n, params)).encode("utf-8"))
+    for a, b in pairs:
+        digest.update(b"%d,%d;" % (a, b))
+    return digest.hexdigest()
+
+
+def _memoized(key: str, compute: Callable[[], Coords]) -> Coords:
+    with _cache_lock:
+        coords = _cache.get(key)
+        if coords is not None:
+            _cache.move_to_end(key)
+            return coords
+    coords = compute()
+    with _cache_lock:
+        _cache[key] = coords
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return coords
+
+
+def _index_pairs(
+    node_ids: Sequence[Any], edges: Iterable[tuple[Any, Any]], directed: bool = False,
+) -> list[tuple[int, int]]:
+    """Edges as sorted, de-duplicated node index pairs.
+
+    Undirected pairs are normalized to ``(low, high)``. Self-loops and edges
+    to unknown nodes are dropped.
+    """
+    index = {nid: i for i, nid in enumerate(node_ids)}
+    pairs = set()
+    for s, t in edges:
+        a, b = index.get(s), index.get(t)
+        if a is not None and b is not None and a != b:
+            pairs.add((a, b) if directed or a < b else (b, a))
+    return sorted(pairs)
+
+
+def force_directed_layout(
+    node_ids: Sequence[Any], edges: Iterable[tuple[Any, Any]],
+    iterations: int | None = None, seed: int = 0,
+) -> dict[Any, tuple[float, float]]:
+    """Fruchterman-Reingold layout of an (undirected view of a) graph.
+
+    Starts from seeded random positions and runs ``iterations`` rounds of
+    repulsion between all nodes, attraction along edges and a weak pull to
+    the centre, with linear cooling. Repulsion is exact up to
+    ``EXACT_MAX_NODES`` nodes and Barnes-Hut approximated beyond. Uses NumPy
+    when installed, else pure Python: the same algorithm, but on large
+    graphs the two can end up with slightly different positions.
+
+    Results are memoized per process by topology (node count, edges by node
+    index, parameters), so re-running the same graph reuses the positions.
+    """
+    nodes = list(node_ids)
+    n = len(nodes)
+    pairs = _index_pairs(nodes, edges)
+    if iterations is None:
+        iterations = default_iterations(n)
+    key = topology_key(n, pairs, "fr", iterations, seed)
+    coords = _memoized(key, lambda: _fruchterman_reingold(n, pairs, iterations, seed))
+    return dict(zip(nodes, coords))
+
+
+def _fruchterman_reingold(n: int, pairs: list[tuple[int, int]], iterations: int, seed: int) -> Coords:
+    if n == 0:
+        return []
+    if n == 1:
+        return [(0.5, 0.5)]
+    rng = random.Random(seed)
+    xs = [rng.random() for _ in range(n)]
+    ys = [rng.random() for _ in range(n)]
+    # Ideal edge length, so that n nodes fill the unit square.
+    k = 1 / math.sqrt(n)
+    run = _fr_numpy if np is not None else _fr_python
+    xs, ys = run(xs, ys, pairs, k, iterations)
+    return fit_unit_square(xs, ys)
+
+
+def fit_unit_square(xs: Sequence[float], ys: Sequence[float]) -> Coords:
+    """Scale and centre points (keeping aspect ratio) into the drawing area."""
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    span = max(x1 - x0, y1 - y0)
+    scale = (1 - 2 * _MARGIN) / span if span > 0 else 0.0
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    return [
+        (round(0.5 + (x - cx) * scale, _DIGITS), round(0.5 + (y - cy) * scale, _DIGITS))
+        for x, y in zip(xs, ys)
+    ]
+
+
+# --- Barnes-Hut grid ---
+#
+# Nodes are binned into a 2^depth x 2^depth grid over their bounding box, and
+# coarser levels are its quadtree parents. For each cell at level >= 2, the
+# cells in its interaction list (children of its parent's neighbours that
+# aren't its own neighbours) push on it as point masses at their centroids;
+# every pair of far-apart finest cells is counted at exactly one level. Nodes
+# in neighbouring finest cells repel each other exactly.
+
+
+def _grid_depth(n: int) -> int:
+    return max(2, math.ceil(math.log(max(n / _LEAF_SIZE, 1), 4)))
+
+
+def _interaction_offsets(pi: int, pj: int) -> list[tuple[int, int]]:
+    """Offsets to the interaction list of a cell with child-parity ``(pi, pj)``."""
+    return [
+        (oi, oj)
+        for oi in range(-3, 4)
+        for oj in range(-3, 4)
+        if max(abs(oi), abs(oj)) >= 2 and abs((pi + oi) // 2) <= 1 and abs((pj + oj) // 2) <= 1
+    ]
+
+
+_OFFSETS = {(pi, pj): _interaction_offsets(pi, pj) for pi in (0, 1) for pj in (0, 1)}
+
+
+# --- pure Python ---
+
+
+def _fr_python(xs: list[float], ys: list[float], pairs: list[tuple[int, int]],
+               k: float, iterations: int) -> tuple[list[float], list[float]]:
+    n = len(xs)
+    k2 = k * k
+    for it in range(iterations):
+        temperature = 0.1 * (1 - it / iterations)
+        if n <= EXACT_MAX_NODES:
+            dx, dy = _repulsion_exact_python(xs, ys, k2)
+        else:
+            dx, dy = _repulsion_grid_python(xs, ys, k2)
+        for a, b in pairs:
+            ex, ey = xs[a] - xs[b], ys[a] - ys[b]
+            f = math.hypot(ex, ey) / k
+            dx[a] -= ex * f
+            dy[a] -= ey * f
+            dx[b] += ex * f
+            dy[b] += ey * f
+        for i in range(n):
+            fx = dx[i] - _GRAVITY * (xs[i] - 0.5)
+            fy = dy[i] - _GRAVITY * (ys[i] - 0.5)
+            length = math.hypot(fx, fy)
+            if length > 0:
+                step = min(length, temperature) / length
+                xs[i] += fx * step
+                ys[i] += fy * step
+    return xs, ys
+
+
+def _repulsion_exact_python(xs: list[float], ys: list[float], k2: float) -> tuple[list[float], list[float]]:
+    n = len(xs)
+    dx, dy = [0.0] * n, [0.0] * n
+    for i in range(n):
+        xi, yi = xs[i], ys[i]
+        for j in range(i + 1, n):
+            ex, ey = xi - xs[j], yi - ys[j]
+            d2 = ex * ex + ey * ey
+            if d2 > 0:
+                f = k2 / d2
+                dx[i] += ex * f
+                dy[i] += ey * f
+                dx[j] -= ex * f
+                dy[j] -= ey * f
+    return dx, dy
+
+
+def _repulsion_grid_python(xs: list[float], ys: list[float], k2: float) -> tuple[list[float], list[float]]:
+    n = len(xs)
+    depth = _grid_depth(n)
+    size = 1 << depth
+    x0, y0 = min(xs), min(ys)
+    span = max(max(xs) - x0, max(ys) - y0, 1e-9)
+    cells = [
+        (min(int((x - x0) / span * size), size - 1), min(int((y - y0) / span * size), size - 1))
+        for x, y in zip(xs, ys)
+    ]
+    dx, dy = [0.0] * n, [0.0] * n
+
+    for level in range(2, depth + 1):
+        shift = depth - level
+        totals: dict[tuple[int, int], list[float]] = {}
+        for (ci, cj), x, y in zip(cells, xs, ys):
+            t = totals.setdefault((ci >> shift, cj >> shift), [0, 0.0, 0.0])
+            t[0] += 1
+            t[1] += x
+            t[2] += y
+        field: dict[tuple[int, int], tuple[float, float]] = {}
+        for (ci, cj), (m, sx, sy) in totals.items():
+            cx, cy = sx / m, sy / m
+            fx = fy = 0.0
+            for oi, oj in _OFFSETS[ci & 1, cj & 1]:
+                source = totals.get((ci + oi, cj + oj))
+                if source is None:
+                    continue
+                sm = source[0]
+                ex, ey = cx - source[1] / sm, cy - source[2] / sm
+                d2 = ex * ex + ey * ey
+                if d2 > 0:
+                    f = k2 * sm / d2
+                    fx += ex * f
+                    fy += ey * f
+            field[ci, cj] = (fx, fy)
+        for i, (ci, cj) in enumerate(cells):
+            fx, fy = field[ci >> shift, cj >> shift]
+            dx[i] += fx
+            dy[i] += fy
+
+    buckets: dict[tuple[int, int], list[int]] = {}
+    for i, cell in enumerate(cells):
+        buckets.setdefault(cell, []).append(i)
+    for i, (ci, cj) in enumerate(cells):
+        xi, yi = xs[i], ys[i]
+        fx = fy = 0.0
+        for oi in (-1, 0, 1):
+            for oj in (-1, 0, 1):
+                for j in buckets.get((ci + oi, cj + oj), ()):
+                    ex, ey = xi - xs[j], yi - ys[j]
+                    d2 = ex * ex + ey * ey
+                    if d2 > 0:
+                        f = k2 / d2
+                        fx += ex * f
+                        fy += ey * f
+        dx[i] += fx
+        dy[i] += fy
+    return dx, dy
+
+
+# --- NumPy ---
+
+
+def _fr_numpy(xs: list[float], ys: list[float], pairs: list[tuple[int, int]],
+              k: float, iterations: int) -> tuple[list[float], list[float]]:
+    n = len(xs)
+    k2 = k * k
+    pos = np.column_stack((xs, ys))
+    edges = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    a, b = edges[:, 0], edges[:, 1]
+    for it in range(iterations):
+        temperature = 0.1 * (1 - it / iterations)
+        if n <= EXACT_MAX_NODES:
+            disp = _repulsion_exact_numpy(pos, k2)
+        else:
+            disp = _repulsion_grid_numpy(pos, k2)
+        if len(edges):
+            delta = pos[a] - pos[b]
+            pull = delta * (np.hypot(delta[:, 0], delta[:, 1]) / k)[:, None]
+            for axis in (0, 1):
+                disp[:, axis] += np.bincount(b, pull[:, axis], n) - np.bincount(a, pull[:, axis], n)
+        disp -= _GRAVITY * (pos - 0.5)
+        length = np.hypot(disp[:, 0], disp[:, 1])
+        step = np.minimum(length, temperature) / np.where(length > 0, length, 1.0)
+        pos += disp * step[:, None]
+    return pos[:, 0].tolist(), pos[:, 1].tolist()
+
+
+def _repulsion_exact_numpy(pos: Any, k2: float) -> Any:
+    delta = pos[:, None, :] - pos[None, :, :]
+    d2 = np.einsum("ijk,ijk->ij", delta, delta)
+    weight = np.divide(k2, d2, out=np.zeros_like(d2), where=d2 > 0)
+    return np.einsum("ijk,ij->ik", delta, weight)
+
+
+def _interaction_masks() -> Any:
+    """(2, 2, 7, 7) bool: offsets in the interaction list, by child parity."""
+    masks = np.zeros((2, 2, 7, 7), dtype=bool)
+    for (pi, pj), offsets in _OFFSETS.items():
+        for oi, oj in offsets:
+            masks[pi, pj, oi + 3, oj + 3] = True
+    return masks
+
+
+def _repulsion_grid_numpy(pos: Any, k2: float) -> Any:
+    n = len(pos)
+    depth = _grid_depth(n)
+    size = 1 << depth
+    lo = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - lo).max()), 1e-9)
+    cells = np.minimum(((pos - lo) / span * size).astype(np.int64), size - 1)
+    return _far_field_numpy(pos, cells, depth, k2) + _near_field_numpy(pos, cells, size, k2)
+
+
+def _far_field_numpy(pos: Any, cells: Any, depth: int, k2: float) -> Any:
+    """Barnes-Hut repulsion from each cell's interaction list, at every level."""
+    disp = np.zeros_like(pos)
+    masks = _interaction_masks()
+    windows = np.lib.stride_tricks.sliding_window_view
+    for level in range(2, depth + 1):
+        g = 1 << level
+        c = cells >> (depth - level)
+        flat = c[:, 0] * g + c[:, 1]
+        mass = np.bincount(flat, minlength=g * g).astype(float)
+        occupied = np.flatnonzero(mass)
+        cx = np.bincount(flat, pos[:, 0], g * g)
+        cy = np.bincount(flat, pos[:, 1], g * g)
+        cx[occupied] /= mass[occupied]
+        cy[occupied] /= mass[occupied]
+        # 7x7 neighbourhoods of the occupied cells only.
+        oi, oj = np.divmod(occupied, g)
+        wm = windows(np.pad(mass.reshape(g, g), 3), (7, 7))[oi, oj] * masks[oi & 1, oj & 1]
+        ex = cx[occupied, None, None] - windows(np.pad(cx.reshape(g, g), 3), (7, 7))[oi, oj]
+        ey = cy[occupied, None, None] - windows(np.pad(cy.reshape(g, g), 3), (7, 7))[oi, oj]
+        d2 = ex * ex + ey * ey
+        w = np.divide(k2 * wm, d2, out=np.zeros_like(d2), where=wm > 0)
+        field = np.zeros((g * g, 2))
+        field[occupied, 0] = (ex * w).sum(axis=(1, 2))
+        field[occupied, 1] = (ey * w).sum(axis=(1, 2))
+        disp += field[flat]
+    return disp
+
+
+def _near_field_numpy(pos: Any, cells: Any, size: int, k2: float) -> Any:
+    """Exact repulsion between nodes in the same or adjacent finest cells.
+
+    Each unordered pair is visited once (later nodes of the same cell, and
+    the cells at half of the neighbour offsets) and pushes both nodes.
+    """
+    n = len(pos)
+    flat = cells[:, 0] * size + cells[:, 1]
+    order = np.argsort(flat, kind="stable")
+    counts = np.bincount(flat, minlength=size * size)
+    starts = np.cumsum(counts) - counts
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - starts[flat[order]]
+    # Same cell: the nodes after this one.
+    sources = [np.arange(n)]
+    firsts = [starts[flat] + rank + 1]
+    lens = [counts[flat] - rank - 1]
+    for oi, oj in ((0, 1), (1, -1), (1, 0), (1, 1)):
+        ni, nj = cells[:, 0] + oi, cells[:, 1] + oj
+        ok = np.flatnonzero((ni < size) & (nj >= 0) & (nj < size))
+        neighbour = ni[ok] * size + nj[ok]
+        sources.append(ok)
+        firsts.append(starts[neighbour])
+        lens.append(counts[neighbour])
+    src, first, length = np.concatenate(sources), np.concatenate(firsts), np.concatenate(lens)
+    i = np.repeat(src, length)
+    j = order[np.repeat(first - (np.cumsum(length) - length), length) + np.arange(len(i))]
+    delta = pos[i] - pos[j]
+    d2 = np.einsum("ij,ij->i", delta, delta)
+    w = np.divide(k2, d2, out=np.zeros_like(d2), where=d2 > 0)
+    disp = np.empty_like(pos)
+    for axis in (0, 1):
+        push = delta[:, axis] * w
+        disp[:, axis] = np.bincount(i, push, n) - np.bincount(j, push, n)
+    return disp
+
+
+# --- layered (Sugiyama) ---
+
+
+def layered_layout(
+    node_ids: Sequence[Any], edges: Iterable[tuple[Any, Any]], sweeps: int = 12,
+) -> dict[Any, tuple[float, float]]:
+    """Sugiyama-style layered layout of a directed graph, top to bottom.
+
+    1. Cycle breaking: edges closing a cycle in a DFS are reversed.
+    2. Longest-path layering: every node sits one layer below its lowest
+       predecessor; edges spanning several layers get a dummy node per layer.
+    3. Crossing reduction: up to ``sweeps`` alternating down/up barycenter
+       sweeps, keeping the ordering with the fewest crossings seen.
+    4. Coordinates: nodes are pulled towards the mean x of their neighbours
+       in the previous layer, keeping their order and a unit gap.
+
+    Each step is O(V + E) per sweep (up to sorting), dummy nodes included.
+    Results are memoized per process by topology, like force_directed_layout.
+    """
+    nodes = list(node_ids)
+    n = len(nodes)
+    arcs = _index_pairs(nodes, edges, directed=True)
+    key = topology_key(n, arcs, "layered", sweeps)
+    return dict(zip(nodes, _memoized(key, lambda: _sugiyama(n, arcs, sweeps))))
+
+
+def _sugiyama(n: int, arcs: list[tuple[int, int]], sweeps: int) -> Coords:
+    if n == 0:
+        return []
+    arcs = _break_cycles(n, arcs)
+    layer = _longest_path_layers(n, arcs)
+
+    # Split arcs spanning several layers with dummy nodes (ids >= n), unless
+    # that would more than _DUMMY_BUDGET-fold the graph; then long arcs link
+    # their endpoints directly (they still pull, but aren't crossing-counted).
+    split = sum(layer[b] - layer[a] - 1 for a, b in arcs) <= _DUMMY_BUDGET * (n + len(arcs))
+    succ: list[list[int]] = [[] for _ in range(n)]
+    for a, b in arcs:
+        prev = a
+        if split:
+            for lyr in range(layer[a] + 1, layer[b]):
+                dummy = len(layer)
+                layer.append(lyr)
+                succ.append([])
+                succ[prev].append(dummy)
+                prev = dummy
+        succ[prev].append(b)
+    pred: list[list[int]] = [[] for _ in layer]
+    for a, targets in enumerate(succ):
+        for b in targets:
+            pred[b].append(a)
+
+    layers: list[list[int]] = [[] for _ in range(max(layer) + 1)]
+    for v, lyr in enumerate(layer):
+        layers[lyr].append(v)
+    layers = _reduce_crossings(layers, layer, pred, succ, sweeps)
+    x = _assign_x(layers, pred, succ)
+
+    # Unit gaps become 1/(widest layer + 1) of the width, shrunk if needed to
+    # fit the margins; the drawing is centred.
+    real = x[:n]
+    x0, x1 = min(real), max(real)
+    widest = max(len(nodes) for nodes in layers)
+    scale = min(1 / (widest + 1), (1 - 2 * _MARGIN) / (x1 - x0)) if x1 > x0 else 0.0
+    mid = (x0 + x1) / 2
+    total = len(layers)
+    return [
+        (round(0.5 + (x[v] - mid) * scale, _DIGITS), round((layer[v] + 0.5) / total, _DIGITS))
+        for v in range(n)
+    ]
+
+
+def _break_cycles(n: int, arcs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Reverse the arcs that close a cycle in an (iterative) DFS."""
+    out: list[list[int]] = [[] for _ in range(n)]
+    for a, b in arcs:
+        out[a].append(b)
+    state = [0] * n  # 0 unvisited, 1 on the DFS stack, 2 done
+    back: set[tuple[int, int]] = set()
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(out[root]))]
+        while stack:
+            v, it = stack[-1]
+            for w in it:
+                if state[w] == 1:
+                    back.add((v, w))
+                elif state[w] == 0:
+                    state[w] = 1
+                    stack.append((w, iter(out[w])))
+                    break
+            else:
+                state[v] = 2
+                stack.pop()
+    if not back:
+        return arcs
+    return sorted({(b, a) if (a, b) in back else (a, b) for a, b in arcs})
+
+
+def _longest_path_layers(n: int, arcs: list[tuple[int, int]]) -> list[int]:
+    out: list[list[int]] = [[] for _ in range(n)]
+    in_degree = [0] * n
+    for a, b in arcs:
+        out[a].append(b)
+        in_degree[b] += 1
+    layer = [0] * n
+    queue = deque(v for v in range(n) if in_degree[v] == 0)
+    while queue:
+        v = queue.popleft()
+        for w in out[v]:
+            layer[w] = max(layer[w], layer[v] + 1)
+            in_degree[w] -= 1
+            if in_degree[w] == 0:
+                queue.append(w)
+    return layer
+
+
+def _crossings(upper: list[int], below: int, succ: list[list[int]], layer: list[int], pos: list[int]) -> int:
+    """Crossings of the arcs from ``upper`` into layer ``below``, by counting
+    inversions with a Fenwick tree."""
+    ends = sorted((pos[a], pos[b]) for a in upper for b in succ[a] if layer[b] == below)
+    size = len(ends) and max(p for _, p in ends) + 1
+    tree = [0] * (size + 1)
+    count = 0
+    for seen, (_, p) in enumerate(ends):
+        # Arcs seen so far that end right of p cross this one.
+        i, left = p + 1, 0
+        while i > 0:
+            left += tree[i]
+            i -= i & -i
+        count += seen - left
+        i = p + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return count
+
+
+def _total_crossings(layers: list[list[int]], layer: list[int], succ: list[list[int]], pos: list[int]) -> int:
+    return sum(_crossings(layers[i], i + 1, succ, layer, pos) for i in range(len(layers) - 1))
+
+
+def _reduce_crossings(
+    layers: list[list[int]], layer: list[int], pred: list[list[int]], succ: list[list[int]], sweeps: int,
+) -> list[list[int]]:
+    pos = [0] * len(layer)
+    # Position as a fraction of the layer's width, so that neighbours in
+    # different layers (unsplit long arcs) are comparable.
+    frac = [0.0] * len(layer)
+    for nodes in layers:
+        for i, v in enumerate(nodes):
+            pos[v] = i
+            frac[v] = (i + 0.5) / len(nodes)
+    best = [list(nodes) for nodes in layers]
+    best_crossings = _total_crossings(layers, layer, succ, pos)
+    stale = 0
+    for sweep in range(sweeps):
+        if best_crossings == 0 or stale == 2:
+            break
+        if sweep % 2 == 0:
+            order, neighbours = range(1, len(layers)), pred
+        else:
+            order, neighbours = range(len(layers) - 2, -1, -1), succ
+        for i in order:
+            nodes = layers[i]
+            # Barycenter of the neighbours; nodes without any keep their place.
+            for v in nodes:
+                nb = neighbours[v]
+                if len(nb) == 1:
+                    frac[v] = frac[nb[0]]
+                elif nb:
+                    frac[v] = sum(frac[u] for u in nb) / len(nb)
+            nodes.sort(key=frac.__getitem__)
+            width = len(nodes)
+            for j, v in enumerate(nodes):
+                pos[v] = j
+                frac[v] = (j + 0.5) / width
+        crossings = _total_crossings(layers, layer, succ, pos)
+        if crossings < best_crossings:
+            best, best_crossings, stale = [list(nodes) for nodes in layers], crossings, 0
+        else:
+            stale += 1
+    return best
+
+
+def _isotonic(values: list[float]) -> list[float]:
+    """Least-squares non-decreasing fit of ``values`` (pool adjacent violators)."""
+    blocks: list[list[float]] = []  # [sum, count]
+    for v in values:
+        blocks.append([v, 1])
+        while len(blocks) > 1 and blocks[-2][0] * blocks[-1][1] > blocks[-1][0] * blocks[-2][1]:
+            total, count = blocks.pop()
+            blocks[-1][0] += total
+            blocks[-1][1] += count
+    fit: list[float] = []
+    for total, count in blocks:
+        fit.extend([total / count] * int(count))
+    return fit
+
+
+def _assign_x(layers: list[list[int]], pred: list[list[int]], succ: list[list[int]], passes: int = 4) -> list[float]:
+    """x per node: ordered within each layer, at least 1 apart, near its neighbours."""
+    x = [0.0] * len(pred)
+    for nodes in layers:
+        offset = (len(nodes) - 1) / 2
+        for i, v in enumerate(nodes):
+            x[v] = i - offset
+    for p in range(passes):
+        if p % 2 == 0:
+            order, neighbours = layers[1:], pred
+        else:
+            order, neighbours = layers[-2::-1], succ
+        for nodes in order:
+            desired = [
+                sum(x[u] for u in neighbours[v]) / len(neighbours[v]) if neighbours[v] else x[v]
+                for v in nodes
+            ]
+            # x[i] - i non-decreasing keeps the order and the unit gaps.
+            fit = _isotonic([d - i for i, d in enumerate(desired)])
+            for i, v in enumerate(nodes):
+                x[v] = fit[i] + i
+    return x
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = tuple(1024 * 4**i for i in range(11))  # 1 KiB .. 1 GiB
+STEPS_BUCKETS = (10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000)
+
+# Workers flush their snapshot to the shared directory at most this often.
+_FLUSH_INTERVAL = 1.0
+
+# Snapshots don't outlive the machine; reset() clears them on each server start.
+DEFAULT_METRICS_DIR = os.path.join(tempfile.gettempdir(), "algoviz-metrics")
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = (*labels, *extra)
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Metrics:
+    """Counters, gauges and histograms rendered in the Prometheus text format.
+
+    Each worker keeps its own series in memory. With ``directory`` set, each
+    worker also writes a snapshot to ``<directory>/<pid>.json`` (throttled),
+    and ``render`` sums the series of every snapshot there. That way a scrape
+    that reaches any one gunicorn worker reports the whole server. Snapshots
+    of exited workers are kept, so counters never go backwards; their gauges
+    are dropped, since those describe a worker that is gone. Call ``reset``
+    once per server start, before workers boot (see ``gunicorn.conf.py``), so
+    earlier runs' snapshots (whose pids a new worker may reuse) don't leak
+    into the totals.
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self._meta: dict[str, tuple[str, str, tuple[float, ...]]] = {}
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._gauges: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], list[float]] = {}
+        self._lock = threading.Lock()
+        self._flushed = 0.0
+        self._timer: threading.Timer | None = None
+
+    def reset(self) -> None:
+        """Delete every snapshot in ``directory``, e.g. those left by a previous deploy."""
+        if self.directory is None:
+            return
+        for path in (*self.directory.glob("*.json"), *self.directory.glob("*.tmp")):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def counter(self, name: str, help: str) -> None:
+        self._meta[name] = ("counter", help, ())
+
+    def gauge(self, name: str, help: str) -> None:
+        self._meta[name] = ("gauge", help, ())
+
+    def histogram(self, name: str, help: str, buckets: tuple[float, ...] = SECONDS_BUCKETS) -> None:
+        self._meta[name] = ("histogram", help, buckets)
+
+    def inc(self, name: str, labels: dict[str, str], value: float = 1.0) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+        self._maybe_flush()
+
+    def set(self, name: str, labels: dict[str, str], value: float) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._gauges[key] = value
+        self._maybe_flush()
+
+    def observe(self, name: str, labels: dict[str, str], value: float) -> None:
+        buckets = self._meta[name][2]
+        key = (name, _labels(labels))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                # Per-bucket counts (last is +Inf), then sum and count.
+                series = self._histograms[key] = [0.0] * (len(buckets) + 3)
+            series[bisect_left(buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+        self._maybe_flush()
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "counters": [[n, list(map(list, l)), v] for (n, l), v in self._counters.items()],
+                "gauges": [[n, list(map(list, l)), v] for (n, l), v in self._gauges.items()],
+                "histograms": [[n, list(map(list, l)), list(s)] for (n, l), s in self._histograms.items()],
+            }
+
+    def _maybe_flush(self, force: bool = False) -> None:
+        if self.directory is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed < _FLUSH_INTERVAL:
+            # Flush the tail of a burst once the interval is up.
+            with self._lock:
+                if self._timer is None:
+                    self._timer = threading.Timer(_FLUSH_INTERVAL, self._flush_later)
+                    self._timer.daemon = True
+                    self._timer.start()
+            return
+        self._flushed = now
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{os.getpid()}.json"
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(self._snapshot()))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _flush_later(self) -> None:
+        with self._lock:
+            self._timer = None
+        self._maybe_flush(force=True)
+
+    def _merged(self) -> tuple[dict, dict, dict]:
+        snapshots = [self._snapshot()]
+        if self.directory is not None:
+            self._maybe_flush(force=True)
+            own = f"{os.getpid()}.json"
+            for path in self.directory.glob("*.json"):
+                if path.name == own:
+                    continue
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    continue
+        counters: dict[tuple[str, Labels], float] = {}
+        gauges: dict[tuple[str, Labels], float] = {}
+        histograms: dict[tuple[str, Labels], list[float]] = {}
+        for i, snap in enumerate(snapshots):
+            for name, labels, value in snap["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0.0) + value
+            if i == 0 or ("pid" in snap and _pid_alive(snap["pid"])):
+                for name, labels, value in snap.get("gauges", ()):
+                    key = (name, tuple(map(tuple, labels)))
+                    gauges[key] = gauges.get(key, 0.0) + value
+            for name, labels, series in snap["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                total = histograms.get(key)
+                if total is None or len(total) != len(series):
+                    histograms[key] = list(series)
+                else:
+                    histograms[key] = [a + b for a, b in zip(total, series)]
+        return counters, gauges, histograms
+
+    def render(self) -> str:
+        counters, gauges, histograms = self._merged()
+        lines: list[str] = []
+        for name, (kind, help, buckets) in self._meta.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind != "histogram":
+                for (n, labels), value in sorted((counters if kind == "counter" else gauges).items()):
+                    if n == name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            for (n, labels), series in sorted(histograms.items()):
+                if n != name:
+                    continue
+                cumulative = 0.0
+                for bound, count in zip((*buckets, math.inf), series):
+                    cumulative += count
+                    le = (("le", _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series[-2])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {_format_value(series[-1])}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Any
+
+from core.runner import collect_steps, encode_body, load_problem
+
+# Allocation statistics are broken down by line for this module.
+_TRACER_FILE = os.path.join("core", "tracer.py")
+
+
+def _short_path(path: str) -> str:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.relpath(path, root) if path.startswith(root) else path
+
+
+def _top_functions(profile: cProfile.Profile, top: int) -> list[dict[str, Any]]:
+    stats = pstats.Stats(profile).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return [
+        {
+            "function": f"{_short_path(file)}:{line}({name})",
+            "ncalls": ncalls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        }
+        for (file, line, name), (_, ncalls, tottime, cumtime, _) in rows
+    ]
+
+
+def _allocations(snapshot: tracemalloc.Snapshot, top: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "line": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+def profile_run(
+    module: str, qualname: str, params: dict, options: dict, binary: bool,
+    top: int = 25, max_steps: int | None = None, progress: Any = None,
+) -> dict[str, Any]:
+    """Pool job: profile generating and encoding a run.
+
+    Runs twice, once under cProfile (timings) and once under tracemalloc
+    (memory), so neither distorts the other's numbers. Returns the wall
+    time, top functions by cumulative time, peak traced memory and the
+    allocations still held at the end, overall and per ``core/tracer.py`` line.
+    """
+    cls = load_problem(module, qualname)
+
+    profile = cProfile.Profile()
+    started = time.perf_counter()
+    profile.enable()
+    try:
+        steps = collect_steps(cls, params, max_steps, progress)
+        body, _ = encode_body(cls, steps, options, binary)
+    finally:
+        profile.disable()
+    wall = time.perf_counter() - started
+    step_count, raw_bytes = len(steps), len(body)
+    del steps, body
+
+    tracemalloc.start()
+    try:
+        steps = collect_steps(cls, params, max_steps, progress)
+        encode_body(cls, steps, options, binary)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    tracer = snapshot.filter_traces([tracemalloc.Filter(True, f"*{_TRACER_FILE}")])
+
+    return {
+        "problem": cls.name(),
+        "params": params,
+        "wall_seconds": round(wall, 6),
+        "step_count": step_count,
+        "raw_bytes": raw_bytes,
+        "top_functions": _top_functions(profile, top),
+        "peak_memory_bytes": peak,
+        "retained_allocations": _allocations(snapshot, top),
+        "tracer_allocations": _allocations(tracer, top),
+    }
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import brotli
+
+# Modules whose code shapes a run's serialized output, besides the problem's own.
+_OUTPUT_MODULES = ("core.step", "core.tracer", "core.layout", "core.encoding", "core.wire", "core.runner")
+
+# Option sets warmed at boot and baked by bake.py: what static/js/app.js
+# requests, and the API defaults.
+WARM_OPTIONS = (
+    {"compact": True, "delta": True, "header": True, "board_format": "columnar", "log_timeline": True},
+    {"compact": True, "delta": False, "header": False, "board_format": "cells", "log_timeline": False},
+)
+
+# Warmed and baked bodies are compressed once, so they use each codec's maximum.
+WARM_BR_LEVEL = 11
+WARM_GZIP_LEVEL = 9
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint(module_name: str) -> str:
+    """Hash of a problem module's source plus the core modules that encode it."""
+    digest = hashlib.sha256()
+    for name in (module_name, *_OUTPUT_MODULES):
+        digest.update(Path(importlib.import_module(name).__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(cls: type, spec: dict[str, Any]) -> str:
+    """Canonical key for a run request: its inputs plus the source fingerprint."""
+    raw = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{source_fingerprint(cls.__module__)}:{raw}".encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """An encoded response body, stored brotli'd and gzip'd."""
+
+    etag: str
+    mimetype: str
+    br: bytes
+    gzip: bytes
+
+    @classmethod
+    def build(
+        cls, body: bytes, mimetype: str, br_level: int, gzip_level: int,
+        timings: dict[str, float] | None = None,
+    ) -> CachedResponse:
+        """Compress ``body``; per-encoding seconds are added to ``timings`` if given."""
+        started = time.perf_counter()
+        br = brotli.compress(body, quality=br_level)
+        compressed = time.perf_counter()
+        gz = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        if timings is not None:
+            timings["br"] = compressed - started
+            timings["gzip"] = time.perf_counter() - compressed
+        return cls(etag=hashlib.sha256(body).hexdigest()[:32], mimetype=mimetype, br=br, gzip=gz)
+
+    @property
+    def size(self) -> int:
+        return len(self.br) + len(self.gzip)
+
+    def body(self, encoding: str | None) -> bytes:
+        if encoding == "br":
+            return self.br
+        if encoding == "gzip":
+            return self.gzip
+        return gzip.decompress(self.gzip)
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded responses, bounded by their stored size.
+
+    An entry larger than ``max_bytes`` is not cached at all. Pinned entries
+    (e.g. warmed at boot) live outside the LRU and are never evicted.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._pinned: dict[str, CachedResponse] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._pinned)
+
+    def pin(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._pinned[key] = entry
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._pinned.get(key)
+            if entry is not None:
+                return entry
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> CachedResponse:
+        if entry.size > self.max_bytes:
+            return entry
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return entry
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from core.step import Step
+
+
+def make_run_id(spec: dict[str, Any]) -> str:
+    """Encode a run's inputs (problem, params, options) as a URL-safe id.
+
+    Ids are self-describing rather than random so that any worker can rebuild
+    a run it has never seen or has already evicted.
+    """
+    raw = json.dumps(spec, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def parse_run_id(run_id: str) -> dict[str, Any] | None:
+    try:
+        raw = base64.urlsafe_b64decode(run_id + "=" * (-len(run_id) % 4))
+        spec = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    return spec if isinstance(spec, dict) else None
+
+
+class RunCache:
+    """Thread-safe LRU of generated runs for paged step access.
+
+    Holds at most ``max_runs`` runs and ``max_steps`` steps in total,
+    evicting the least recently used runs first. A single run larger than
+    ``max_steps`` is still kept (alone) so it can be paged.
+    """
+
+    def __init__(self, max_runs: int = 32, max_steps: int = 500_000) -> None:
+        self.max_runs = max_runs
+        self.max_steps = max_steps
+        self._runs: OrderedDict[str, list[Step]] = OrderedDict()
+        self._step_total = 0
+        self._lock = threading.Lock()
+
+    def get(self, run_id: str) -> list[Step] | None:
+        with self._lock:
+            steps = self._runs.get(run_id)
+            if steps is not None:
+                self._runs.move_to_end(run_id)
+            return steps
+
+    def put(self, run_id: str, steps: list[Step]) -> None:
+        with self._lock:
+            old = self._runs.pop(run_id, None)
+            if old is not None:
+                self._step_total -= len(old)
+            self._runs[run_id] = steps
+            self._step_total += len(steps)
+            while len(self._runs) > 1 and (
+                len(self._runs) > self.max_runs or self._step_total > self.max_steps
+            ):
+                _, evicted = self._runs.popitem(last=False)
+                self._step_total -= len(evicted)
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import importlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limit.
+    resource = None
+
+from core.encoding import RunEncoder, encode_run
+from core.response_cache import CachedResponse
+from core.step import Step
+from core.wire import WIRE_MEDIA_TYPE, encode_binary
+
+# How often the parent checks the deadline and the client connection (seconds).
+_POLL_INTERVAL = 0.05
+
+# Streamed runs flush after 1, 2, 4, ... steps, capped at this many per line.
+STREAM_MAX_BATCH = 256
+
+
+@dataclass(frozen=True, slots=True)
+class RunLimits:
+    """Per-run budgets. ``timeout`` is wall-clock seconds, ``max_memory`` bytes."""
+
+    timeout: float = 20.0
+    max_steps: int = 100_000
+    max_memory: int = 1024 * 1024 * 1024
+
+
+class RunBudgetExceeded(Exception):
+    """A run hit a budget (or was cancelled) before finishing.
+
+    ``reason`` is one of ``"timeout"``, ``"steps"``, ``"memory"``,
+    ``"cancelled"`` or ``"crashed"``; ``partial_steps`` is how many steps had
+    been generated when it stopped.
+    """
+
+    def __init__(self, reason: str, limit: float | None, partial_steps: int) -> None:
+        self.reason = reason
+        self.limit = limit
+        self.partial_steps = partial_steps
+        super().__init__(self.message())
+
+    def __reduce__(self):
+        return type(self), (self.reason, self.limit, self.partial_steps)
+
+    def message(self) -> str:
+        if self.reason == "timeout":
+            return f"Run exceeded the {self.limit:g}s time limit after {self.partial_steps} steps"
+        if self.reason == "steps":
+            return f"Run exceeded the {self.limit:g}-step limit"
+        if self.reason == "memory":
+            return f"Run exceeded the {self.limit / (1024 * 1024):g} MB memory limit after {self.partial_steps} steps"
+        if self.reason == "cancelled":
+            return f"Run cancelled after {self.partial_steps} steps"
+        return f"Run failed after {self.partial_steps} steps"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "error": self.message(),
+            "reason": self.reason,
+            "limit": self.limit,
+            "partial_steps": self.partial_steps,
+        }
+
+
+def normalize_params(params: dict) -> dict:
+    # Convert param values to appropriate types
+    clean_params = {}
+    for k, v in params.items():
+        try:
+            clean_params[k] = int(v)
+        except (ValueError, TypeError):
+            clean_params[k] = v
+    return clean_params
+
+
+def collect_steps(cls, params: dict, max_steps: int | None = None, progress: Any = None) -> list[Step]:
+    """Materialize ``cls.iter_steps(**params)``, enforcing ``max_steps``.
+
+    ``progress`` (a shared ``multiprocessing`` value) is kept at the current
+    step count so a parent can report it if the run is killed.
+    """
+    steps: list[Step] = []
+    for step in cls.iter_steps(**params):
+        steps.append(step)
+        if progress is not None:
+            progress.value = len(steps)
+        if max_steps is not None and len(steps) > max_steps:
+            raise RunBudgetExceeded("steps", max_steps, len(steps))
+    return steps
+
+
+def encode_body(
+    cls, steps: list[Step], options: dict, binary: bool, timings: dict[str, float] | None = None,
+) -> tuple[bytes, str]:
+    """Encode a full run; returns (body, mimetype).
+
+    The JSON body is byte-for-byte what ``flask.jsonify`` produces outside
+    debug mode, without needing an app context. If ``timings`` is given, the
+    seconds spent building step dicts (``serialize``) and dumping JSON
+    (``json``) are added to it.
+    """
+    started = time.perf_counter()
+    if binary:
+        meta = {"source_code": cls.source_code(), "renderer_type": cls.renderer_type()}
+        body = encode_binary(steps, meta)
+        if timings is not None:
+            timings["serialize"] = time.perf_counter() - started
+        return body, WIRE_MEDIA_TYPE
+    run = {
+        "source_code": cls.source_code(),
+        "renderer_type": cls.renderer_type(),
+        **encode_run(steps, **options),
+    }
+    serialized = time.perf_counter()
+    body = json.dumps(run, ensure_ascii=True, sort_keys=True, separators=(",", ":"))
+    if timings is not None:
+        timings["serialize"] = serialized - started
+        timings["json"] = time.perf_counter() - serialized
+    return f"{body}\n".encode("utf-8"), "application/json"
+
+
+def ndjson(obj: dict) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def load_problem(module: str, qualname: str):
+    """Import a problem class by module and qualified name (pool jobs get names, not classes)."""
+    return getattr(importlib.import_module(module), qualname)
+
+
+@dataclass(frozen=True, slots=True)
+class BuiltRun:
+    """A generated run's response plus what it took to build it.
+
+    ``timings`` holds seconds per phase: ``generate``, ``serialize``,
+    ``json`` (JSON runs only), ``br`` and ``gzip``.
+    """
+
+    entry: CachedResponse
+    step_count: int
+    raw_bytes: int
+    timings: dict[str, float]
+
+
+def build_response(
+    module: str, qualname: str, params: dict, options: dict, binary: bool,
+    br_level: int, gzip_level: int, max_steps: int | None = None, progress: Any = None,
+) -> BuiltRun:
+    """Pool job: generate, encode and compress a run."""
+    cls = load_problem(module, qualname)
+    started = time.perf_counter()
+    steps = collect_steps(cls, params, max_steps, progress)
+    timings = {"generate": time.perf_counter() - started}
+    body, mimetype = encode_body(cls, steps, options, binary, timings)
+    entry = CachedResponse.build(body, mimetype, br_level, gzip_level, timings)
+    return BuiltRun(entry=entry, step_count=len(steps), raw_bytes=len(body), timings=timings)
+
+
+def stream_lines(
+    module: str, qualname: str, params: dict, options: dict, br_level: int, gzip_level: int,
+    max_steps: int | None = None, progress: Any = None, timeout: float | None = None,
+) -> Generator[bytes | int, None, BuiltRun]:
+    """Pool job: yield a run as NDJSON lines as soon as each is encoded.
+
+    Yields the run metadata line, then step chunks, then the step count
+    (an int) once every step is out. Then encodes and compresses the full
+    JSON body, exactly as ``build_response`` would, and returns it so the
+    streamed run can be cached (``generate`` covers the whole stream).
+    ``timeout`` is checked between steps, for inline runs; the pool
+    enforces its own by killing the child.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    cls = load_problem(module, qualname)
+    started = time.perf_counter()
+    encoder = RunEncoder(**options)
+    yield ndjson({
+        "source_code": cls.source_code(),
+        "renderer_type": cls.renderer_type(),
+        "stream": True,
+        **encoder.meta(),
+    })
+    steps: list[Step] = []
+    sent = 0
+    size = 1
+    for step in cls.iter_steps(**params):
+        steps.append(step)
+        if progress is not None:
+            progress.value = len(steps)
+        if max_steps is not None and len(steps) > max_steps:
+            raise RunBudgetExceeded("steps", max_steps, len(steps))
+        if deadline is not None and time.monotonic() > deadline:
+            raise RunBudgetExceeded("timeout", timeout, len(steps))
+        if len(steps) - sent >= size:
+            yield ndjson(encoder.chunk(steps[sent:]))
+            sent = len(steps)
+            size = min(size * 2, STREAM_MAX_BATCH)
+    if len(steps) > sent:
+        yield ndjson(encoder.chunk(steps[sent:]))
+    yield len(steps)
+    timings = {"generate": time.perf_counter() - started}
+    body, mimetype = encode_body(cls, steps, options, False, timings)
+    entry = CachedResponse.build(body, mimetype, br_level, gzip_level, timings)
+    return BuiltRun(entry=entry, step_count=len(steps), raw_bytes=len(body), timings=timings)
+
+
+def build_steps(
+    module: str, qualname: str, params: dict, max_steps: int | None = None, progress: Any = None,
+) -> list[Step]:
+    """Pool job: generate a run's steps."""
+    return collect_steps(load_problem(module, qualname), params, max_steps, progress)
+
+
+def _child(conn, progress, max_memory: int, fn: Callable, args: tuple, kwargs: dict, stream: bool) -> None:
+    if resource is not None and max_memory:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+    try:
+        if stream:
+            items = fn(*args, progress=progress, **kwargs)
+            while True:
+                try:
+                    item = next(items)
+                except StopIteration as stop:
+                    result = ("ok", stop.value)
+                    break
+                conn.send(("item", item))
+        else:
+            result = ("ok", fn(*args, progress=progress, **kwargs))
+    except RunBudgetExceeded as exc:
+        result = ("budget", exc)
+    except MemoryError:
+        result = ("budget", RunBudgetExceeded("memory", max_memory, progress.value))
+    except Exception as exc:
+        result = ("error", exc)
+    try:
+        conn.send(result)
+    except MemoryError:
+        conn.send(("budget", RunBudgetExceeded("memory", max_memory, progress.value)))
+    conn.close()
+
+
+class RunPool:
+    """Runs step generation in child processes, at most ``max_workers`` at a time.
+
+    Each run gets its own process forked from a ``forkserver`` that has
+    ``preload`` (problem modules) already imported, so a run can be killed on
+    timeout or cancellation without disturbing others, and gets its own
+    ``RLIMIT_AS``. Generation then uses every core instead of sharing the
+    worker's GIL.
+    """
+
+    def __init__(self, max_workers: int, limits: RunLimits, preload: Iterable[str] = ()) -> None:
+        self.limits = limits
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._ctx = multiprocessing.get_context(method)
+        if method == "forkserver":
+            self._ctx.set_forkserver_preload(["core.runner", *preload])
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def run(self, fn: Callable, *args: Any, cancelled: Callable[[], bool] | None = None, **kwargs: Any) -> Any:
+        """Call ``fn(*args, max_steps=..., progress=..., **kwargs)`` in a child process.
+
+        Raises ``RunBudgetExceeded`` on timeout, step/memory budget or when
+        ``cancelled()`` turns true; re-raises exceptions from ``fn``.
+        """
+        items = self._call(fn, args, kwargs, cancelled, stream=False)
+        while True:
+            try:
+                next(items)
+            except StopIteration as stop:
+                return stop.value
+
+    def stream(
+        self, fn: Callable, *args: Any, cancelled: Callable[[], bool] | None = None, **kwargs: Any,
+    ) -> Generator[Any, None, Any]:
+        """Like ``run`` for a generator ``fn``: yields its items as the child produces them.
+
+        Returns the generator's return value. The timeout covers the whole
+        run, including time the caller spends between items; closing the
+        generator kills the child.
+        """
+        return self._call(fn, args, kwargs, cancelled, stream=True)
+
+    def _call(
+        self, fn: Callable, args: tuple, kwargs: dict, cancelled: Callable[[], bool] | None, stream: bool,
+    ) -> Generator[Any, None, Any]:
+        limits = self.limits
+        with self._slots:
+            progress = self._ctx.RawValue("q", 0)
+            recv, send = self._ctx.Pipe(duplex=False)
+            proc = self._ctx.Process(
+                target=_child,
+                args=(send, progress, limits.max_memory, fn, args, {"max_steps": limits.max_steps, **kwargs}, stream),
+                daemon=True,
+            )
+            proc.start()
+            send.close()
+            deadline = time.monotonic() + limits.timeout
+            try:
+                while True:
+                    while not recv.poll(_POLL_INTERVAL):
+                        if not proc.is_alive() and not recv.poll():
+                            raise RunBudgetExceeded("crashed", None, progress.value)
+                        if time.monotonic() > deadline:
+                            raise RunBudgetExceeded("timeout", limits.timeout, progress.value)
+                        if cancelled is not None and cancelled():
+                            raise RunBudgetExceeded("cancelled", None, progress.value)
+                    try:
+                        status, value = recv.recv()
+                    except EOFError:
+                        raise RunBudgetExceeded("crashed", None, progress.value) from None
+                    if status != "item":
+                        break
+                    yield value
+            finally:
+                recv.close()
+                if proc.is_alive():
+                    proc.kill()
+                proc.join()
+        if status == "ok":
+            return value
+        raise value
+
+
+def run_limits_from_env(environ: dict[str, str] = os.environ) -> RunLimits:
+    """RunLimits from RUN_TIMEOUT, RUN_MAX_STEPS and RUN_MAX_MEMORY_MB."""
+    defaults = RunLimits()
+    return RunLimits(
+        timeout=float(environ.get("RUN_TIMEOUT", defaults.timeout)),
+        max_steps=int(environ.get("RUN_MAX_STEPS", defaults.max_steps)),
+        max_memory=int(environ.get("RUN_MAX_MEMORY_MB", defaults.max_memory // (1024 * 1024))) * 1024 * 1024,
+    )
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generic, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within a process only.
+    fcntl = None
+
+T = TypeVar("T")
+
+# How often a worker waiting on another worker's lock file retries it.
+_LOCK_POLL = 0.05
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Collapse concurrent calls with the same key into one computation.
+
+    Within a process, the first caller for a key runs ``fn`` and later callers
+    block until it finishes and share its result (or exception). Across
+    processes, ``file_lock(key)`` serializes leaders through ``flock`` on a
+    lock file per key under ``lock_dir``; a leader that had to wait should
+    re-check shared storage before computing. Waits give up after
+    ``lock_timeout`` seconds and go ahead without the lock, so a stuck
+    holder costs a duplicate computation rather than a hung request.
+    """
+
+    def __init__(self, lock_dir: str | os.PathLike | None = None, lock_timeout: float = 30.0) -> None:
+        self.lock_dir = Path(lock_dir) if lock_dir is not None else None
+        self.lock_timeout = lock_timeout
+        self._calls: dict[str, _Call[T]] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+        self.lock_waits = 0
+        self.lock_timeouts = 0
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def waiters(self, key: str) -> int:
+        """How many callers are blocked on the in-flight call for ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            return call.waiters if call is not None else 0
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], T],
+        retry: Callable[[BaseException], bool] | None = None,
+    ) -> tuple[T, bool]:
+        """Return ``(fn(), shared)``; ``shared`` is True if another caller computed it.
+
+        If the leader fails with an exception for which ``retry(exc)`` is true
+        (e.g. it was cancelled for its own client's sake), waiting callers
+        don't share it: one of them becomes the new leader and runs its ``fn``.
+        """
+        while True:
+            with self._lock:
+                self.calls += 1
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.waiters += 1
+                    self.collapsed += 1
+            if leader:
+                break
+            call.done.wait()
+            if call.error is None:
+                return call.result, True
+            if retry is None or not retry(call.error):
+                raise call.error
+        try:
+            result = fn()
+        except BaseException as exc:
+            self.finish(key, call, error=exc)
+            raise
+        self.finish(key, call, result=result)
+        return result, False
+
+    def lead(self, key: str) -> _Call[T] | None:
+        """Become the in-flight call for ``key`` without running a function here.
+
+        Returns None if a call is already in flight. Otherwise the caller
+        must eventually pass the returned handle to ``finish``, which wakes
+        the callers waiting in ``do``.
+        """
+        with self._lock:
+            self.calls += 1
+            if key in self._calls:
+                return None
+            call = self._calls[key] = _Call()
+            return call
+
+    def finish(
+        self, key: str, call: _Call[T], result: T | None = None, error: BaseException | None = None,
+    ) -> None:
+        """Complete ``call`` with ``result`` or ``error``; later calls are ignored."""
+        with self._lock:
+            if call.done.is_set():
+                return
+            call.result = result
+            call.error = error
+            del self._calls[key]
+            call.done.set()
+
+    @contextmanager
+    def file_lock(self, key: str) -> Iterator[bool]:
+        """Hold the cross-process lock for ``key``; yields True if it had to wait.
+
+        After ``lock_timeout`` seconds of waiting this yields True without the
+        lock. The holder deletes the lock file on release, so files don't pile
+        up; a waiter that then locks the deleted file opens the new one.
+        """
+        if fcntl is None or self.lock_dir is None:
+            yield False
+            return
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        path = self.lock_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.lock"
+        deadline = None
+        f = open(path, "a+b")
+        try:
+            while True:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + self.lock_timeout
+                        with self._lock:
+                            self.lock_waits += 1
+                    elif now >= deadline:
+                        with self._lock:
+                            self.lock_timeouts += 1
+                        f.close()
+                        yield True
+                        return
+                    time.sleep(_LOCK_POLL)
+                    continue
+                try:
+                    current = os.stat(path).st_ino == os.fstat(f.fileno()).st_ino
+                except FileNotFoundError:
+                    current = False
+                if current:
+                    break
+                f.close()
+                f = open(path, "a+b")
+            try:
+                yield deadline is not None
+            finally:
+                path.unlink(missing_ok=True)
+                fcntl.flock(f, fcntl.LOCK_UN)
+        finally:
+            f.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "collapsed": self.collapsed,
+                "lock_waits": self.lock_waits,
+                "lock_timeouts": self.lock_timeouts,
+                "in_flight": len(self._calls),
+            }
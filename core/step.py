@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
+from itertools import chain
 from typing import Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CellState:
     value: Any = 0
     selected: bool = False
@@ -36,7 +38,7 @@ class CellState:
         return d
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ArrayCell:
     value: Any = 0
     selected: bool = False
@@ -56,7 +58,7 @@ class ArrayCell:
         return d
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphNode:
     id: Any = 0
     label: str = ""
@@ -94,7 +96,7 @@ class GraphNode:
         return d
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphEdge:
     source: Any = 0
     target: Any = 0
@@ -131,7 +133,7 @@ class GraphEdge:
         return d
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AuxPanelItem:
     label: str = ""
     value: Any = ""
@@ -153,7 +155,7 @@ class AuxPanelItem:
         return d
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AuxPanel:
     title: str = ""
     items: tuple[AuxPanelItem, ...] = ()
@@ -165,7 +167,7 @@ class AuxPanel:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DSUNode:
     id: Any = 0
     label: str = ""
@@ -193,22 +195,31 @@ class DSUNode:
         return d
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TrieNode:
+    """A trie node as laid out by ``TrieTracer``.
+
+    ``offset`` and ``leaves`` place the node's span of leaf slots within its
+    parent's span (roots: within the root row). Payloads carry absolute
+    ``x``/``y`` instead; see ``trie_positions``.
+    """
+
     id: Any = 0
     label: str = ""
-    x: float = 0.0
-    y: float = 0.0
+    parent: Any = None
+    offset: int = 0
+    leaves: int = 1
+    depth: int = 0
     selected: bool = False
     patched: bool = False
     error: bool = False
     is_end: bool = False
 
-    def to_dict(self, compact: bool = False) -> dict:
+    def to_dict(self, compact: bool = False, position: tuple[float, float] = (0.5, 0.5)) -> dict:
         d = {
             "id": self.id,
-            "x": self.x,
-            "y": self.y,
+            "x": position[0],
+            "y": position[1],
         }
         if not compact or self.label:
             d["label"] = self.label
@@ -223,7 +234,52 @@ class TrieNode:
         return d
 
 
-@dataclass(frozen=True)
+def trie_positions(nodes: Iterable[TrieNode]) -> dict[Any, tuple[float, float]]:
+    """Normalized (x, y) per node id, as sent to clients.
+
+    Roots split [0.05, 0.95] in proportion to their leaf counts, each node is
+    centred on its span, and depths are spread evenly down the canvas. Nodes
+    whose parent isn't among ``nodes`` aren't reachable and sit at the centre.
+    """
+    by_id = {n.id: n for n in nodes}
+    width = sum(n.leaves for n in by_id.values() if n.parent is None)
+    rows = max((n.depth for n in by_id.values()), default=0) + 1
+    starts: dict[Any, float | None] = {}
+    for n in by_id.values():
+        if n.parent is None:
+            starts[n.id] = n.offset
+            continue
+        if n.parent in starts:
+            # Tracers emit nodes after their parents, so this is the usual case.
+            start = starts[n.parent]
+            starts[n.id] = None if start is None else start + n.offset
+            continue
+        chain: list[TrieNode] = []
+        node = n
+        while node.id not in starts:
+            chain.append(node)
+            if node.parent is None:
+                start = 0
+                break
+            parent = by_id.get(node.parent)
+            if parent is None:
+                start = None
+                break
+            node = parent
+        else:
+            start = starts[node.id]
+        for node in reversed(chain):
+            start = None if start is None else start + node.offset
+            starts[node.id] = start
+    scale = 0.9 / width if width else 0.0
+    return {
+        nid: (0.5 if start is None or not width else 0.05 + scale * (start + by_id[nid].leaves / 2),
+              (by_id[nid].depth + 0.5) / rows)
+        for nid, start in starts.items()
+    }
+
+
+@dataclass(frozen=True, slots=True)
 class TrieEdge:
     source: Any = 0
     target: Any = 0
@@ -248,7 +304,51 @@ class TrieEdge:
         return d
 
 
-@dataclass(frozen=True)
+class Chunked(Sequence):
+    """Immutable sequence stored as a tuple of equal-sized tuple chunks.
+
+    Tracers that hold large node/edge lists rebuild only the chunks they
+    changed since the last snapshot, so consecutive steps share the rest.
+    Compares equal to any sequence with the same items.
+    """
+
+    __slots__ = ("chunks", "size", "_len")
+
+    def __init__(self, chunks: tuple[tuple, ...], size: int) -> None:
+        self.chunks = chunks
+        self.size = size
+        self._len = (len(chunks) - 1) * size + len(chunks[-1]) if chunks else 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self.chunks)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("Chunked index out of range")
+        return self.chunks[index // self.size][index % self.size]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Chunked) and other.chunks == self.chunks:
+            return True
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(other) == self._len and tuple(other) == tuple(self)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"Chunked({tuple(self)!r})"
+
+
+@dataclass(frozen=True, slots=True)
 class Step:
     line_number: int
     description: str = ""
@@ -259,8 +359,11 @@ class Step:
     log_messages: tuple[str, ...] = ()
     aux_panels: tuple[AuxPanel, ...] = ()
     dsu_nodes: tuple[DSUNode, ...] | None = None
-    trie_nodes: tuple[TrieNode, ...] | None = None
-    trie_edges: tuple[TrieEdge, ...] | None = None
+    trie_nodes: Sequence[TrieNode] | None = None
+    trie_edges: Sequence[TrieEdge] | None = None
+    # Length of the source tracer's full log at snapshot time. Not serialized;
+    # encoders use it to rebuild one run-level log from the windows above.
+    log_count: int = 0
 
     def to_dict(self, compact: bool = False) -> dict:
         d: dict[str, Any] = {
@@ -283,7 +386,8 @@ class Step:
         if self.dsu_nodes is not None:
             d["dsu_nodes"] = [n.to_dict(compact=compact) for n in self.dsu_nodes]
         if self.trie_nodes is not None:
-            d["trie_nodes"] = [n.to_dict(compact=compact) for n in self.trie_nodes]
+            positions = trie_positions(self.trie_nodes)
+            d["trie_nodes"] = [n.to_dict(compact, positions[n.id]) for n in self.trie_nodes]
             if not compact or self.trie_edges:
                 d["trie_edges"] = [e.to_dict(compact=compact) for e in (self.trie_edges or ())]
         return d
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.response_cache import CachedResponse
+
+# Suffixes of the files that make up one stored run. The meta file is written
+# last, so its presence means the bodies are complete.
+_BODY_SUFFIXES = {"br": ".json.br", "gzip": ".json.gz"}
+_META_SUFFIX = ".meta.json"
+
+# Refresh a run's last-access time at most this often (seconds).
+_TOUCH_INTERVAL = 60.0
+
+# Rescan the store at least this often (seconds), to account for the runs
+# other workers wrote since this worker last looked.
+_SWEEP_INTERVAL = 60.0
+
+# Eviction frees space down to this fraction of max_bytes, so the puts that
+# follow don't each trigger another scan.
+_LOW_WATER = 0.9
+
+
+@dataclass(frozen=True, slots=True)
+class StoredRun:
+    """A run in the on-disk store: its ETag, mimetype and body file paths."""
+
+    key: str
+    etag: str
+    mimetype: str
+    base: Path
+
+    def path(self, encoding: str) -> Path:
+        return self.base.with_name(self.key + _BODY_SUFFIXES[encoding])
+
+
+class TraceStore:
+    """Content-addressed store of encoded runs, shared by every worker.
+
+    Runs live under ``root/<key[:2]>/<key>.*`` as brotli and gzip bodies plus a
+    small meta file, all written atomically (temp file + rename), so workers
+    never see partial runs. The meta file's mtime is the last-access time;
+    once the store grows past ``max_bytes`` the least recently used runs are
+    deleted. Bodies are served from their paths (``send_file``), letting the
+    server use ``sendfile`` instead of reading them into Python.
+
+    Each worker keeps a running byte total: the size found by its last scan
+    plus what it has written since. ``put`` only scans (and evicts) when that
+    total crosses ``max_bytes`` or the last scan is ``_SWEEP_INTERVAL`` old,
+    so the store can briefly overshoot by what other workers wrote meanwhile.
+    """
+
+    def __init__(self, root: str | os.PathLike, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes: int | None = None
+        self._swept = 0.0
+
+    def _base(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> StoredRun | None:
+        base = self._base(key)
+        meta_path = base.with_name(key + _META_SUFFIX)
+        try:
+            meta = json.loads(meta_path.read_bytes())
+            accessed = meta_path.stat().st_mtime
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        if now - accessed > _TOUCH_INTERVAL:
+            try:
+                os.utime(meta_path, (now, now))
+            except OSError:
+                return None
+        return StoredRun(key=key, etag=meta["etag"], mimetype=meta["mimetype"], base=base)
+
+    def load(self, key: str) -> CachedResponse | None:
+        """Read a stored run's bodies back into memory."""
+        run = self.get(key)
+        if run is None:
+            return None
+        try:
+            return CachedResponse(
+                etag=run.etag,
+                mimetype=run.mimetype,
+                br=run.path("br").read_bytes(),
+                gzip=run.path("gzip").read_bytes(),
+            )
+        except OSError:
+            return None
+
+    def put(self, key: str, entry: CachedResponse) -> StoredRun | None:
+        """Write ``entry`` to the store; returns None if it could not be stored."""
+        if entry.size > self.max_bytes:
+            return None
+        base = self._base(key)
+        try:
+            base.parent.mkdir(parents=True, exist_ok=True)
+            _write(base.with_name(key + _BODY_SUFFIXES["br"]), entry.br)
+            _write(base.with_name(key + _BODY_SUFFIXES["gzip"]), entry.gzip)
+            meta = json.dumps({"etag": entry.etag, "mimetype": entry.mimetype}).encode("utf-8")
+            _write(base.with_name(key + _META_SUFFIX), meta)
+        except OSError:
+            return None
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += entry.size + len(meta)
+            due = (
+                self._bytes is None
+                or self._bytes > self.max_bytes
+                or time.monotonic() - self._swept > _SWEEP_INTERVAL
+            )
+        if due:
+            self.evict()
+        return StoredRun(key=key, etag=entry.etag, mimetype=entry.mimetype, base=base)
+
+    def evict(self) -> int:
+        """Delete least recently used runs once the store is over ``max_bytes``.
+
+        Scans every run, frees space down to ``_LOW_WATER`` of the limit and
+        resets the running total; returns bytes freed.
+        """
+        with self._lock:
+            runs = []
+            total = 0
+            for meta_path in self.root.glob(f"*/*{_META_SUFFIX}"):
+                key = meta_path.name[: -len(_META_SUFFIX)]
+                paths = [meta_path, *(meta_path.with_name(key + s) for s in _BODY_SUFFIXES.values())]
+                try:
+                    accessed = meta_path.stat().st_mtime
+                    size = sum(p.stat().st_size for p in paths)
+                except OSError:
+                    # Being written or evicted by another worker.
+                    continue
+                runs.append((accessed, size, paths))
+                total += size
+            freed = 0
+            target = self.max_bytes * _LOW_WATER if total > self.max_bytes else total
+            runs.sort(key=lambda r: r[0])
+            for _, size, paths in runs:
+                if total - freed <= target:
+                    break
+                # Meta first, so readers stop finding the run before its bodies go.
+                for p in paths:
+                    try:
+                        p.unlink()
+                    except FileNotFoundError:
+                        pass
+                freed += size
+            self._bytes = total - freed
+            self._swept = time.monotonic()
+            return freed
+
+
+def _write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
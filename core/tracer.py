@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from collections import deque
+from collections.abc import Iterable
 from dataclasses import replace
+from itertools import compress
 from typing import Any
 
 import math
 
+from core.layout import force_directed_layout, layered_layout
 from core.step import (
-    ArrayCell, AuxPanel, AuxPanelItem, CellState, DSUNode,
+    ArrayCell, AuxPanel, AuxPanelItem, CellState, Chunked, DSUNode,
     GraphEdge, GraphNode, Step, TrieEdge, TrieNode,
 )
 
@@ -20,102 +22,223 @@ def _windowed_logs(logs: list[str]) -> tuple[str, ...]:
     return tuple(logs[-MAX_LOG_MESSAGES_PER_STEP:])
 
 
+class _LogWindow:
+    """Caches the windowed log tuple so unchanged logs are shared between steps."""
+
+    def __init__(self) -> None:
+        self._count = -1
+        self._window: tuple[str, ...] = ()
+
+    def __call__(self, logs: list[str]) -> tuple[str, ...]:
+        # Tracer logs are append-only, so the length identifies the window.
+        if len(logs) != self._count:
+            self._count = len(logs)
+            self._window = _windowed_logs(logs)
+        return self._window
+
+
+def _interned(pool: dict[tuple, Any], cls: type, key: tuple, skip: int = 0) -> Any:
+    """Return the pooled ``cls(*key[skip:])``, creating it on first use.
+
+    Each tracer owns its pools, so identical frozen states within a run share
+    one instance. Keys for ``Any``-typed values are prefixed with the value's
+    type (and ``skip=1``) so that e.g. ``1`` and ``True`` stay distinct.
+    Keys holding unhashable values (e.g. lists) bypass the pool.
+    """
+    try:
+        state = pool.get(key)
+    except TypeError:
+        return cls(*key[skip:])
+    if state is None:
+        state = pool[key] = cls(*key[skip:])
+    return state
+
+
+# Board2DTracer flag bits, one byte per cell.
+_CELL_SELECTED = 1
+_CELL_PATCHED = 2
+_CELL_ERROR = 4
+_CELL_ON_PATH = 8
+
+
 class Board2DTracer:
-    """Mutable 2D grid tracer. Manipulate state, then call snapshot() to freeze."""
+    """Mutable 2D grid tracer. Manipulate state, then call snapshot() to freeze.
+
+    State is stored flat (index ``row * cols + col``): one values list, one
+    ``bytearray`` of flag bits and three overlay string lists. The indices
+    holding each flag (and any overlay) are tracked in sets, so the
+    ``*_all`` clears cost O(cells set) rather than O(rows * cols).
+    Mutations mark their cell dirty; snapshot() only refreezes dirty cells,
+    rebuilds the rows containing them from the frozen cells, and reuses the
+    previous step's row tuples (and board tuple) for the rest.
+    """
 
     def __init__(self, rows: int, cols: int):
         self.rows = rows
         self.cols = cols
-        self._values: list[list[Any]] = [[0] * cols for _ in range(rows)]
-        self._selected: list[list[bool]] = [[False] * cols for _ in range(rows)]
-        self._patched: list[list[bool]] = [[False] * cols for _ in range(rows)]
-        self._error: list[list[bool]] = [[False] * cols for _ in range(rows)]
-        self._overlay_text: list[list[str]] = [[""] * cols for _ in range(rows)]
-        self._overlay_color: list[list[str]] = [[""] * cols for _ in range(rows)]
-        self._arrow_dir: list[list[str]] = [[""] * cols for _ in range(rows)]
-        self._on_path: list[list[bool]] = [[False] * cols for _ in range(rows)]
+        size = rows * cols
+        self._values: list[Any] = [0] * size
+        self._flags = bytearray(size)
+        self._overlay_text: list[str] = [""] * size
+        self._overlay_color: list[str] = [""] * size
+        self._arrow_dir: list[str] = [""] * size
+        self._selected: set[int] = set()
+        self._patched: set[int] = set()
+        self._error: set[int] = set()
+        self._on_path: set[int] = set()
+        self._overlaid: set[int] = set()
         self._log: list[str] = []
+        self._log_window = _LogWindow()
+        self._cell_pool: dict[tuple, CellState] = {}
+        self._frozen_cells: list[CellState | None] = [None] * size
+        self._frozen_rows: list[tuple[CellState, ...]] = [()] * rows
+        self._board: tuple[tuple[CellState, ...], ...] | None = None
+        self._dirty: set[int] = set(range(size))
+
+    def _index(self, row: int, col: int) -> int:
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError(f"cell ({row}, {col}) outside {self.rows}x{self.cols} board")
+        return row * self.cols + col
+
+    def _set_flag(self, row: int, col: int, bit: int, cells: set[int]) -> None:
+        i = self._index(row, col)
+        self._flags[i] |= bit
+        cells.add(i)
+        self._dirty.add(i)
+
+    def _unset_flag(self, row: int, col: int, bit: int, cells: set[int]) -> None:
+        i = self._index(row, col)
+        self._flags[i] &= ~bit
+        cells.discard(i)
+        self._dirty.add(i)
+
+    def _clear_flag(self, bit: int, cells: set[int]) -> None:
+        flags = self._flags
+        for i in cells:
+            flags[i] &= ~bit
+        self._dirty |= cells
+        cells.clear()
+
+    def _track_overlay(self, i: int) -> None:
+        if self._overlay_text[i] or self._overlay_color[i] or self._arrow_dir[i]:
+            self._overlaid.add(i)
+        else:
+            self._overlaid.discard(i)
+        self._dirty.add(i)
+
+    # --- reads ---
+
+    def value(self, row: int, col: int) -> Any:
+        return self._values[self._index(row, col)]
 
     # --- mutations ---
 
     def set_value(self, row: int, col: int, value: Any) -> None:
-        self._values[row][col] = value
+        i = self._index(row, col)
+        self._values[i] = value
+        self._dirty.add(i)
 
     def select(self, row: int, col: int) -> None:
-        self._selected[row][col] = True
+        self._set_flag(row, col, _CELL_SELECTED, self._selected)
 
     def deselect(self, row: int, col: int) -> None:
-        self._selected[row][col] = False
+        self._unset_flag(row, col, _CELL_SELECTED, self._selected)
 
     def deselect_all(self) -> None:
-        self._selected = [[False] * self.cols for _ in range(self.rows)]
+        self._clear_flag(_CELL_SELECTED, self._selected)
 
     def patch(self, row: int, col: int) -> None:
-        self._patched[row][col] = True
+        self._set_flag(row, col, _CELL_PATCHED, self._patched)
 
     def depatch(self, row: int, col: int) -> None:
-        self._patched[row][col] = False
+        self._unset_flag(row, col, _CELL_PATCHED, self._patched)
 
     def depatch_all(self) -> None:
-        self._patched = [[False] * self.cols for _ in range(self.rows)]
+        self._clear_flag(_CELL_PATCHED, self._patched)
 
     def mark_error(self, row: int, col: int) -> None:
-        self._error[row][col] = True
+        self._set_flag(row, col, _CELL_ERROR, self._error)
 
     def clear_error(self, row: int, col: int) -> None:
-        self._error[row][col] = False
+        self._unset_flag(row, col, _CELL_ERROR, self._error)
 
     def clear_all_errors(self) -> None:
-        self._error = [[False] * self.cols for _ in range(self.rows)]
+        self._clear_flag(_CELL_ERROR, self._error)
 
     def set_overlay(self, row: int, col: int, text: str, color: str = "") -> None:
-        self._overlay_text[row][col] = text
-        self._overlay_color[row][col] = color
+        i = self._index(row, col)
+        self._overlay_text[i] = text
+        self._overlay_color[i] = color
+        self._track_overlay(i)
 
     def set_arrow(self, row: int, col: int, direction: str) -> None:
-        self._arrow_dir[row][col] = direction
+        i = self._index(row, col)
+        self._arrow_dir[i] = direction
+        self._track_overlay(i)
 
     def mark_on_path(self, row: int, col: int) -> None:
-        self._on_path[row][col] = True
+        self._set_flag(row, col, _CELL_ON_PATH, self._on_path)
 
     def clear_on_path(self, row: int, col: int) -> None:
-        self._on_path[row][col] = False
+        self._unset_flag(row, col, _CELL_ON_PATH, self._on_path)
 
     def clear_all_paths(self) -> None:
-        self._on_path = [[False] * self.cols for _ in range(self.rows)]
+        self._clear_flag(_CELL_ON_PATH, self._on_path)
 
     def clear_all_overlays(self) -> None:
-        self._overlay_text = [[""] * self.cols for _ in range(self.rows)]
-        self._overlay_color = [[""] * self.cols for _ in range(self.rows)]
-        self._arrow_dir = [[""] * self.cols for _ in range(self.rows)]
+        for i in self._overlaid:
+            self._overlay_text[i] = self._overlay_color[i] = self._arrow_dir[i] = ""
+        self._dirty |= self._overlaid
+        self._overlaid.clear()
 
     def log(self, message: str) -> None:
         self._log.append(message)
 
     # --- snapshot ---
 
-    def snapshot(self, line_number: int, description: str = "") -> Step:
-        board = tuple(
-            tuple(
-                CellState(
-                    value=self._values[r][c],
-                    selected=self._selected[r][c],
-                    patched=self._patched[r][c],
-                    error=self._error[r][c],
-                    overlay_text=self._overlay_text[r][c],
-                    overlay_color=self._overlay_color[r][c],
-                    arrow_dir=self._arrow_dir[r][c],
-                    on_path=self._on_path[r][c],
-                )
-                for c in range(self.cols)
+    def _freeze_cell(self, i: int) -> CellState:
+        value = self._values[i]
+        flags = self._flags[i]
+        text, color, arrow = self._overlay_text[i], self._overlay_color[i], self._arrow_dir[i]
+        # The value's type keeps e.g. 1 and True distinct (see _interned).
+        key = (type(value), value, flags, text, color, arrow)
+        try:
+            state = self._cell_pool.get(key)
+        except TypeError:  # unhashable value (e.g. a list): not pooled
+            key = state = None
+        if state is None:
+            state = CellState(
+                value,
+                bool(flags & _CELL_SELECTED),
+                bool(flags & _CELL_PATCHED),
+                bool(flags & _CELL_ERROR),
+                text,
+                color,
+                arrow,
+                bool(flags & _CELL_ON_PATH),
             )
-            for r in range(self.rows)
-        )
+            if key is not None:
+                self._cell_pool[key] = state
+        return state
+
+    def snapshot(self, line_number: int, description: str = "") -> Step:
+        if self._dirty or self._board is None:
+            cols = self.cols
+            cells = self._frozen_cells
+            rows = set()
+            for i in self._dirty:
+                cells[i] = self._freeze_cell(i)
+                rows.add(i // cols)
+            for r in rows:
+                self._frozen_rows[r] = tuple(cells[r * cols:(r + 1) * cols])
+            self._dirty.clear()
+            self._board = tuple(self._frozen_rows)
         return Step(
             line_number=line_number,
             description=description,
-            board=board,
-            log_messages=_windowed_logs(self._log),
+            board=self._board,
+            log_messages=self._log_window(self._log),
+            log_count=len(self._log),
         )
 
 
@@ -128,67 +251,107 @@ class Array1DTracer:
         self._patched: list[bool] = [False] * len(data)
         self._error: list[bool] = [False] * len(data)
         self._log: list[str] = []
+        self._log_window = _LogWindow()
+        self._cell_pool: dict[tuple, ArrayCell] = {}
+        self._frozen: list[ArrayCell | None] = [None] * len(data)
+        self._array: tuple[ArrayCell, ...] | None = None
+        self._dirty: set[int] = set(range(len(data)))
 
     @property
     def size(self) -> int:
         return len(self._values)
 
+    def _clear_flags(self, flags: list[bool]) -> None:
+        for i in compress(range(len(flags)), flags):
+            flags[i] = False
+            self._dirty.add(i)
+
     def set_value(self, index: int, value: Any) -> None:
         self._values[index] = value
+        self._dirty.add(index)
 
     def swap(self, i: int, j: int) -> None:
         self._values[i], self._values[j] = self._values[j], self._values[i]
+        self._dirty.update((i, j))
 
     def select(self, index: int) -> None:
         self._selected[index] = True
+        self._dirty.add(index)
 
     def deselect(self, index: int) -> None:
         self._selected[index] = False
+        self._dirty.add(index)
 
     def deselect_all(self) -> None:
-        self._selected = [False] * self.size
+        self._clear_flags(self._selected)
 
     def patch(self, index: int) -> None:
         self._patched[index] = True
+        self._dirty.add(index)
 
     def depatch(self, index: int) -> None:
         self._patched[index] = False
+        self._dirty.add(index)
 
     def depatch_all(self) -> None:
-        self._patched = [False] * self.size
+        self._clear_flags(self._patched)
 
     def mark_error(self, index: int) -> None:
         self._error[index] = True
+        self._dirty.add(index)
 
     def clear_error(self, index: int) -> None:
         self._error[index] = False
+        self._dirty.add(index)
 
     def clear_all_errors(self) -> None:
-        self._error = [False] * self.size
+        self._clear_flags(self._error)
 
     def log(self, message: str) -> None:
         self._log.append(message)
 
     def snapshot(self, line_number: int, description: str = "") -> Step:
-        array = tuple(
-            ArrayCell(
-                value=self._values[i],
-                selected=self._selected[i],
-                patched=self._patched[i],
-                error=self._error[i],
-            )
-            for i in range(self.size)
-        )
+        if self._dirty or self._array is None:
+            pool = self._cell_pool
+            for i in self._dirty:
+                value = self._values[i]
+                self._frozen[i] = _interned(pool, ArrayCell, (
+                    type(value), value, self._selected[i], self._patched[i], self._error[i],
+                ), 1)
+            self._dirty.clear()
+            self._array = tuple(self._frozen)
         return Step(
             line_number=line_number,
             description=description,
-            array=array,
-            log_messages=_windowed_logs(self._log),
+            array=self._array,
+            log_messages=self._log_window(self._log),
+            log_count=len(self._log),
         )
 
 
+# GraphTracer edge flag bits, one byte per edge.
+_EDGE_SELECTED = 1
+_EDGE_PATCHED = 2
+_EDGE_ERROR = 4
+
+# Graphs with more nodes than this are hard to read on the default circle;
+# problems switch them to set_force_layout() once their edges are added.
+FORCE_LAYOUT_MIN_NODES = 20
+
+
 class GraphTracer:
-    """Mutable graph tracer with nodes and edges."""
+    """Mutable graph tracer with nodes and edges.
+
+    Edges get integer ids in insertion order and their state is stored in
+    per-id lists plus a ``bytearray`` of flag bits; the ids holding each
+    flag are tracked in sets, so the ``*_all_edges`` clears cost O(edges
+    set). ``_edge_ids`` maps ``(source, target)`` to an id and, for
+    undirected graphs, the reverse orientation too, so edge methods accept
+    either. Mutations naming an edge that isn't in the graph are ignored.
+
+    Mutations mark their node/edge dirty; snapshot() refreezes only those and
+    reuses the previous step's node/edge objects and tuples otherwise.
+    """
 
     def __init__(self, node_ids: list[Any], directed: bool = True):
         self._directed = directed
@@ -209,234 +372,380 @@ class GraphTracer:
             self._positions[nid] = (0.5 + 0.38 * math.cos(angle),
                                      0.5 + 0.38 * math.sin(angle))
 
+        # Edge state, indexed by edge id.
         self._edges: list[tuple[Any, Any]] = []
-        self._edge_selected: dict[tuple[Any, Any], bool] = {}
-        self._edge_patched: dict[tuple[Any, Any], bool] = {}
-        self._edge_error: dict[tuple[Any, Any], bool] = {}
-        self._edge_weight: dict[tuple[Any, Any], float | None] = {}
-        self._edge_label: dict[tuple[Any, Any], str] = {}
-        self._edge_class: dict[tuple[Any, Any], str] = {}
-        self._edge_curve_offset: dict[tuple[Any, Any], float] = {}
+        self._edge_ids: dict[tuple[Any, Any], int] = {}
+        self._edge_flags = bytearray()
+        self._edge_weight: list[float | None] = []
+        self._edge_label: list[str] = []
+        self._edge_class: list[str] = []
+        self._edge_curve_offset: list[float] = []
+        self._selected_edges: set[int] = set()
+        self._patched_edges: set[int] = set()
+        self._error_edges: set[int] = set()
         self._log: list[str] = []
+        self._log_window = _LogWindow()
+        self._node_pool: dict[tuple, GraphNode] = {}
+        self._edge_pool: dict[tuple, GraphEdge] = {}
+        # Frozen state per node/edge, in _node_ids/edge id order.
+        self._frozen_nodes: dict[Any, GraphNode | None] = {nid: None for nid in node_ids}
+        self._frozen_edges: list[GraphEdge | None] = []
+        self._nodes: tuple[GraphNode, ...] | None = None
+        self._edge_tuple: tuple[GraphEdge, ...] | None = None
+        self._dirty_nodes: set[Any] = set(node_ids)
+        self._dirty_edges: set[int] = set()
+
+    def _clear_node_flags(self, flags: dict[Any, bool]) -> None:
+        for nid in self._node_ids:
+            if flags[nid]:
+                flags[nid] = False
+                self._dirty_nodes.add(nid)
+
+    def _edge_id_list(self, edges: Iterable[tuple[Any, Any]]) -> list[int]:
+        ids = self._edge_ids
+        return [eid for eid in map(ids.get, edges) if eid is not None]
+
+    def _set_edge_flag(self, source: Any, target: Any, bit: int, edges: set[int]) -> None:
+        eid = self._edge_ids.get((source, target))
+        if eid is not None:
+            self._edge_flags[eid] |= bit
+            edges.add(eid)
+            self._dirty_edges.add(eid)
+
+    def _unset_edge_flag(self, source: Any, target: Any, bit: int, edges: set[int]) -> None:
+        eid = self._edge_ids.get((source, target))
+        if eid is not None:
+            self._edge_flags[eid] &= ~bit
+            edges.discard(eid)
+            self._dirty_edges.add(eid)
+
+    def _set_edge_flags(self, eids: list[int], bit: int, edges: set[int]) -> None:
+        flags = self._edge_flags
+        for eid in eids:
+            flags[eid] |= bit
+        edges.update(eids)
+        self._dirty_edges.update(eids)
+
+    def _unset_edge_flags(self, eids: list[int], bit: int, edges: set[int]) -> None:
+        flags = self._edge_flags
+        for eid in eids:
+            flags[eid] &= ~bit
+        edges.difference_update(eids)
+        self._dirty_edges.update(eids)
+
+    def _clear_edge_flag(self, bit: int, edges: set[int]) -> None:
+        flags = self._edge_flags
+        for eid in edges:
+            flags[eid] &= ~bit
+        self._dirty_edges |= edges
+        edges.clear()
+
+    def _set_edge_attr(self, source: Any, target: Any, values: list, value: Any) -> None:
+        eid = self._edge_ids.get((source, target))
+        if eid is not None:
+            values[eid] = value
+            self._dirty_edges.add(eid)
+
+    # --- edge lookups ---
+
+    def edge_id(self, source: Any, target: Any) -> int | None:
+        """Id of the edge source->target (either way round if undirected), or None."""
+        return self._edge_ids.get((source, target))
+
+    def has_edge(self, source: Any, target: Any) -> bool:
+        return (source, target) in self._edge_ids
+
+    def edge_key(self, source: Any, target: Any) -> tuple[Any, Any] | None:
+        """The ``(source, target)`` the edge was added as, or None."""
+        eid = self._edge_ids.get((source, target))
+        return None if eid is None else self._edges[eid]
+
+    def position(self, node_id: Any) -> tuple[float, float]:
+        return self._positions[node_id]
+
+    def is_edge_selected(self, source: Any, target: Any) -> bool:
+        eid = self._edge_ids.get((source, target))
+        return eid is not None and bool(self._edge_flags[eid] & _EDGE_SELECTED)
+
+    def edge_class(self, source: Any, target: Any) -> str:
+        eid = self._edge_ids.get((source, target))
+        return "" if eid is None else self._edge_class[eid]
+
+    # --- mutations ---
 
     def set_label(self, node_id: Any, label: str) -> None:
         self._labels[node_id] = label
+        self._dirty_nodes.add(node_id)
+
+    def set_position(self, node_id: Any, x: float, y: float) -> None:
+        self._positions[node_id] = (x, y)
+        self._dirty_nodes.add(node_id)
 
-    def add_edge(self, source: Any, target: Any, weight: float | None = None) -> None:
+    def add_edge(self, source: Any, target: Any, weight: float | None = None) -> int:
+        """Add source->target (once) and return its edge id."""
         key = (source, target)
-        if key not in self._edge_selected:
-            self._edges.append(key)
-            self._edge_selected[key] = False
-            self._edge_patched[key] = False
-            self._edge_error[key] = False
-            self._edge_weight[key] = weight
-            self._edge_label[key] = ""
-            self._edge_class[key] = ""
-            self._edge_curve_offset[key] = 0.0
+        eid = self._edge_ids.get(key)
+        if eid is not None and self._edges[eid] == key:
+            return eid
+        # An undirected (target, source) edge only aliases this key; adding
+        # this orientation explicitly gives it its own edge.
+        eid = len(self._edges)
+        self._edges.append(key)
+        self._edge_ids[key] = eid
+        if not self._directed:
+            self._edge_ids.setdefault((target, source), eid)
+        self._edge_flags.append(0)
+        self._edge_weight.append(weight)
+        self._edge_label.append("")
+        self._edge_class.append("")
+        self._edge_curve_offset.append(0.0)
+        self._frozen_edges.append(None)
+        self._dirty_edges.add(eid)
+        return eid
 
     def set_edge_weight(self, source: Any, target: Any, weight: float | None) -> None:
-        self._edge_weight[(source, target)] = weight
+        self._set_edge_attr(source, target, self._edge_weight, weight)
 
     def set_edge_label(self, source: Any, target: Any, label: str) -> None:
-        self._edge_label[(source, target)] = label
+        self._set_edge_attr(source, target, self._edge_label, label)
 
     def set_edge_class(self, source: Any, target: Any, cls: str) -> None:
-        self._edge_class[(source, target)] = cls
+        self._set_edge_attr(source, target, self._edge_class, cls)
+
+    def set_edges_class(self, edges: Iterable[tuple[Any, Any]], cls: str) -> None:
+        eids = self._edge_id_list(edges)
+        for eid in eids:
+            self._edge_class[eid] = cls
+        self._dirty_edges.update(eids)
 
     def set_edge_curve_offset(self, source: Any, target: Any, offset: float) -> None:
-        self._edge_curve_offset[(source, target)] = offset
+        self._set_edge_attr(source, target, self._edge_curve_offset, offset)
 
     def set_node_badge(self, node_id: Any, badge: str, color: str = "") -> None:
         self._node_badge[node_id] = badge
         self._node_badge_color[node_id] = color
+        self._dirty_nodes.add(node_id)
 
     def set_node_group(self, node_id: Any, group: int | None) -> None:
         self._node_group[node_id] = group
+        self._dirty_nodes.add(node_id)
 
     def select_node(self, node_id: Any) -> None:
         self._node_selected[node_id] = True
+        self._dirty_nodes.add(node_id)
 
     def deselect_node(self, node_id: Any) -> None:
         self._node_selected[node_id] = False
+        self._dirty_nodes.add(node_id)
 
     def deselect_all_nodes(self) -> None:
-        for nid in self._node_ids:
-            self._node_selected[nid] = False
+        self._clear_node_flags(self._node_selected)
 
     def patch_node(self, node_id: Any) -> None:
         self._node_patched[node_id] = True
+        self._dirty_nodes.add(node_id)
 
     def depatch_node(self, node_id: Any) -> None:
         self._node_patched[node_id] = False
+        self._dirty_nodes.add(node_id)
 
     def depatch_all_nodes(self) -> None:
-        for nid in self._node_ids:
-            self._node_patched[nid] = False
+        self._clear_node_flags(self._node_patched)
 
     def mark_node_error(self, node_id: Any) -> None:
         self._node_error[node_id] = True
+        self._dirty_nodes.add(node_id)
 
     def clear_node_error(self, node_id: Any) -> None:
         self._node_error[node_id] = False
+        self._dirty_nodes.add(node_id)
 
     def clear_all_node_errors(self) -> None:
-        for nid in self._node_ids:
-            self._node_error[nid] = False
+        self._clear_node_flags(self._node_error)
 
     def set_node_color(self, node_id: Any, color: str) -> None:
         self._node_color[node_id] = color
+        self._dirty_nodes.add(node_id)
 
     def select_edge(self, source: Any, target: Any) -> None:
-        self._edge_selected[(source, target)] = True
+        self._set_edge_flag(source, target, _EDGE_SELECTED, self._selected_edges)
+
+    def select_edges(self, edges: Iterable[tuple[Any, Any]]) -> None:
+        self._set_edge_flags(self._edge_id_list(edges), _EDGE_SELECTED, self._selected_edges)
 
     def deselect_edge(self, source: Any, target: Any) -> None:
-        self._edge_selected[(source, target)] = False
+        self._unset_edge_flag(source, target, _EDGE_SELECTED, self._selected_edges)
+
+    def deselect_edges(self, edges: Iterable[tuple[Any, Any]]) -> None:
+        self._unset_edge_flags(self._edge_id_list(edges), _EDGE_SELECTED, self._selected_edges)
 
     def deselect_all_edges(self) -> None:
-        for key in self._edges:
-            self._edge_selected[key] = False
+        self._clear_edge_flag(_EDGE_SELECTED, self._selected_edges)
 
     def patch_edge(self, source: Any, target: Any) -> None:
-        self._edge_patched[(source, target)] = True
+        self._set_edge_flag(source, target, _EDGE_PATCHED, self._patched_edges)
+
+    def patch_edges(self, edges: Iterable[tuple[Any, Any]]) -> None:
+        self._set_edge_flags(self._edge_id_list(edges), _EDGE_PATCHED, self._patched_edges)
 
     def depatch_edge(self, source: Any, target: Any) -> None:
-        self._edge_patched[(source, target)] = False
+        self._unset_edge_flag(source, target, _EDGE_PATCHED, self._patched_edges)
+
+    def depatch_edges(self, edges: Iterable[tuple[Any, Any]]) -> None:
+        self._unset_edge_flags(self._edge_id_list(edges), _EDGE_PATCHED, self._patched_edges)
 
     def depatch_all_edges(self) -> None:
-        for key in self._edges:
-            self._edge_patched[key] = False
+        self._clear_edge_flag(_EDGE_PATCHED, self._patched_edges)
 
     def mark_edge_error(self, source: Any, target: Any) -> None:
-        self._edge_error[(source, target)] = True
+        self._set_edge_flag(source, target, _EDGE_ERROR, self._error_edges)
 
     def clear_edge_error(self, source: Any, target: Any) -> None:
-        self._edge_error[(source, target)] = False
+        self._unset_edge_flag(source, target, _EDGE_ERROR, self._error_edges)
 
     def clear_all_edge_errors(self) -> None:
-        for key in self._edges:
-            self._edge_error[key] = False
+        self._clear_edge_flag(_EDGE_ERROR, self._error_edges)
 
     def set_layered_layout(self) -> None:
-        """Compute a layered (Sugiyama-style) layout for DAGs."""
-        adj: dict[Any, list[Any]] = {nid: [] for nid in self._node_ids}
-        in_degree: dict[Any, int] = {nid: 0 for nid in self._node_ids}
-        for s, t in self._edges:
-            adj[s].append(t)
-            in_degree[t] = in_degree.get(t, 0) + 1
-
-        layer: dict[Any, int] = {}
-        queue = deque([nid for nid in self._node_ids if in_degree[nid] == 0])
-        for nid in queue:
-            layer[nid] = 0
-
-        while queue:
-            u = queue.popleft()
-            for v in adj[u]:
-                layer[v] = max(layer.get(v, 0), layer[u] + 1)
-                in_degree[v] -= 1
-                if in_degree[v] == 0:
-                    queue.append(v)
-
-        # Handle nodes not reached (cycles) — place at bottom
-        max_layer = max(layer.values()) if layer else 0
-        for nid in self._node_ids:
-            if nid not in layer:
-                max_layer += 1
-                layer[nid] = max_layer
+        """Compute a layered (Sugiyama-style) layout for DAGs.
 
-        layers: dict[int, list[Any]] = {}
-        for nid, lyr in layer.items():
-            layers.setdefault(lyr, []).append(nid)
+        Call after adding the edges. See core.layout.layered_layout.
+        """
+        self._positions.update(layered_layout(self._node_ids, self._edges))
+        self._dirty_nodes.update(self._node_ids)
 
-        total_layers = max(layers.keys()) + 1 if layers else 1
-        for lyr, nids in layers.items():
-            for i, nid in enumerate(nids):
-                x = (i + 1) / (len(nids) + 1)
-                y = (lyr + 0.5) / total_layers
-                self._positions[nid] = (x, y)
+    def set_force_layout(self, iterations: int | None = None, seed: int = 0) -> None:
+        """Compute a force-directed layout, for graphs too big to read on a circle.
+
+        Call after adding the edges. See core.layout.force_directed_layout.
+        """
+        self._positions.update(force_directed_layout(self._node_ids, self._edges, iterations, seed))
+        self._dirty_nodes.update(self._node_ids)
 
     def log(self, message: str) -> None:
         self._log.append(message)
 
-    def snapshot(self, line_number: int, description: str = "") -> Step:
-        nodes = tuple(
-            GraphNode(
-                id=nid,
-                label=self._labels[nid],
-                selected=self._node_selected[nid],
-                patched=self._node_patched[nid],
-                error=self._node_error[nid],
-                color=self._node_color[nid],
-                x=self._positions[nid][0],
-                y=self._positions[nid][1],
-                badge=self._node_badge[nid],
-                badge_color=self._node_badge_color[nid],
-                group=self._node_group[nid],
+    def _freeze_edge(self, eid: int) -> GraphEdge:
+        source, target = self._edges[eid]
+        weight = self._edge_weight[eid]
+        flags = self._edge_flags[eid]
+        label, cls, offset = self._edge_label[eid], self._edge_class[eid], self._edge_curve_offset[eid]
+        key = (type(weight), source, target, flags, weight, label, cls, offset)
+        try:
+            edge = self._edge_pool.get(key)
+        except TypeError:  # unhashable weight: not pooled
+            key = edge = None
+        if edge is None:
+            edge = GraphEdge(
+                source,
+                target,
+                bool(flags & _EDGE_SELECTED),
+                bool(flags & _EDGE_PATCHED),
+                bool(flags & _EDGE_ERROR),
+                self._directed,
+                weight,
+                label,
+                cls,
+                offset,
             )
-            for nid in self._node_ids
-        )
-        edges = tuple(
-            GraphEdge(
-                source=s,
-                target=t,
-                selected=self._edge_selected[(s, t)],
-                patched=self._edge_patched[(s, t)],
-                error=self._edge_error[(s, t)],
-                directed=self._directed,
-                weight=self._edge_weight[(s, t)],
-                label=self._edge_label[(s, t)],
-                edge_class=self._edge_class[(s, t)],
-                curve_offset=self._edge_curve_offset[(s, t)],
-            )
-            for s, t in self._edges
-        )
+            if key is not None:
+                self._edge_pool[key] = edge
+        return edge
+
+    def snapshot(self, line_number: int, description: str = "") -> Step:
+        # Mutations may name node ids that aren't part of the graph; those
+        # aren't rendered.
+        dirty_nodes = self._dirty_nodes.intersection(self._frozen_nodes)
+        for nid in dirty_nodes:
+            self._frozen_nodes[nid] = _interned(self._node_pool, GraphNode, (
+                nid,
+                self._labels[nid],
+                self._node_selected[nid],
+                self._node_patched[nid],
+                self._node_error[nid],
+                self._node_color[nid],
+                self._positions[nid][0],
+                self._positions[nid][1],
+                self._node_badge[nid],
+                self._node_badge_color[nid],
+                self._node_group[nid],
+            ))
+        if dirty_nodes or self._nodes is None:
+            self._nodes = tuple(self._frozen_nodes.values())
+        if self._dirty_edges or self._edge_tuple is None:
+            for eid in self._dirty_edges:
+                self._frozen_edges[eid] = self._freeze_edge(eid)
+            self._edge_tuple = tuple(self._frozen_edges)
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
         return Step(
             line_number=line_number,
             description=description,
-            graph_nodes=nodes,
-            graph_edges=edges,
-            log_messages=_windowed_logs(self._log),
+            graph_nodes=self._nodes,
+            graph_edges=self._edge_tuple,
+            log_messages=self._log_window(self._log),
+            log_count=len(self._log),
         )
 
 
 class AuxPanelTracer:
-    """Manages auxiliary display panels (queues, stacks, visited sets)."""
+    """Manages auxiliary display panels (queues, stacks, visited sets).
+
+    Only panels touched since the last snapshot are refrozen.
+    """
 
     def __init__(self) -> None:
         self._panels: dict[str, list[dict]] = {}
         self._panel_order: list[str] = []
+        self._item_pool: dict[tuple, AuxPanelItem] = {}
+        self._panel_pool: dict[tuple, AuxPanel] = {}
+        self._frozen: dict[str, AuxPanel] = {}
+        self._snapshot: tuple[AuxPanel, ...] | None = None
+        self._dirty: set[str] = set()
 
     def add_panel(self, title: str) -> None:
         if title not in self._panels:
             self._panels[title] = []
             self._panel_order.append(title)
+            self._dirty.add(title)
 
     def push(self, panel_title: str, label: str, value: Any = "") -> None:
         self._panels[panel_title].append({
             "label": label, "value": value,
             "selected": False, "patched": False, "error": False,
         })
+        self._dirty.add(panel_title)
 
     def pop(self, panel_title: str) -> dict | None:
         items = self._panels.get(panel_title, [])
-        return items.pop() if items else None
+        if not items:
+            return None
+        self._dirty.add(panel_title)
+        return items.pop()
 
     def pop_front(self, panel_title: str) -> dict | None:
         items = self._panels.get(panel_title, [])
-        return items.pop(0) if items else None
+        if not items:
+            return None
+        self._dirty.add(panel_title)
+        return items.pop(0)
 
     def clear_panel(self, panel_title: str) -> None:
         self._panels[panel_title] = []
+        self._dirty.add(panel_title)
 
     def select_item(self, panel_title: str, index: int) -> None:
         self._panels[panel_title][index]["selected"] = True
+        self._dirty.add(panel_title)
 
     def deselect_all_items(self, panel_title: str) -> None:
         for item in self._panels.get(panel_title, []):
             item["selected"] = False
+        self._dirty.add(panel_title)
 
     def patch_item(self, panel_title: str, index: int) -> None:
         self._panels[panel_title][index]["patched"] = True
+        self._dirty.add(panel_title)
 
     def set_items(self, panel_title: str, items: list[tuple[str, Any]]) -> None:
         """Replace entire panel contents. Useful for 'visited set' style panels."""
@@ -445,24 +754,29 @@ class AuxPanelTracer:
              "selected": False, "patched": False, "error": False}
             for label, value in items
         ]
+        self._dirty.add(panel_title)
 
     def snapshot(self) -> tuple[AuxPanel, ...]:
-        return tuple(
-            AuxPanel(
-                title=title,
-                items=tuple(
-                    AuxPanelItem(
-                        label=item["label"],
-                        value=item["value"],
-                        selected=item["selected"],
-                        patched=item["patched"],
-                        error=item["error"],
-                    )
+        dirty = self._dirty.intersection(self._panel_order)
+        for title in dirty:
+            self._frozen[title] = _interned(self._panel_pool, AuxPanel, (
+                title,
+                tuple(
+                    _interned(self._item_pool, AuxPanelItem, (
+                        type(item["value"]),
+                        item["label"],
+                        item["value"],
+                        item["selected"],
+                        item["patched"],
+                        item["error"],
+                    ), 1)
                     for item in self._panels[title]
                 ),
-            )
-            for title in self._panel_order
-        )
+            ))
+        if dirty or self._snapshot is None:
+            self._snapshot = tuple(self._frozen[title] for title in self._panel_order)
+        self._dirty.clear()
+        return self._snapshot
 
 
 class DSUTracer:
@@ -477,6 +791,17 @@ class DSUTracer:
         self._patched: dict[Any, bool] = {nid: False for nid in node_ids}
         self._error: dict[Any, bool] = {nid: False for nid in node_ids}
         self._log: list[str] = []
+        self._log_window = _LogWindow()
+        self._node_pool: dict[tuple, DSUNode] = {}
+        self._frozen: dict[Any, DSUNode | None] = {nid: None for nid in node_ids}
+        self._nodes: tuple[DSUNode, ...] | None = None
+        self._dirty: set[Any] = set(node_ids)
+
+    def _clear_flags(self, flags: dict[Any, bool]) -> None:
+        for nid in self._node_ids:
+            if flags[nid]:
+                flags[nid] = False
+                self._dirty.add(nid)
 
     def make_set(self, node_id: Any, label: str = "") -> None:
         if node_id not in self._parent:
@@ -487,83 +812,169 @@ class DSUTracer:
             self._selected[node_id] = False
             self._patched[node_id] = False
             self._error[node_id] = False
+            self._frozen[node_id] = None
+            self._dirty.add(node_id)
 
     def set_parent(self, node_id: Any, parent_id: Any) -> None:
         self._parent[node_id] = parent_id
+        self._dirty.add(node_id)
 
     def set_rank(self, node_id: Any, rank: int) -> None:
         self._rank[node_id] = rank
+        self._dirty.add(node_id)
 
     def set_label(self, node_id: Any, label: str) -> None:
         self._labels[node_id] = label
+        self._dirty.add(node_id)
 
     def select(self, node_id: Any) -> None:
         self._selected[node_id] = True
+        self._dirty.add(node_id)
 
     def deselect(self, node_id: Any) -> None:
         self._selected[node_id] = False
+        self._dirty.add(node_id)
 
     def deselect_all(self) -> None:
-        for nid in self._node_ids:
-            self._selected[nid] = False
+        self._clear_flags(self._selected)
 
     def patch(self, node_id: Any) -> None:
         self._patched[node_id] = True
+        self._dirty.add(node_id)
 
     def depatch_all(self) -> None:
-        for nid in self._node_ids:
-            self._patched[nid] = False
+        self._clear_flags(self._patched)
 
     def mark_error(self, node_id: Any) -> None:
         self._error[node_id] = True
+        self._dirty.add(node_id)
 
     def clear_all_errors(self) -> None:
-        for nid in self._node_ids:
-            self._error[nid] = False
+        self._clear_flags(self._error)
 
     def log(self, message: str) -> None:
         self._log.append(message)
 
     def snapshot(self, line_number: int, description: str = "") -> Step:
-        dsu_nodes = tuple(
-            DSUNode(
-                id=nid,
-                label=self._labels[nid],
-                parent_id=None if self._parent[nid] == nid else self._parent[nid],
-                rank=self._rank[nid],
-                selected=self._selected[nid],
-                patched=self._patched[nid],
-                error=self._error[nid],
-            )
-            for nid in self._node_ids
-        )
+        dirty = self._dirty.intersection(self._frozen)
+        for nid in dirty:
+            self._frozen[nid] = _interned(self._node_pool, DSUNode, (
+                nid,
+                self._labels[nid],
+                None if self._parent[nid] == nid else self._parent[nid],
+                self._rank[nid],
+                self._selected[nid],
+                self._patched[nid],
+                self._error[nid],
+            ))
+        if dirty or self._nodes is None:
+            self._nodes = tuple(self._frozen.values())
+        self._dirty.clear()
         return Step(
             line_number=line_number,
             description=description,
-            dsu_nodes=dsu_nodes,
-            log_messages=_windowed_logs(self._log),
+            dsu_nodes=self._nodes,
+            log_messages=self._log_window(self._log),
+            log_count=len(self._log),
         )
 
 
+# Items per chunk of a Chunked step sequence, and the stand-in parent of the
+# trie's root row.
+_CHUNK = 64
+_ROOT_ROW = object()
+
+
+def _rechunk(chunks: list[tuple], items: list, touched: set[int]) -> Chunked:
+    """Rebuild the ``touched`` chunks of append-only ``items``; return the sequence.
+
+    New items are always touched, so chunks past the old end get built too.
+    """
+    chunks.extend(() for _ in range(-(-len(items) // _CHUNK) - len(chunks)))
+    for c in touched:
+        chunks[c] = tuple(items[c * _CHUNK:(c + 1) * _CHUNK])
+    return Chunked(tuple(chunks), _CHUNK)
+
+
 class TrieTracer:
-    """Mutable Trie tracer with automatic tree layout."""
+    """Mutable Trie tracer with automatic tree layout.
+
+    Every node gets a span of leaf slots, as wide as its leaf count, and its
+    children split that span left to right in insertion order. Nodes record
+    their span relative to the parent's (``TrieNode.offset``/``leaves``),
+    so adding a leaf re-places only the children of its ancestors, and of
+    those only the ones on its path or to the right of it change. Payloads
+    resolve absolute positions in [0, 1] per step (``trie_positions``).
+
+    Only the first edge into a node that doesn't close a cycle shapes the
+    layout; other edges are drawn but leave positions alone. Leaf counts
+    and depths are maintained on add_edge. Flags are held as sets, so the
+    ``*_all`` clears cost O(flags set). Nodes/edges are only refrozen when
+    mutated or moved since the last snapshot, and steps hold them as
+    ``Chunked`` sequences, so a snapshot copies only the chunks that changed.
+    """
 
     def __init__(self) -> None:
         self._node_ids: list[Any] = []
         self._labels: dict[Any, str] = {}
-        self._selected: dict[Any, bool] = {}
-        self._patched: dict[Any, bool] = {}
-        self._error: dict[Any, bool] = {}
+        self._selected: set[Any] = set()
+        self._patched: set[Any] = set()
+        self._error: set[Any] = set()
         self._is_end: dict[Any, bool] = {}
-        self._positions: dict[Any, tuple[float, float]] = {}
         self._edges: list[tuple[Any, Any]] = []
         self._edge_labels: dict[tuple[Any, Any], str] = {}
-        self._edge_selected: dict[tuple[Any, Any], bool] = {}
-        self._edge_patched: dict[tuple[Any, Any], bool] = {}
-        self._edge_error: dict[tuple[Any, Any], bool] = {}
+        self._edge_selected: set[tuple[Any, Any]] = set()
+        self._edge_patched: set[tuple[Any, Any]] = set()
+        self._edge_error: set[tuple[Any, Any]] = set()
+        # Layout tree: children in insertion order, parent, leaf count and
+        # depth per node, and the root row (an ordered set, in add order).
         self._children: dict[Any, list[Any]] = {}
+        self._parent: dict[Any, Any] = {}
+        self._leaves: dict[Any, int] = {}
+        self._depth: dict[Any, int] = {}
+        self._roots: dict[Any, None] = {}
+        # Span offset per node within its parent's span, and the parents (or
+        # _ROOT_ROW) whose children must be re-placed.
+        self._offset: dict[Any, int] = {}
+        self._changed: set[Any] = set()
         self._log: list[str] = []
+        self._log_window = _LogWindow()
         self._next_id = 0
+        self._node_pool: dict[tuple, TrieNode] = {}
+        self._edge_pool: dict[tuple, TrieEdge] = {}
+        # Frozen state per node/edge, in add order, and its chunks.
+        self._node_index: dict[Any, int] = {}
+        self._frozen_nodes: list[TrieNode | None] = []
+        self._node_chunks: list[tuple[TrieNode, ...]] = []
+        self._nodes: Chunked | None = None
+        self._edge_index: dict[tuple[Any, Any], int] = {}
+        self._frozen_edges: list[TrieEdge | None] = []
+        self._edge_chunks: list[tuple[TrieEdge, ...]] = []
+        self._edge_seq: Chunked | None = None
+        self._dirty_nodes: set[Any] = set()
+        self._dirty_edges: set[tuple[Any, Any]] = set()
+
+    def _clear_node_flags(self, flags: set[Any]) -> None:
+        self._dirty_nodes |= flags
+        flags.clear()
+
+    def _clear_edge_flags(self, flags: set[tuple[Any, Any]]) -> None:
+        self._dirty_edges |= flags
+        flags.clear()
+
+    def _set_node_flag(self, node_id: Any, flags: set[Any], on: bool) -> None:
+        if on:
+            flags.add(node_id)
+        else:
+            flags.discard(node_id)
+        self._dirty_nodes.add(node_id)
+
+    def _set_edge_flag(self, key: tuple[Any, Any], flags: set[tuple[Any, Any]], on: bool) -> None:
+        if on:
+            flags.add(key)
+        else:
+            flags.discard(key)
+        self._dirty_edges.add(key)
 
     def add_node(self, node_id: Any = None, label: str = "", is_end: bool = False) -> Any:
         if node_id is None:
@@ -571,165 +982,190 @@ class TrieTracer:
             self._next_id += 1
         self._node_ids.append(node_id)
         self._labels[node_id] = label
-        self._selected[node_id] = False
-        self._patched[node_id] = False
-        self._error[node_id] = False
         self._is_end[node_id] = is_end
-        self._children[node_id] = []
+        self._children.setdefault(node_id, [])
+        if node_id not in self._node_index:
+            self._node_index[node_id] = len(self._frozen_nodes)
+            self._frozen_nodes.append(None)
+        if node_id in self._parent:
+            self._changed.add(self._parent[node_id])
+        else:
+            self._roots[node_id] = None
+            self._changed.add(_ROOT_ROW)
+        self._dirty_nodes.add(node_id)
         return node_id
 
+    def _is_ancestor(self, node: Any, of: Any) -> bool:
+        parent = self._parent
+        while True:
+            if of == node:
+                return True
+            if of not in parent:
+                return False
+            of = parent[of]
+
     def add_edge(self, source: Any, target: Any, label: str = "") -> None:
         key = (source, target)
-        if key not in self._edge_selected:
-            self._edges.append(key)
-            self._edge_labels[key] = label
-            self._edge_selected[key] = False
-            self._edge_patched[key] = False
-            self._edge_error[key] = False
-            if target not in self._children.get(source, []):
-                self._children.setdefault(source, []).append(target)
+        if key in self._edge_index:
+            return
+        self._edges.append(key)
+        self._edge_labels[key] = label
+        self._edge_index[key] = len(self._frozen_edges)
+        self._frozen_edges.append(None)
+        self._dirty_edges.add(key)
+        if target in self._parent or self._is_ancestor(target, source):
+            return
+        children = self._children.setdefault(source, [])
+        children.append(target)
+        self._parent[target] = source
+        changed = self._changed
+        if target in self._roots:
+            del self._roots[target]
+            changed.add(_ROOT_ROW)
+
+        # Push the new child's subtree below the source.
+        depth, dirty = self._depth, self._dirty_nodes
+        stack = [(target, depth.get(source, 0) + 1)]
+        while stack:
+            node, d = stack.pop()
+            if depth.get(node, 0) == d:
+                continue
+            depth[node] = d
+            dirty.add(node)
+            stack.extend((c, d + 1) for c in self._children.get(node, ()))
+
+        # Update leaf counts from source up to its root. A first child adds
+        # no leaves, so only the source's children need re-placing.
+        leaves = self._leaves
+        added = leaves.get(target, 1) - (1 if len(children) == 1 else 0)
+        node: Any = source
+        changed.add(node)
+        while added:
+            leaves[node] = leaves.get(node, 1) + added
+            dirty.add(node)
+            if node not in self._parent:
+                changed.add(_ROOT_ROW)
+                break
+            node = self._parent[node]
+            changed.add(node)
 
     def set_end(self, node_id: Any, is_end: bool = True) -> None:
         self._is_end[node_id] = is_end
+        self._dirty_nodes.add(node_id)
 
     def select_node(self, node_id: Any) -> None:
-        self._selected[node_id] = True
+        self._set_node_flag(node_id, self._selected, True)
 
     def deselect_node(self, node_id: Any) -> None:
-        self._selected[node_id] = False
+        self._set_node_flag(node_id, self._selected, False)
 
     def deselect_all_nodes(self) -> None:
-        for nid in self._node_ids:
-            self._selected[nid] = False
+        self._clear_node_flags(self._selected)
 
     def patch_node(self, node_id: Any) -> None:
-        self._patched[node_id] = True
+        self._set_node_flag(node_id, self._patched, True)
 
     def depatch_node(self, node_id: Any) -> None:
-        self._patched[node_id] = False
+        self._set_node_flag(node_id, self._patched, False)
 
     def select_edge(self, source: Any, target: Any) -> None:
-        self._edge_selected[(source, target)] = True
+        self._set_edge_flag((source, target), self._edge_selected, True)
 
     def deselect_edge(self, source: Any, target: Any) -> None:
-        self._edge_selected[(source, target)] = False
+        self._set_edge_flag((source, target), self._edge_selected, False)
 
     def deselect_all_edges(self) -> None:
-        for key in self._edges:
-            self._edge_selected[key] = False
+        self._clear_edge_flags(self._edge_selected)
 
     def patch_edge(self, source: Any, target: Any) -> None:
-        self._edge_patched[(source, target)] = True
+        self._set_edge_flag((source, target), self._edge_patched, True)
 
     def depatch_edge(self, source: Any, target: Any) -> None:
-        self._edge_patched[(source, target)] = False
+        self._set_edge_flag((source, target), self._edge_patched, False)
 
     def depatch_all_nodes(self) -> None:
-        for nid in self._node_ids:
-            self._patched[nid] = False
+        self._clear_node_flags(self._patched)
 
     def depatch_all_edges(self) -> None:
-        for key in self._edges:
-            self._edge_patched[key] = False
+        self._clear_edge_flags(self._edge_patched)
 
     def mark_node_error(self, node_id: Any) -> None:
-        self._error[node_id] = True
+        self._set_node_flag(node_id, self._error, True)
 
     def clear_node_error(self, node_id: Any) -> None:
-        self._error[node_id] = False
+        self._set_node_flag(node_id, self._error, False)
 
     def clear_all_node_errors(self) -> None:
-        for nid in self._node_ids:
-            self._error[nid] = False
+        self._clear_node_flags(self._error)
 
     def mark_edge_error(self, source: Any, target: Any) -> None:
-        self._edge_error[(source, target)] = True
+        self._set_edge_flag((source, target), self._edge_error, True)
 
     def clear_edge_error(self, source: Any, target: Any) -> None:
-        self._edge_error[(source, target)] = False
+        self._set_edge_flag((source, target), self._edge_error, False)
 
     def clear_all_edge_errors(self) -> None:
-        for key in self._edges:
-            self._edge_error[key] = False
+        self._clear_edge_flags(self._edge_error)
 
     def log(self, message: str) -> None:
         self._log.append(message)
 
     def _compute_layout(self) -> None:
-        """Compute tree layout positions in [0,1] range."""
-        if not self._node_ids:
-            return
-        targets = set(t for _, t in self._edges)
-        roots = [nid for nid in self._node_ids if nid not in targets]
-        if not roots:
-            roots = [self._node_ids[0]]
-
-        def depth(nid: Any) -> int:
-            ch = self._children.get(nid, [])
-            return 1 + max((depth(c) for c in ch), default=0)
-
-        def count_leaves(nid: Any) -> int:
-            ch = self._children.get(nid, [])
-            if not ch:
-                return 1
-            return sum(count_leaves(c) for c in ch)
-
-        max_d = max(depth(r) for r in roots)
-
-        def layout(nid: Any, x_min: float, x_max: float, level: int) -> None:
-            y = (level + 0.5) / max(max_d, 1)
-            ch = self._children.get(nid, [])
-            if not ch:
-                self._positions[nid] = ((x_min + x_max) / 2, y)
-                return
-            self._positions[nid] = ((x_min + x_max) / 2, y)
-            child_leaves = [count_leaves(c) for c in ch]
-            total = sum(child_leaves)
-            cx = x_min
-            for i, cid in enumerate(ch):
-                cw = (child_leaves[i] / total) * (x_max - x_min) if total else (x_max - x_min) / len(ch)
-                layout(cid, cx, cx + cw, level + 1)
-                cx += cw
-
-        total_leaves = sum(count_leaves(r) for r in roots)
-        rx = 0.05
-        for root in roots:
-            rw = (count_leaves(root) / total_leaves) * 0.9 if total_leaves else 0.9
-            layout(root, rx, rx + rw, 0)
-            rx += rw
+        """Re-place the children of every changed parent (see the class docstring)."""
+        offsets, leaves, dirty = self._offset, self._leaves, self._dirty_nodes
+        for parent in self._changed:
+            row = self._roots if parent is _ROOT_ROW else self._children.get(parent, ())
+            offset = 0
+            for node in row:
+                if offsets.get(node) != offset:
+                    offsets[node] = offset
+                    dirty.add(node)
+                offset += leaves.get(node, 1)
+        self._changed.clear()
 
     def snapshot(self, line_number: int, description: str = "") -> Step:
         self._compute_layout()
-        trie_nodes = tuple(
-            TrieNode(
-                id=nid,
-                label=self._labels[nid],
-                x=self._positions.get(nid, (0.5, 0.5))[0],
-                y=self._positions.get(nid, (0.5, 0.5))[1],
-                selected=self._selected[nid],
-                patched=self._patched[nid],
-                error=self._error[nid],
-                is_end=self._is_end[nid],
-            )
-            for nid in self._node_ids
-        )
-        trie_edges = tuple(
-            TrieEdge(
-                source=s,
-                target=t,
-                label=self._edge_labels.get((s, t), ""),
-                selected=self._edge_selected[(s, t)],
-                patched=self._edge_patched[(s, t)],
-                error=self._edge_error[(s, t)],
-            )
-            for s, t in self._edges
-        )
+        # Mutations may name ids that aren't part of the trie; those aren't rendered.
+        index, frozen, touched = self._node_index, self._frozen_nodes, set()
+        pool, parent, offsets, leaves, depth = (
+            self._node_pool, self._parent, self._offset, self._leaves, self._depth)
+        selected, patched, error = self._selected, self._patched, self._error
+        for nid in [nid for nid in self._dirty_nodes if nid in index]:
+            key = (nid, self._labels[nid], parent.get(nid), offsets.get(nid, 0), leaves.get(nid, 1),
+                   depth.get(nid, 0), nid in selected, nid in patched, nid in error, self._is_end[nid])
+            node = pool.get(key)
+            if node is None:
+                node = pool[key] = TrieNode(*key)
+            i = index[nid]
+            if frozen[i] is not node:
+                frozen[i] = node
+                touched.add(i // _CHUNK)
+        if touched or self._nodes is None:
+            self._nodes = _rechunk(self._node_chunks, frozen, touched)
+        index, frozen, touched = self._edge_index, self._frozen_edges, set()
+        for key in [key for key in self._dirty_edges if key in index]:
+            edge = _interned(self._edge_pool, TrieEdge, (
+                *key,
+                self._edge_labels.get(key, ""),
+                key in self._edge_selected,
+                key in self._edge_patched,
+                key in self._edge_error,
+            ))
+            i = index[key]
+            if frozen[i] is not edge:
+                frozen[i] = edge
+                touched.add(i // _CHUNK)
+        if touched or self._edge_seq is None:
+            self._edge_seq = _rechunk(self._edge_chunks, frozen, touched)
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
         return Step(
             line_number=line_number,
             description=description,
-            trie_nodes=trie_nodes,
-            trie_edges=trie_edges,
-            log_messages=_windowed_logs(self._log),
+            trie_nodes=self._nodes,
+            trie_edges=self._edge_seq,
+            log_messages=self._log_window(self._log),
+            log_count=len(self._log),
         )
 
 
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from typing import Any
+
+from core.step import Step, trie_positions
+
+WIRE_MEDIA_TYPE = "application/vnd.algoviz.steps"
+WIRE_MAGIC = b"AVZB"
+WIRE_VERSION = 1
+
+# Value tags. Every value column is a u8 tag array followed by an f64 array;
+# strings (and JSON-encoded fallbacks) store their string-table index there.
+_NONE, _FALSE, _TRUE, _NUMBER, _STRING, _JSON = range(6)
+
+# Per-step presence bits.
+_HAS_BOARD = 1
+_HAS_ARRAY = 2
+_HAS_GRAPH = 4
+_HAS_AUX = 8
+_HAS_DSU = 16
+_HAS_TRIE = 32
+
+# Per-item flag bits. Bits 3 and 4 are renderer specific (on_path, directed,
+# is_end, has_group, has_weight).
+_SELECTED = 1
+_PATCHED = 2
+_ERROR = 4
+_BIT3 = 8
+_BIT4 = 16
+
+_U32 = "I" if array("I").itemsize == 4 else "L"
+_I32 = "i" if array("i").itemsize == 4 else "l"
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<4sI")
+_STEP = struct.Struct("<III")
+
+
+def _flags(item: Any) -> int:
+    return (
+        (_SELECTED if item.selected else 0)
+        | (_PATCHED if item.patched else 0)
+        | (_ERROR if item.error else 0)
+    )
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.strings: list[str] = [""]
+        self._string_index: dict[str, int] = {"": 0}
+
+    def string(self, text: str) -> int:
+        index = self._string_index.get(text)
+        if index is None:
+            index = self._string_index[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def _typed(self, code: str, values: list) -> None:
+        packed = array(code, values)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        self.buf += packed.tobytes()
+
+    def u8s(self, values: list[int]) -> None:
+        self.buf += bytes(values)
+
+    def u32(self, value: int) -> None:
+        self.buf += struct.pack("<I", value)
+
+    def u32s(self, values: list[int]) -> None:
+        self._typed(_U32, values)
+
+    def i32s(self, values: list[int]) -> None:
+        self._typed(_I32, values)
+
+    def f64s(self, values: list[float]) -> None:
+        self._typed("d", values)
+
+    def strs(self, texts: list[str]) -> None:
+        self.u32s([self.string(t) for t in texts])
+
+    def values(self, values: list[Any]) -> None:
+        tags: list[int] = []
+        nums: list[float] = []
+        for v in values:
+            if v is None:
+                tags.append(_NONE)
+                nums.append(0.0)
+            elif v is True or v is False:
+                tags.append(_TRUE if v else _FALSE)
+                nums.append(0.0)
+            elif isinstance(v, (int, float)):
+                tags.append(_NUMBER)
+                nums.append(float(v))
+            elif isinstance(v, str):
+                tags.append(_STRING)
+                nums.append(float(self.string(v)))
+            else:
+                tags.append(_JSON)
+                nums.append(float(self.string(json.dumps(v))))
+        self.u8s(tags)
+        self.f64s(nums)
+
+    def step(self, step: Step) -> None:
+        self.buf += _STEP.pack(step.line_number, self.string(step.description), len(step.log_messages))
+        self.strs(list(step.log_messages))
+        presence = (
+            (_HAS_BOARD if step.board is not None else 0)
+            | (_HAS_ARRAY if step.array is not None else 0)
+            | (_HAS_GRAPH if step.graph_nodes is not None else 0)
+            | (_HAS_AUX if step.aux_panels else 0)
+            | (_HAS_DSU if step.dsu_nodes is not None else 0)
+            | (_HAS_TRIE if step.trie_nodes is not None else 0)
+        )
+        self.buf.append(presence)
+        if step.board is not None:
+            cells = [c for row in step.board for c in row]
+            self.u32(len(step.board))
+            self.u32(len(step.board[0]) if step.board else 0)
+            self.values([c.value for c in cells])
+            self.u8s([_flags(c) | (_BIT3 if c.on_path else 0) for c in cells])
+            self.strs([c.overlay_text for c in cells])
+            self.strs([c.overlay_color for c in cells])
+            self.strs([c.arrow_dir for c in cells])
+        if step.array is not None:
+            self.u32(len(step.array))
+            self.values([c.value for c in step.array])
+            self.u8s([_flags(c) for c in step.array])
+        if step.graph_nodes is not None:
+            nodes = step.graph_nodes
+            self.u32(len(nodes))
+            self.values([n.id for n in nodes])
+            self.strs([n.label for n in nodes])
+            self.u8s([_flags(n) | (_BIT3 if n.group is not None else 0) for n in nodes])
+            self.strs([n.color for n in nodes])
+            self.strs([n.badge for n in nodes])
+            self.strs([n.badge_color for n in nodes])
+            self.f64s([n.x for n in nodes])
+            self.f64s([n.y for n in nodes])
+            self.i32s([n.group or 0 for n in nodes])
+            edges = step.graph_edges or ()
+            self.u32(len(edges))
+            self.values([e.source for e in edges])
+            self.values([e.target for e in edges])
+            self.u8s([
+                _flags(e) | (_BIT3 if e.directed else 0) | (_BIT4 if e.weight is not None else 0)
+                for e in edges
+            ])
+            self.f64s([e.weight or 0.0 for e in edges])
+            self.strs([e.label for e in edges])
+            self.strs([e.edge_class for e in edges])
+            self.f64s([e.curve_offset for e in edges])
+        if step.aux_panels:
+            self.u32(len(step.aux_panels))
+            for panel in step.aux_panels:
+                self.u32(self.string(panel.title))
+                self.u32(len(panel.items))
+                self.strs([i.label for i in panel.items])
+                self.values([i.value for i in panel.items])
+                self.u8s([_flags(i) for i in panel.items])
+        if step.dsu_nodes is not None:
+            nodes = step.dsu_nodes
+            self.u32(len(nodes))
+            self.values([n.id for n in nodes])
+            self.strs([n.label for n in nodes])
+            self.values([n.parent_id for n in nodes])
+            self.i32s([n.rank for n in nodes])
+            self.u8s([_flags(n) for n in nodes])
+        if step.trie_nodes is not None:
+            nodes = step.trie_nodes
+            self.u32(len(nodes))
+            self.values([n.id for n in nodes])
+            self.strs([n.label for n in nodes])
+            positions = trie_positions(nodes)
+            self.f64s([positions[n.id][0] for n in nodes])
+            self.f64s([positions[n.id][1] for n in nodes])
+            self.u8s([_flags(n) | (_BIT3 if n.is_end else 0) for n in nodes])
+            edges = step.trie_edges or ()
+            self.u32(len(edges))
+            self.values([e.source for e in edges])
+            self.values([e.target for e in edges])
+            self.strs([e.label for e in edges])
+            self.u8s([_flags(e) for e in edges])
+
+
+def _section(tag: bytes, payload: bytes) -> bytes:
+    return _SECTION.pack(tag, len(payload)) + payload
+
+
+def encode_binary(steps: list[Step], meta: dict[str, Any]) -> bytes:
+    """Encode a run in the binary wire format.
+
+    Layout (little-endian): ``b"AVZB"``, u16 version, u16 section count, then
+    sections of 4-byte tag + u32 length + payload:
+
+    - ``META``: UTF-8 JSON object (``source_code``, ``renderer_type``, ...).
+    - ``STRS``: u32 count, u32 byte lengths, then the UTF-8 bytes of every
+      string; index 0 is always ``""``.
+    - ``STEP``: u32 count, then per step u32 line number, u32 description,
+      u32 log count + u32 log strings, a u8 presence mask and one typed-array
+      block per present renderer (see ``_Writer.step``).
+
+    Steps are read straight from the frozen dataclasses; no per-step dicts
+    are built.
+    """
+    writer = _Writer()
+    writer.u32(len(steps))
+    for step in steps:
+        writer.step(step)
+    step_bytes = bytes(writer.buf)
+
+    strings = _Writer()
+    encoded = [s.encode("utf-8") for s in writer.strings]
+    strings.u32(len(encoded))
+    strings.u32s([len(b) for b in encoded])
+    strings.buf += b"".join(encoded)
+
+    meta_bytes = json.dumps({**meta, "step_count": len(steps)}, separators=(",", ":")).encode("utf-8")
+    return b"".join((
+        _HEADER.pack(WIRE_MAGIC, WIRE_VERSION, 3),
+        _section(b"META", meta_bytes),
+        _section(b"STRS", bytes(strings.buf)),
+        _section(b"STEP", step_bytes),
+    ))
@@ -0,0 +1,13 @@
+"""gunicorn settings for the Procfile's web process (loaded with ``-c``)."""
+
+from __future__ import annotations
+
+import os
+
+from core.metrics import DEFAULT_METRICS_DIR, Metrics
+
+
+def on_starting(server) -> None:
+    # Runs once in the master, before any worker boots (with or without
+    # --preload), so /metrics totals start from zero with each deploy.
+    Metrics(os.environ.get("METRICS_DIR", DEFAULT_METRICS_DIR)).reset()
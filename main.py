@@ -1,17 +1,56 @@
 from __future__ import annotations
 
+import gc
+import gzip
+import hmac
 import json
 import os
+import select
+import socket
+import time
 import webbrowser
+import zlib
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone
 from threading import Timer
 from urllib.error import HTTPError
 from urllib.request import Request as URLRequest
 from urllib.request import urlopen
 
-from flask import Flask, jsonify, render_template, request, send_from_directory
+import brotli
+from flask import Flask, Response, g, jsonify, render_template, request, send_file, send_from_directory
 from flask_compress import Compress
 
+from core.admission import AdmissionControl, AdmissionRejected
+from core.encoding import encode_run
+from core.metrics import BYTES_BUCKETS, DEFAULT_METRICS_DIR, STEPS_BUCKETS, Metrics
+from core.profiling import profile_run
+from core.response_cache import (
+    WARM_BR_LEVEL,
+    WARM_GZIP_LEVEL,
+    WARM_OPTIONS,
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+)
+from core.runner import (
+    RunBudgetExceeded,
+    BuiltRun,
+    RunPool,
+    build_response,
+    build_steps,
+    collect_steps,
+    encode_body,
+    ndjson,
+    normalize_params,
+    run_limits_from_env,
+    stream_lines,
+)
+from core.run_cache import RunCache, make_run_id, parse_run_id
+from core.single_flight import SingleFlight
+from core.trace_store import TraceStore
+from core.step import Step
+from core.wire import WIRE_MEDIA_TYPE
 from problems.registry import discover_problems
 
 app = Flask(__name__)
@@ -19,6 +58,9 @@ app = Flask(__name__)
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 OPENAI_REALTIME_MODEL = "gpt-4o-realtime-preview-2024-12-17"
 
+# Enables admin-only features (profile=1 on /api/run) for requests that send it.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
 VOICE_TOOLS = [
     {
         "type": "function",
@@ -114,10 +156,48 @@ app.config["COMPRESS_REGISTER"] = False
 app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
 app.config["COMPRESS_LEVEL"] = 6
 app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_MIMETYPES"] = ["application/json", WIRE_MEDIA_TYPE]
 compress = Compress(app)
 
 _problems = discover_problems()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Paged runs (`paged: true`) are kept here and served by /api/run/<id>/steps.
+PAGE_SIZE = 256
+MAX_PAGE_STEPS = 2048
+_run_cache = RunCache(max_runs=32, max_steps=500_000)
+
+# Full /api/run responses, stored brotli'd (at a higher quality than on-the-fly
+# compression, since each body is compressed once) and gzip'd.
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESPONSE_CACHE_BR_LEVEL = 9
+_response_cache = ResponseCache(max_bytes=RESPONSE_CACHE_MAX_BYTES)
+
+# Runs pre-rendered by bake.py. Keys include the source fingerprint, so
+# artifacts from an older checkout are simply never matched.
+BAKED_DIR = os.environ.get("BAKED_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "baked"))
+
+
+def _load_baked(directory: str) -> dict[str, dict]:
+    try:
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {run["key"]: run for run in manifest.get("runs", [])}
+
+
+_baked = _load_baked(BAKED_DIR)
+
+# Every run encoded here is also written to an on-disk store shared by all
+# workers and kept across restarts (evicted by size, least recently used first).
+TRACE_STORE_DIR = os.environ.get(
+    "TRACE_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "trace_store")
+)
+TRACE_STORE_MAX_BYTES = int(os.environ.get("TRACE_STORE_MAX_BYTES", 512 * 1024 * 1024))
+_trace_store = TraceStore(TRACE_STORE_DIR, max_bytes=TRACE_STORE_MAX_BYTES)
+
 
 def _coerce_bool(value: object, default: bool = True) -> bool:
     if value is None:
@@ -131,6 +211,53 @@ def _coerce_bool(value: object, default: bool = True) -> bool:
     return default
 
 
+# Uncached runs are generated in child processes under these budgets
+# (RUN_TIMEOUT seconds, RUN_MAX_STEPS, RUN_MAX_MEMORY_MB). RUN_POOL=0 runs
+# them inline instead, enforcing only the step budget.
+RUN_LIMITS = run_limits_from_env()
+RUN_WORKERS = int(os.environ.get("RUN_WORKERS", os.cpu_count() or 1))
+_run_pool = (
+    RunPool(
+        RUN_WORKERS, RUN_LIMITS,
+        preload=["core.profiling", *sorted({cls.__module__ for cls in _problems.values()})],
+    )
+    if _coerce_bool(os.environ.get("RUN_POOL"), default=True)
+    else None
+)
+
+# Identical concurrent misses share one encode: threads wait on the in-flight
+# call, and workers serialize on a lock file and then pick up the stored run.
+# A worker stops waiting for the lock after twice the run timeout (the holder's
+# run plus its encode) and generates the run itself.
+_single_flight: SingleFlight[tuple[CachedResponse, dict[str, float]]] = SingleFlight(
+    os.path.join(TRACE_STORE_DIR, ".locks"), lock_timeout=2 * RUN_LIMITS.timeout,
+)
+
+# Prometheus metrics, summed across workers through snapshots in METRICS_DIR.
+# The directory is cleared once per server start: by gunicorn's on_starting
+# hook (gunicorn.conf.py), or in __main__ for the dev server.
+METRICS_DIR = os.environ.get("METRICS_DIR", DEFAULT_METRICS_DIR)
+_metrics = Metrics(METRICS_DIR)
+_metrics.counter("algoviz_run_requests_total", "/api/run requests by problem, source (X-Cache) and status.")
+_metrics.histogram("algoviz_run_request_seconds", "/api/run wall time by problem and source.")
+_metrics.histogram("algoviz_generate_seconds", "Time in generate_steps per uncached run.")
+_metrics.histogram("algoviz_serialize_seconds", "Time building step dicts (or binary) per uncached run.")
+_metrics.histogram("algoviz_json_encode_seconds", "Time in json.dumps per uncached JSON run.")
+_metrics.histogram("algoviz_compress_seconds", "Time compressing each uncached run, by encoding.")
+_metrics.histogram("algoviz_run_steps", "Steps per uncached run.", STEPS_BUCKETS)
+_metrics.histogram("algoviz_payload_bytes", "Encoded size per uncached run, by encoding.", BYTES_BUCKETS)
+
+# Admission control for uncached generation, per worker: ADMIT_MAX_ACTIVE
+# runs at once, ADMIT_MAX_QUEUED waiting up to ADMIT_QUEUE_TIMEOUT seconds,
+# and 429 + Retry-After beyond that. Cached responses never wait here.
+_admission = AdmissionControl(
+    max_active=int(os.environ.get("ADMIT_MAX_ACTIVE", 2)),
+    max_queued=int(os.environ.get("ADMIT_MAX_QUEUED", 8)),
+    queue_timeout=float(os.environ.get("ADMIT_QUEUE_TIMEOUT", 10)),
+    metrics=_metrics,
+)
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -160,6 +287,69 @@ def list_problems():
     return jsonify(result)
 
 
+def _stream_run(cls, params: dict, options: dict, key: str, flight) -> Iterator[bytes]:
+    """Yield a run as NDJSON: run metadata, step chunks, then a final status line.
+
+    Streams run in the RunPool under the same budgets as full runs, with the
+    child piping back each encoded line; without a pool they run inline and
+    the time budget is checked between steps. After the last step the child
+    also encodes the full body, which is cached and stored under ``key`` like
+    any miss and handed to requests coalesced on ``flight``.
+    """
+    args = (
+        cls.__module__, cls.__qualname__, params, options,
+        RESPONSE_CACHE_BR_LEVEL, app.config["COMPRESS_LEVEL"],
+    )
+    if _run_pool is None:
+        lines = stream_lines(*args, max_steps=RUN_LIMITS.max_steps, timeout=RUN_LIMITS.timeout)
+    else:
+        lines = _run_pool.stream(stream_lines, *args)
+    done = False
+    try:
+        while True:
+            try:
+                line = next(lines)
+            except StopIteration as stop:
+                built = stop.value
+                break
+            if isinstance(line, int):
+                done = True
+                yield ndjson({"done": True, "step_count": line})
+            else:
+                yield line
+    except Exception as exc:
+        _single_flight.finish(key, flight, error=exc)
+        if isinstance(exc, RunBudgetExceeded):
+            error = exc.to_dict()
+        else:
+            app.logger.exception("Streamed run of %s failed", cls.name())
+            error = {"error": str(exc)}
+        # The 200 status is already on the wire, so report the failure in-band
+        # (unless the client already has every step).
+        if not done:
+            yield ndjson(error)
+        return
+    finally:
+        lines.close()
+    _record_build(cls.name(), built)
+    _trace_store.put(key, built.entry)
+    _single_flight.finish(key, flight, result=(_response_cache.put(key, built.entry), built.timings))
+
+
+def _flush_compressed(chunks: Iterator[bytes], algorithm: str) -> Iterator[bytes]:
+    """Compress a stream, flushing after every chunk so each is decodable on arrival."""
+    if algorithm == "br":
+        compressor = brotli.Compressor(quality=app.config["COMPRESS_BR_LEVEL"])
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(app.config["COMPRESS_LEVEL"], zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
 @app.route("/api/run", methods=["POST"])
 @compress.compressed()
 def run_problem():
@@ -167,33 +357,357 @@ def run_problem():
     problem_name = data.get("problem")
     params = data.get("params", {})
     compact = _coerce_bool(data.get("compact"), default=True)
+    delta = _coerce_bool(data.get("delta"), default=False)
+    header = _coerce_bool(data.get("header"), default=False)
+    board_format = data.get("board_format", "cells")
+    log_timeline = _coerce_bool(data.get("log_timeline"), default=False)
+    stream = _coerce_bool(data.get("stream"), default=False)
+    paged = _coerce_bool(data.get("paged"), default=False)
+    profile = _coerce_bool(data.get("profile", request.args.get("profile")), default=False)
 
     if not isinstance(params, dict):
         return jsonify({"error": "'params' must be an object"}), 400
+    if board_format not in ("cells", "columnar"):
+        return jsonify({"error": "'board_format' must be 'cells' or 'columnar'"}), 400
 
     cls = _problems.get(problem_name)
     if cls is None:
         return jsonify({"error": f"Unknown problem: {problem_name}"}), 404
-
-    # Convert param values to appropriate types
-    clean_params = {}
-    for k, v in params.items():
+    # Only the UI-configurable params. Raw inputs (edges, grids, ...) are for
+    # benchmarks.scaling, which generates valid ones; unchecked node ids from a
+    # client would index out of range.
+    unknown = sorted(set(params) - set(cls.default_params()))
+    if unknown:
+        return jsonify({"error": f"Unknown params for {problem_name}: {', '.join(unknown)}"}), 400
+    g.problem = problem_name
+
+    clean_params = normalize_params(params)
+    options = {
+        "compact": compact,
+        "delta": delta,
+        "header": header,
+        "board_format": board_format,
+        "log_timeline": log_timeline,
+    }
+    binary = request.accept_mimetypes.best_match(["application/json", WIRE_MEDIA_TYPE]) == WIRE_MEDIA_TYPE
+
+    if profile:
+        if not _is_admin():
+            return jsonify({"error": "Profiling requires a valid admin token"}), 403
+        return jsonify({"profile": _profile_run(cls, clean_params, options, binary)})
+
+    if paged:
+        run_id = make_run_id({
+            "problem": problem_name, "params": clean_params, "compact": compact, "delta": delta,
+        })
+        steps = _run_cache.get(run_id)
+        if steps is None:
+            steps = _generate_steps(cls, clean_params)
+            _run_cache.put(run_id, steps)
+        return jsonify({
+            "run_id": run_id,
+            "step_count": len(steps),
+            "page_size": PAGE_SIZE,
+            "source_code": cls.source_code(),
+            "renderer_type": cls.renderer_type(),
+        })
+
+    key = cache_key(cls, {
+        "problem": problem_name,
+        "params": clean_params,
+        "binary": binary,
+        **({} if binary else options),
+    })
+    entry = _response_cache.get(key)
+    if entry is not None:
+        # Also answers streamed requests: a cached full body beats a stream.
+        return _cached_response(entry, "hit")
+    baked = _baked.get(key)
+    if baked is not None:
+        return _file_response(
+            baked["etag"], baked["mimetype"], "baked",
+            {enc: os.path.join(BAKED_DIR, f"{key}.json{suffix}")
+             for enc, suffix in (("br", ".br"), ("gzip", ".gz"), (None, ""))},
+        )
+    stored = _trace_store.get(key)
+    if stored is not None:
+        try:
+            return _file_response(
+                stored.etag, stored.mimetype, "store",
+                {"br": stored.path("br"), "gzip": stored.path("gzip")},
+            )
+        except FileNotFoundError:
+            pass  # Evicted by another worker in the meantime.
+
+    # A stream leads the single-flight call for its key, so identical requests
+    # arriving meanwhile wait for its full body instead of streaming again.
+    flight = _single_flight.lead(key) if stream and not binary else None
+    if flight is not None:
         try:
-            clean_params[k] = int(v)
-        except (ValueError, TypeError):
-            clean_params[k] = v
+            _admission.acquire()
+        except AdmissionRejected as exc:
+            _single_flight.finish(key, flight, error=exc)
+            raise
+        started = time.monotonic()
+        chunks = _stream_run(cls, clean_params, options, key, flight)
+        algorithm = request.accept_encodings.best_match(["br", "gzip"])
+        response = Response(
+            _flush_compressed(chunks, algorithm) if algorithm else chunks,
+            mimetype=NDJSON_MEDIA_TYPE,
+        )
 
-    steps = cls.generate_steps(**clean_params)
+        @response.call_on_close
+        def finish_stream() -> None:
+            # Runs however the stream ended, even if it never started; a
+            # stream cut short hands the run to a waiting request.
+            _admission.release(time.monotonic() - started)
+            _single_flight.finish(key, flight, error=RunBudgetExceeded("cancelled", None, 0))
+
+        if algorithm:
+            response.headers["Content-Encoding"] = algorithm
+        # Keep proxies from buffering the stream.
+        response.headers["X-Accel-Buffering"] = "no"
+        response.vary.add("Accept")
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def build() -> tuple[CachedResponse, dict[str, float]]:
+        # Admission first: the cross-process lock can block for up to
+        # lock_timeout, so only threads already holding a slot may wait on it.
+        with _admission.slot() as queued:
+            g.timings["queue"] = queued
+            with _single_flight.file_lock(key) as waited:
+                # Another worker may have finished this run while we waited.
+                entry = _trace_store.load(key) if waited else None
+                if entry is not None:
+                    return _response_cache.put(key, entry), {}
+                # Coalesced callers still want the run, so only give up once
+                # this client is gone and nobody else is waiting on it.
+                built = _generate_response(
+                    cls, clean_params, options, binary,
+                    cancelled=lambda: _client_gone() and not _single_flight.waiters(key),
+                )
+                _record_build(problem_name, built)
+                _trace_store.put(key, built.entry)
+        return _response_cache.put(key, built.entry), built.timings
+
+    (entry, timings), shared = _single_flight.do(key, build, retry=_was_cancelled)
+    if not shared:
+        g.timings.update(timings)
+    return _cached_response(entry, "coalesced" if shared else "miss")
+
+
+def encode_run_body(cls, params: dict, options: dict, binary: bool) -> tuple[bytes, str]:
+    """Generate and encode a full run inline, without budgets; returns (body, mimetype)."""
+    return encode_body(cls, collect_steps(cls, params), options, binary)
+
+
+def _client_gone() -> bool:
+    """True once the client has closed its connection (gunicorn or werkzeug servers)."""
+    sock = request.environ.get("gunicorn.socket") or request.environ.get("werkzeug.socket")
+    if sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        # The request body has been read, so a readable socket at EOF means a hang-up.
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b""
+    except (OSError, ValueError):
+        return True
 
-    return jsonify(
-        {
-            "source_code": cls.source_code(),
-            "renderer_type": cls.renderer_type(),
-            "steps": [s.to_dict(compact=compact) for s in steps],
-        }
+
+def _was_cancelled(exc: BaseException) -> bool:
+    return isinstance(exc, RunBudgetExceeded) and exc.reason == "cancelled"
+
+
+def _generate_response(
+    cls, params: dict, options: dict, binary: bool, cancelled: Callable[[], bool] = _client_gone,
+) -> BuiltRun:
+    """Generate, encode and compress a run under RUN_LIMITS; stops early once ``cancelled()``.
+
+    The caller must hold an admission slot.
+    """
+    levels = (RESPONSE_CACHE_BR_LEVEL, app.config["COMPRESS_LEVEL"])
+    if _run_pool is None:
+        return build_response(
+            cls.__module__, cls.__qualname__, params, options, binary, *levels,
+            max_steps=RUN_LIMITS.max_steps,
+        )
+    return _run_pool.run(
+        build_response, cls.__module__, cls.__qualname__, params, options, binary, *levels,
+        cancelled=cancelled,
     )
 
 
+def _generate_steps(cls, params: dict) -> list[Step]:
+    """Generate a run's steps under RUN_LIMITS."""
+    with _admission.slot():
+        if _run_pool is None:
+            return collect_steps(cls, params, RUN_LIMITS.max_steps)
+        return _run_pool.run(build_steps, cls.__module__, cls.__qualname__, params, cancelled=_client_gone)
+
+
+def _is_admin() -> bool:
+    """True if the request carries ADMIN_TOKEN (X-Admin-Token or a Bearer token)."""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get("X-Admin-Token", "")
+    auth = request.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        token = auth[len("Bearer "):]
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def _profile_run(cls, params: dict, options: dict, binary: bool) -> dict:
+    """Profile a run (bypassing every cache) under RUN_LIMITS; see core/profiling.py."""
+    with _admission.slot():
+        if _run_pool is None:
+            return profile_run(
+                cls.__module__, cls.__qualname__, params, options, binary, max_steps=RUN_LIMITS.max_steps,
+            )
+        return _run_pool.run(
+            profile_run, cls.__module__, cls.__qualname__, params, options, binary, cancelled=_client_gone,
+        )
+
+
+def _record_build(problem: str, built: BuiltRun) -> None:
+    labels = {"problem": problem}
+    timings = built.timings
+    _metrics.observe("algoviz_generate_seconds", labels, timings["generate"])
+    _metrics.observe("algoviz_serialize_seconds", labels, timings["serialize"])
+    if "json" in timings:
+        _metrics.observe("algoviz_json_encode_seconds", labels, timings["json"])
+    _metrics.observe("algoviz_run_steps", labels, built.step_count)
+    _metrics.observe("algoviz_payload_bytes", {**labels, "encoding": "identity"}, built.raw_bytes)
+    for encoding in ("br", "gzip"):
+        _metrics.observe("algoviz_compress_seconds", {**labels, "encoding": encoding}, timings[encoding])
+        _metrics.observe("algoviz_payload_bytes", {**labels, "encoding": encoding}, len(getattr(built.entry, encoding)))
+
+
+@app.before_request
+def start_timing():
+    g.started = time.perf_counter()
+    g.timings = {}
+
+
+@app.after_request
+def record_timing(response: Response) -> Response:
+    """Add Server-Timing (phases in ms, plus total) and count /api/run requests."""
+    elapsed = time.perf_counter() - g.started
+    timings = {**g.timings, "total": elapsed}
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+    )
+    problem = g.get("problem")
+    if problem is not None and request.endpoint == "run_problem":
+        source = response.headers.get("X-Cache", "stream" if response.mimetype == NDJSON_MEDIA_TYPE else "none")
+        _metrics.inc("algoviz_run_requests_total", {
+            "problem": problem, "source": source, "status": str(response.status_code),
+        })
+        _metrics.observe("algoviz_run_request_seconds", {"problem": problem, "source": source}, elapsed)
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    return Response(_metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.errorhandler(RunBudgetExceeded)
+def run_budget_exceeded(exc: RunBudgetExceeded):
+    return jsonify(exc.to_dict()), 422
+
+
+@app.errorhandler(AdmissionRejected)
+def admission_rejected(exc: AdmissionRejected):
+    response = jsonify({"error": str(exc), "retry_after": exc.retry_after})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(exc.retry_after)
+    return response
+
+
+def _cached_response(entry: CachedResponse, source: str) -> Response:
+    """Serve a cached run in the client's preferred encoding, honouring If-None-Match."""
+    algorithm = request.accept_encodings.best_match(["br", "gzip"])
+    etag = f"{entry.etag}-{algorithm}" if algorithm else entry.etag
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(entry.body(algorithm), mimetype=entry.mimetype)
+        if algorithm:
+            response.headers["Content-Encoding"] = algorithm
+    response.set_etag(etag)
+    response.headers["X-Cache"] = source
+    response.vary.add("Accept")
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _file_response(etag: str, mimetype: str, source: str, paths: dict) -> Response:
+    """Serve a run from disk like ``_cached_response``.
+
+    ``paths`` maps ``"br"``/``"gzip"`` (and optionally ``None`` for identity)
+    to files, which are handed to ``send_file`` so the server can use sendfile.
+    Without an identity file, the gzip body is decompressed.
+    """
+    algorithm = request.accept_encodings.best_match(["br", "gzip"])
+    etag = f"{etag}-{algorithm}" if algorithm else etag
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    elif algorithm is None and None not in paths:
+        with open(paths["gzip"], "rb") as f:
+            response = Response(gzip.decompress(f.read()), mimetype=mimetype)
+    else:
+        response = send_file(paths[algorithm], mimetype=mimetype, etag=False, conditional=False)
+        if algorithm:
+            response.headers["Content-Encoding"] = algorithm
+    response.set_etag(etag)
+    response.headers["X-Cache"] = source
+    response.vary.add("Accept")
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@app.route("/api/run/<run_id>/steps")
+@compress.compressed()
+def run_steps(run_id: str):
+    """Return steps [from, to) of a paged run as a self-contained page."""
+    spec = parse_run_id(run_id)
+    cls = _problems.get(spec.get("problem")) if spec else None
+    if cls is None or not isinstance(spec.get("params"), dict):
+        return jsonify({"error": "Unknown run"}), 404
+    try:
+        start = int(request.args.get("from", 0))
+        stop = int(request.args.get("to", start + PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "'from' and 'to' must be integers"}), 400
+
+    steps = _run_cache.get(run_id)
+    if steps is None:
+        # Evicted, or created by another worker: rebuild it from the id.
+        steps = _generate_steps(cls, spec["params"])
+        _run_cache.put(run_id, steps)
+
+    start = max(0, min(start, len(steps)))
+    stop = max(start, min(stop, len(steps), start + MAX_PAGE_STEPS))
+    page = encode_run(
+        steps[start:stop],
+        compact=_coerce_bool(spec.get("compact"), default=True),
+        delta=_coerce_bool(spec.get("delta"), default=False),
+    )
+    return jsonify({**page, "from": start, "to": stop, "step_count": len(steps)})
+
+
+@app.route("/api/stats")
+def stats():
+    """Cache, request-coalescing and admission counters for this worker."""
+    return jsonify({
+        "response_cache_entries": len(_response_cache),
+        "baked_runs": len(_baked),
+        "single_flight": _single_flight.stats(),
+        "admission": _admission.stats(),
+    })
+
+
 def _build_voice_prompt(cls, steps):
     """Build the system prompt for the voice tutor agent."""
     step_lines = []
@@ -298,6 +812,32 @@ def log_session():
     return jsonify({"ok": True})
 
 
+def warm_response_cache() -> int:
+    """Encode every problem's default run up front and pin it in the response cache.
+
+    Bodies are compressed at maximum brotli/gzip levels since this runs once.
+    Under ``gunicorn --preload`` it runs in the master before forking, so
+    workers share the pinned bodies copy-on-write; ``gc.freeze()`` keeps the
+    collector from touching (and so copying) those pages afterwards.
+    """
+    started = time.perf_counter()
+    count = 0
+    with app.app_context():
+        for name, cls in sorted(_problems.items()):
+            params = normalize_params(cls.default_params())
+            for options in WARM_OPTIONS:
+                key = cache_key(cls, {"problem": name, "params": params, "binary": False, **options})
+                body, mimetype = encode_run_body(cls, params, options, binary=False)
+                _response_cache.pin(key, CachedResponse.build(body, mimetype, WARM_BR_LEVEL, WARM_GZIP_LEVEL))
+                count += 1
+    gc.freeze()
+    print(f"Warmed {count} responses in {time.perf_counter() - started:.1f}s", flush=True)
+    return count
+
+
+if _coerce_bool(os.environ.get("WARM_CACHE"), default=False):
+    warm_response_cache()
+
 PORT = 5050
 
 
@@ -306,5 +846,6 @@ def open_browser():
 
 
 if __name__ == "__main__":
+    _metrics.reset()
     Timer(1.0, open_browser).start()
     app.run(debug=False, port=PORT, host="0.0.0.0")
@@ -0,0 +1,72 @@
+"""Random problem inputs of a given size, for Problem.scaling_inputs().
+
+Everything is seeded, so a sweep measures the same inputs on every run.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Side lengths of the n x n grids, and node counts of the graphs, swept by
+# default (graphs get 2 edges per node).
+GRID_SIZES = (4, 8, 16, 32, 64)
+GRAPH_SIZES = (8, 16, 32, 64, 128, 256)
+
+
+def pick(value: object, presets: dict[int, T]) -> T:
+    """The input itself if ``value`` is a list, else preset ``value`` (or 1)."""
+    if isinstance(value, list):
+        return value  # type: ignore[return-value]
+    return presets.get(int(value), presets[1])  # type: ignore[arg-type]
+
+
+def random_grid(
+    n: int, values: Sequence[Any], weights: Sequence[float] | None = None, seed: int = 0,
+) -> list[list[Any]]:
+    """An n x n grid of ``values`` drawn independently (optionally weighted)."""
+    rng = random.Random(seed)
+    return [rng.choices(values, weights, k=n) for _ in range(n)]
+
+
+def random_graph(
+    n: int, m: int, seed: int = 0, directed: bool = False, acyclic: bool = False,
+    connected: bool = True, weights: tuple[int, int] | None = None,
+) -> list[tuple[int, ...]]:
+    """``m`` distinct edges on nodes ``0..n-1``, no self-loops.
+
+    If ``connected``, the first ``n - 1`` edges form a random spanning tree
+    with every edge pointing from the lower node to the higher, so node 0
+    reaches every node; the rest are random. ``acyclic`` keeps all edges
+    low-to-high (a DAG). With ``weights=(lo, hi)`` each edge gets a random
+    integer weight as a third element. ``m`` is capped at the number of
+    possible edges.
+    """
+    rng = random.Random(seed)
+    limit = n * (n - 1) // (1 if directed and not acyclic else 2)
+    m = min(m, limit)
+    seen: set[tuple[int, int]] = set()
+    edges: list[tuple[int, int]] = []
+
+    def add(u: int, v: int) -> None:
+        key = (u, v) if directed else (min(u, v), max(u, v))
+        if key not in seen:
+            seen.add(key)
+            edges.append((u, v))
+
+    if connected:
+        for v in range(1, n):
+            add(rng.randrange(v), v)
+    while len(edges) < m:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u == v:
+            continue
+        if acyclic and u > v:
+            u, v = v, u
+        add(u, v)
+    if weights is None:
+        return list(edges)
+    return [(u, v, rng.randint(*weights)) for u, v in edges]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -88,6 +89,11 @@ class ArticulationPoints(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # Sparse, so there are cut vertices to find.
+        return [(v, {"n": v, "edges": random_graph(v, v + v // 4, seed=v)}) for v in GRAPH_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find all articulation points (cut vertices) in an undirected graph using Tarjan's DFS algorithm. Track discovery time and low-link values. A node u is an articulation point if: (1) u is the root of DFS and has 2+ children, or (2) u is not root and has a child v where low[v] >= disc[u].
@@ -128,6 +134,8 @@ Interview Tip: Remember the two separate cases — root nodes need 2+ DFS childr
         }
 
         n, edge_list = presets.get(preset, presets[1])
+        if "edges" in kwargs:
+            n, edge_list = int(kwargs["n"]), kwargs["edges"]
         adj: list[list[int]] = [[] for _ in range(n)]
         for u, v in edge_list:
             adj[u].append(v)
@@ -142,6 +150,8 @@ Interview Tip: Remember the two separate cases — root nodes need 2+ DFS childr
         # Add edges
         for u, v in edge_list:
             graph.add_edge(u, v)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            graph.set_force_layout()
 
         edge_str = ", ".join(f"{u}-{v}" for u, v in edge_list)
         graph.log(f"Undirected graph: {n} nodes, edges: {edge_str}")
@@ -166,17 +176,16 @@ Interview Tip: Remember the two separate cases — root nodes need 2+ DFS childr
 
             for v in adj[u]:
                 # Find edge key
-                edge_key = (u, v) if (u, v) in graph._edge_selected else (v, u)
 
                 if disc[v] == -1:
                     children += 1
                     par[v] = u
 
-                    graph.select_edge(*edge_key)
-                    graph.set_edge_class(*edge_key, "tree")
+                    graph.select_edge(u, v)
+                    graph.set_edge_class(u, v, "tree")
                     graph.log(f"  Tree edge {u}-{v}, child #{children}")
                     snap(24, f"Tree edge {u}-{v}")
-                    graph.deselect_edge(*edge_key)
+                    graph.deselect_edge(u, v)
 
                     dfs(v)
 
@@ -203,13 +212,13 @@ Interview Tip: Remember the two separate cases — root nodes need 2+ DFS childr
                 else:
                     # Back edge (skip parent to avoid counting the tree edge)
                     if v != par[u]:
-                        graph.select_edge(*edge_key)
-                        graph.set_edge_class(*edge_key, "back")
+                        graph.select_edge(u, v)
+                        graph.set_edge_class(u, v, "back")
                         low[u] = min(low[u], disc[v])
                         graph.set_node_badge(u, f"{disc[u]}/{low[u]}")
                         graph.log(f"  Back edge {u}-{v}: low[{u}] = min(low[{u}], disc[{v}]) = {low[u]}")
                         snap(32, f"Back edge {u}-{v}, low[{u}]={low[u]}")
-                        graph.deselect_edge(*edge_key)
+                        graph.deselect_edge(u, v)
 
             # Done with u
             if u not in ap:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
 from core.step import Step
 
@@ -53,11 +54,29 @@ class Problem(ABC):
         """Run the algorithm and return all visualization steps."""
         ...
 
+    @classmethod
+    def iter_steps(cls, **kwargs: object) -> Iterator[Step]:
+        """Yield visualization steps as they are produced.
+
+        Defaults to iterating generate_steps(). Problems with long runs
+        override this with a generator so streamed runs can start early.
+        """
+        yield from cls.generate_steps(**kwargs)
+
     @staticmethod
     def default_params() -> dict[str, object]:
         """Default parameters. Override to add UI-configurable params."""
         return {}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        """(input size, params) pairs of increasing size for benchmarks.scaling.
+
+        Override for problems whose input size users can change; the default
+        (fixed preset inputs only) is not swept.
+        """
+        return []
+
     @staticmethod
     def long_description() -> str:
         """Full problem statement shown in the detail panel. Override per problem."""
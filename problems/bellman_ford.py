@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -65,6 +66,13 @@ class BellmanFord(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [
+            (v, {"n": v, "edges": random_graph(v, 2 * v, seed=v, directed=True, weights=(1, 20))})
+            for v in GRAPH_SIZES
+        ]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Bellman-Ford finds shortest paths from a source vertex to all other vertices, even with negative edge weights. It repeatedly relaxes all edges V-1 times. After V-1 iterations, if any edge can still be relaxed, a negative-weight cycle exists.
@@ -91,8 +99,8 @@ Interview Tip: The extra V-th iteration is the classic way to detect negative cy
             ],
         }
 
-        edge_list = presets.get(preset, presets[1])
-        n = 8
+        edge_list = kwargs.get("edges") or presets.get(preset, presets[1])
+        n = int(kwargs.get("n", 8))
         src = 0
 
         tracer = GraphTracer(list(range(n)), directed=True)
@@ -104,6 +112,8 @@ Interview Tip: The extra V-th iteration is the classic way to detect negative cy
         # Add edges to tracer
         for u, v, w in edge_list:
             tracer.add_edge(u, v, weight=w)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         tracer.log(f"Bellman-Ford from source {src}, {n} nodes, {len(edge_list)} edges")
         snap(1, f"Bellman-Ford from source {src}")
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -69,6 +70,13 @@ class CheapestFlights(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [
+            (v, {"n": v, "flights": random_graph(v, 2 * v, seed=v, directed=True, weights=(50, 500))})
+            for v in GRAPH_SIZES
+        ]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find the cheapest flight path with at most K stops. This is a modified Bellman-Ford / BFS problem. Run at most K+1 relaxation rounds (since K stops means K+1 edges). Each round, relax all edges using the distances from the previous round to avoid using too many edges.
@@ -100,6 +108,9 @@ Interview Tip: Three approaches work: modified Bellman-Ford (simplest), BFS with
         }
 
         n, flights, src, dst, k = presets.get(preset, presets[1])
+        if "flights" in kwargs:
+            n, flights = int(kwargs["n"]), kwargs["flights"]
+            src, dst, k = int(kwargs.get("src", 0)), int(kwargs.get("dst", n - 1)), int(kwargs.get("k", 2))
 
         INF = float("inf")
         prices = [INF] * n
@@ -119,6 +130,8 @@ Interview Tip: Three approaches work: modified Bellman-Ford (simplest), BFS with
         # Add all edges with weights
         for u, v, w in flights:
             tracer.add_edge(u, v, weight=w)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         # Initial state: badge src with cost 0
         tracer.set_node_badge(src, "0", "#a6e3a1")
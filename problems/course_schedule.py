@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -71,6 +72,15 @@ class CourseSchedule(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for v in GRAPH_SIZES:
+            # A DAG, so every course can be taken; edge a -> b is prerequisite [b, a].
+            edges = random_graph(v, 2 * v, seed=v, directed=True, acyclic=True)
+            inputs.append((v, {"num_courses": v, "prerequisites": [[b, a] for a, b in edges]}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: Detect if a cycle exists in a directed graph (course prerequisite graph). If there's a cycle, not all courses can be completed. Use DFS with three states: unvisited, in-progress, and completed. A back edge (visiting an in-progress node) indicates a cycle.
@@ -98,6 +108,8 @@ Interview Tip: This is the foundation for topological sort problems. Kahn's algo
         }
 
         num_courses, prerequisites = presets.get(preset, presets[1])
+        if "prerequisites" in kwargs:
+            num_courses, prerequisites = int(kwargs["num_courses"]), kwargs["prerequisites"]
 
         adj: list[list[int]] = [[] for _ in range(num_courses)]
         for a, b in prerequisites:
@@ -111,6 +123,8 @@ Interview Tip: This is the foundation for topological sort problems. Kahn's algo
 
         for a, b in prerequisites:
             tracer.add_edge(b, a)
+        if num_courses > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         edges_str = ", ".join(f"{b}->{a}" for a, b in prerequisites)
         tracer.log(f"Courses: {num_courses}, Edges: {edges_str}")
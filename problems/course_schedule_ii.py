@@ -4,6 +4,7 @@ from collections import deque
 
 from core.step import Step
 from core.tracer import GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -75,6 +76,15 @@ class CourseScheduleII(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for v in GRAPH_SIZES:
+            # A DAG, so every course can be taken; edge a -> b is prerequisite [b, a].
+            edges = random_graph(v, 2 * v, seed=v, directed=True, acyclic=True)
+            inputs.append((v, {"num_courses": v, "prerequisites": [[b, a] for a, b in edges]}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find a valid order to take all courses (topological sort). Use Kahn's algorithm: start with all courses having in-degree 0, process them, reduce neighbors' in-degrees, and add new zero-in-degree courses to the queue. The processing order is a valid topological sort.
@@ -102,6 +112,8 @@ Interview Tip: Both DFS (reverse post-order) and BFS (Kahn's) produce topologica
         }
 
         num_courses, prerequisites = presets.get(preset, presets[1])
+        if "prerequisites" in kwargs:
+            num_courses, prerequisites = int(kwargs["num_courses"]), kwargs["prerequisites"]
 
         adj: list[list[int]] = [[] for _ in range(num_courses)]
         in_degree = [0] * num_courses
@@ -117,6 +129,7 @@ Interview Tip: Both DFS (reverse post-order) and BFS (Kahn's) produce topologica
 
         for a, b in prerequisites:
             tracer.add_edge(b, a)
+        tracer.set_layered_layout()
 
         # Show in-degrees as labels
         for i in range(num_courses):
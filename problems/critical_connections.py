@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -84,6 +85,11 @@ class CriticalConnections(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # Sparse, so there are bridges to find.
+        return [(v, {"n": v, "connections": random_graph(v, v + v // 4, seed=v)}) for v in GRAPH_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find all bridges (critical connections) in an undirected graph using Tarjan's bridge-finding algorithm. Perform DFS and track discovery time and low-link values. An edge (u, v) is a bridge if low[v] > disc[u] — meaning v cannot reach u or any ancestor of u without using edge (u, v).
@@ -121,6 +127,8 @@ Interview Tip: Don't confuse with articulation points (nodes). For bridges, the
         }
 
         n, connections = presets.get(preset, presets[1])
+        if "connections" in kwargs:
+            n, connections = int(kwargs["n"]), kwargs["connections"]
         adj: list[list[int]] = [[] for _ in range(n)]
         for u, v in connections:
             adj[u].append(v)
@@ -135,6 +143,8 @@ Interview Tip: Don't confuse with articulation points (nodes). For bridges, the
         # Add edges (undirected: add once, GraphTracer handles display)
         for u, v in connections:
             graph.add_edge(u, v)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            graph.set_force_layout()
 
         conn_str = ", ".join(f"{u}-{v}" for u, v in connections)
         graph.log(f"Undirected graph: {n} nodes, connections: {conn_str}")
@@ -160,15 +170,14 @@ Interview Tip: Don't confuse with articulation points (nodes). For bridges, the
                     continue
 
                 # Find edge key (undirected: stored as (min, max) or original order)
-                edge_key = (u, v) if (u, v) in graph._edge_selected else (v, u)
-                graph.select_edge(*edge_key)
+                graph.select_edge(u, v)
 
                 if disc[v] == -1:
                     # Tree edge
-                    graph.set_edge_class(*edge_key, "tree")
+                    graph.set_edge_class(u, v, "tree")
                     graph.log(f"  Edge {u}-{v}: tree edge, recurse")
                     snap(22, f"Tree edge {u}-{v}")
-                    graph.deselect_edge(*edge_key)
+                    graph.deselect_edge(u, v)
 
                     dfs(v, u)
 
@@ -181,22 +190,22 @@ Interview Tip: Don't confuse with articulation points (nodes). For bridges, the
                     # Check if bridge
                     if low[v] > disc[u]:
                         bridges.append((u, v))
-                        graph.mark_edge_error(*edge_key)
+                        graph.mark_edge_error(u, v)
                         graph.log(f"  BRIDGE found: {u}-{v} (low[{v}]={low[v]} > disc[{u}]={disc[u]})")
                         snap(25, f"BRIDGE: {u}-{v}")
                     else:
                         # Not a bridge: patch as safe
-                        graph.patch_edge(*edge_key)
+                        graph.patch_edge(u, v)
                         graph.log(f"  Edge {u}-{v}: not a bridge (low[{v}]={low[v]} <= disc[{u}]={disc[u]})")
                         snap(25, f"Safe edge {u}-{v}")
                 else:
                     # Back edge
-                    graph.set_edge_class(*edge_key, "back")
+                    graph.set_edge_class(u, v, "back")
                     low[u] = min(low[u], disc[v])
                     graph.set_node_badge(u, f"{disc[u]}/{low[u]}")
                     graph.log(f"  Edge {u}-{v}: back edge, low[{u}] = min(low[{u}], disc[{v}]) = {low[u]}")
                     snap(28, f"Back edge {u}-{v}, low[{u}]={low[u]}")
-                    graph.deselect_edge(*edge_key)
+                    graph.deselect_edge(u, v)
 
             # Done with u
             graph.deselect_node(u)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -69,6 +70,10 @@ class Dijkstra(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(v, {"n": v, "edges": random_graph(v, 2 * v, seed=v, weights=(1, 20))}) for v in GRAPH_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Dijkstra's algorithm finds the shortest path from a source node to all other nodes in a weighted graph with non-negative edge weights. It uses a min-heap (priority queue) to always process the closest unvisited node first, then relaxes all its outgoing edges.
@@ -96,8 +101,8 @@ Interview Tip: If the interviewer mentions negative weights, Dijkstra's won't wo
             ],
         }
 
-        edge_list = presets.get(preset, presets[1])
-        n = 8
+        edge_list = kwargs.get("edges") or presets.get(preset, presets[1])
+        n = int(kwargs.get("n", 8))
         src = 0
 
         # Build adjacency list
@@ -115,6 +120,8 @@ Interview Tip: If the interviewer mentions negative weights, Dijkstra's won't wo
         # Add edges to tracer
         for u, v, w in edge_list:
             tracer.add_edge(u, v, weight=w)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         tracer.log(f"Dijkstra from source node {src}")
         snap(1, f"Dijkstra from source {src}")
@@ -154,8 +161,7 @@ Interview Tip: If the interviewer mentions negative weights, Dijkstra's won't wo
 
             # Relax edges
             for v, w in graph[u]:
-                edge_key = (u, v) if (u, v) in tracer._edge_selected else (v, u)
-                tracer.select_edge(*edge_key)
+                tracer.select_edge(u, v)
                 tracer.log(f"  Examine edge {u}-{v} (w={w})")
                 snap(14, f"Examine edge {u}-{v}, w={w}")
 
@@ -165,8 +171,8 @@ Interview Tip: If the interviewer mentions negative weights, Dijkstra's won't wo
                     dist[v] = new_dist
                     heapq.heappush(pq, (dist[v], v))
                     tracer.set_node_badge(v, str(dist[v]))
-                    tracer.set_edge_class(*edge_key, "relaxed")
-                    tracer.patch_edge(*edge_key)
+                    tracer.set_edge_class(u, v, "relaxed")
+                    tracer.patch_edge(u, v)
                     old_str = "INF" if old_dist == float("inf") else str(int(old_dist))
                     tracer.log(f"  Relax {v}: {old_str} -> {int(new_dist)}")
                     snap(16, f"Relax {v}: {old_str} -> {int(new_dist)}")
@@ -174,7 +180,7 @@ Interview Tip: If the interviewer mentions negative weights, Dijkstra's won't wo
                     tracer.log(f"  No improvement for {v}")
                     snap(15, f"No relax {u}-{v}")
 
-                tracer.deselect_edge(*edge_key)
+                tracer.deselect_edge(u, v)
 
         # Final result
         tracer.deselect_all_nodes()
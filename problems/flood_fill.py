@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -71,6 +72,11 @@ class FloodFill(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # Worst case: a single colour, so the fill from (0, 0) reaches every pixel.
+        return [(n, {"grid": [[1] * n for _ in range(n)]}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Starting from a given pixel, change its color and all connected pixels of the same original color to the new color using DFS or BFS. Connected means 4-directionally adjacent (up, down, left, right).
@@ -85,8 +91,6 @@ Interview Tip: Handle the edge case where newColor equals the original color to
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
-
         grids = {
             1: [
                 [1, 1, 1, 0, 0, 1, 1],
@@ -99,7 +103,7 @@ Interview Tip: Handle the edge case where newColor equals the original color to
             ],
         }
 
-        image = [row[:] for row in grids.get(grid_id, grids[1])]
+        image = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         sr, sc, new_color = 0, 0, 2
         orig = image[sr][sc]
         m, n = len(image), len(image[0])
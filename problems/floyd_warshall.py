@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -68,6 +71,14 @@ class FloydWarshall(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # O(V^3) steps, so smaller graphs than the default sweep.
+        return [
+            (v, {"n": v, "edges": random_graph(v, 2 * v, seed=v, directed=True, weights=(1, 20))})
+            for v in (4, 8, 16, 32)
+        ]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Floyd-Warshall computes shortest paths between all pairs of vertices. It considers each vertex k as a potential intermediate node and checks if the path through k improves the current shortest path between every pair (i, j).
@@ -82,6 +93,10 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
+        return list(FloydWarshall.iter_steps(**kwargs))
+
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         preset = int(kwargs.get("preset", 1))
 
         presets = {
@@ -96,6 +111,8 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
         }
 
         n, edges = presets.get(preset, presets[1])
+        if "edges" in kwargs:
+            n, edges = int(kwargs["n"]), kwargs["edges"]
 
         INF = float("inf")
         dist = [[INF] * n for _ in range(n)]
@@ -105,14 +122,15 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
             dist[u][v] = w
 
         tracer = GraphTracer(list(range(n)), directed=True)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         # Add all edges with weights
         for u, v, w in edges:
             tracer.add_edge(u, v, weight=w)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         def fmt(d: float) -> str:
             if d == INF:
@@ -121,7 +139,7 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
 
         edges_str = ", ".join(f"{u}->{v}({w})" for u, v, w in edges)
         tracer.log(f"Nodes: {n}, Edges: {edges_str}")
-        snap(7, f"{n} nodes, {len(edges)} edges initialized")
+        yield snap(7, f"{n} nodes, {len(edges)} edges initialized")
 
         # Floyd-Warshall main loop
         for k in range(n):
@@ -131,7 +149,7 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
             tracer.select_node(k)
             tracer.set_node_color(k, "#f9e2af")  # yellow highlight
             tracer.log(f"Intermediate k={k}")
-            snap(10, f"Intermediate node k={k}")
+            yield snap(10, f"Intermediate node k={k}")
 
             for i in range(n):
                 for j in range(n):
@@ -150,10 +168,10 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
                         tracer.select_node(j)
 
                         # Highlight the edges through k if they exist
-                        if (i, k) in tracer._edge_selected:
+                        if tracer.has_edge(i, k):
                             tracer.select_edge(i, k)
                             tracer.set_edge_class(i, k, "relaxed")
-                        if (k, j) in tracer._edge_selected:
+                        if tracer.has_edge(k, j):
                             tracer.select_edge(k, j)
                             tracer.set_edge_class(k, j, "relaxed")
 
@@ -165,7 +183,7 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
                             f"  dist[{i}][{j}]: {fmt(old_val)} -> {fmt(new_dist)} "
                             f"via k={k}"
                         )
-                        snap(
+                        yield snap(
                             15,
                             f"dist[{i}][{j}] = {fmt(new_dist)} via k={k}",
                         )
@@ -175,9 +193,9 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
                         tracer.deselect_node(j)
 
                         # Reset edge classes
-                        if (i, k) in tracer._edge_class:
+                        if tracer.has_edge(i, k):
                             tracer.set_edge_class(i, k, "")
-                        if (k, j) in tracer._edge_class:
+                        if tracer.has_edge(k, j):
                             tracer.set_edge_class(k, j, "")
 
             # Done with intermediate k
@@ -185,7 +203,7 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
             tracer.deselect_node(k)
             tracer.patch_node(k)
             tracer.log(f"Done with intermediate k={k}")
-            snap(15, f"Completed intermediate k={k}")
+            yield snap(15, f"Completed intermediate k={k}")
 
         # Final state: show all distances on labels
         tracer.deselect_all_nodes()
@@ -193,5 +211,4 @@ Interview Tip: Floyd-Warshall is ideal when you need all-pairs shortest paths or
         for i in range(n):
             tracer.set_label(i, str(i))
         tracer.log("Floyd-Warshall complete. All-pairs shortest paths computed.")
-        snap(15, "All-pairs shortest paths computed")
-        return steps
+        yield snap(15, "All-pairs shortest paths computed")
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -71,6 +72,19 @@ class IsBipartite(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for v in GRAPH_SIZES:
+            # Only edges between even and odd nodes, so the graph is bipartite.
+            graph: list[list[int]] = [[] for _ in range(v)]
+            for a, b in random_graph(v, 4 * v, seed=v, connected=False):
+                if (a + b) % 2:
+                    graph[a].append(b)
+                    graph[b].append(a)
+            inputs.append((v, {"graph": graph}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: Determine if a graph can be 2-colored such that no adjacent nodes share the same color. BFS or DFS: assign color 0 to the starting node, alternate colors for neighbors. If any neighbor has the same color as the current node, the graph is not bipartite.
@@ -101,7 +115,7 @@ Interview Tip: Don't forget to handle disconnected graphs — start BFS/DFS from
             ],
         }
 
-        graph = presets.get(preset, presets[1])
+        graph = kwargs.get("graph") or presets.get(preset, presets[1])
         n = len(graph)
 
         tracer = GraphTracer(list(range(n)), directed=False)
@@ -118,6 +132,8 @@ Interview Tip: Don't forget to handle disconnected graphs — start BFS/DFS from
                 if key not in added:
                     tracer.add_edge(i, j)
                     added.add(key)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         edges_str = ", ".join(f"{a}-{b}" for a, b in sorted(added))
         tracer.log(f"Graph: {n} nodes, edges: {edges_str}")
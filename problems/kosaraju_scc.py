@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import AuxPanelTracer, GraphTracer, combine_step
+from core.tracer import FORCE_LAYOUT_MIN_NODES, AuxPanelTracer, GraphTracer, combine_step
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -105,6 +106,10 @@ class KosarajuSCC(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(v, {"n": v, "edges": random_graph(v, 2 * v, seed=v, directed=True)}) for v in GRAPH_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Kosaraju's algorithm finds Strongly Connected Components using two DFS passes. First pass: DFS on the original graph, pushing nodes onto a stack in finish order. Second pass: DFS on the reversed graph, processing nodes in reverse finish order. Each DFS tree in pass 2 is one SCC.
@@ -136,6 +141,8 @@ Interview Tip: Kosaraju's is conceptually simpler than Tarjan's — just "DFS, r
         }
 
         n, edges = presets.get(preset, presets[1])
+        if "edges" in kwargs:
+            n, edges = int(kwargs["n"]), kwargs["edges"]
         adj: list[list[int]] = [[] for _ in range(n)]
         for u, v in edges:
             adj[u].append(v)
@@ -156,6 +163,8 @@ Interview Tip: Kosaraju's is conceptually simpler than Tarjan's — just "DFS, r
         # Add edges to graph
         for u, v in edges:
             graph.add_edge(u, v)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            graph.set_force_layout()
 
         edge_str = ", ".join(f"{u}->{v}" for u, v in edges)
         graph.log(f"Directed graph: {n} nodes, edges: {edge_str}")
@@ -223,7 +232,7 @@ Interview Tip: Kosaraju's is conceptually simpler than Tarjan's — just "DFS, r
 
         # Copy positions from original graph
         for nid in range(n):
-            graph_t._positions[nid] = graph._positions[nid]
+            graph_t.set_position(nid, *graph.position(nid))
 
         for u, v in edges:
             graph_t.add_edge(v, u)  # transposed
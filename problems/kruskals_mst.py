@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import AuxPanelTracer, GraphTracer, combine_step
+from core.tracer import FORCE_LAYOUT_MIN_NODES, AuxPanelTracer, GraphTracer, combine_step
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -81,6 +82,10 @@ class KruskalsMST(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(v, {"n": v, "edges": random_graph(v, 2 * v, seed=v, weights=(1, 20))}) for v in GRAPH_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Kruskal's algorithm builds a Minimum Spanning Tree by sorting all edges by weight and greedily adding the cheapest edge that doesn't create a cycle. Uses Union-Find (Disjoint Set Union) to efficiently detect cycles.
@@ -105,8 +110,8 @@ Interview Tip: Kruskal's is often easier to code than Prim's since you just sort
             ],
         }
 
-        edge_list = presets.get(preset, presets[1])
-        n = 8
+        edge_list = kwargs.get("edges") or presets.get(preset, presets[1])
+        n = int(kwargs.get("n", 8))
 
         graph = GraphTracer(list(range(n)), directed=False)
         aux = AuxPanelTracer()
@@ -128,6 +133,8 @@ Interview Tip: Kruskal's is often easier to code than Prim's since you just sort
         # Add all edges to the tracer
         for u, v, w in edge_list:
             graph.add_edge(u, v, weight=w)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            graph.set_force_layout()
 
         update_aux()
         graph.log(f"Kruskal's MST: {n} nodes, {len(edge_list)} edges")
@@ -159,29 +166,27 @@ Interview Tip: Kruskal's is often easier to code than Prim's since you just sort
         mst_cost = 0
 
         for u, v, w in sorted_edges:
-            edge_key = (u, v) if (u, v) in graph._edge_selected else (v, u)
-
             # Highlight the edge being considered
             graph.deselect_all_nodes()
             graph.deselect_all_edges()
             graph.clear_all_edge_errors()
             graph.select_node(u)
             graph.select_node(v)
-            graph.select_edge(*edge_key)
+            graph.select_edge(u, v)
             graph.log(f"Consider edge {u}-{v} (w={w})")
             snap(26, f"Consider edge {u}-{v}, w={w}")
 
             if union(u, v):
                 mst.append((u, v, w))
                 mst_cost += w
-                graph.patch_edge(*edge_key)
+                graph.patch_edge(u, v)
                 graph.patch_node(u)
                 graph.patch_node(v)
                 update_aux()
                 graph.log(f"  Accept! MST cost = {mst_cost}")
                 snap(28, f"Accept {u}-{v}, cost = {mst_cost}")
             else:
-                graph.mark_edge_error(*edge_key)
+                graph.mark_edge_error(u, v)
                 graph.mark_node_error(u)
                 graph.mark_node_error(v)
                 graph.log(f"  Reject! Cycle detected (same root)")
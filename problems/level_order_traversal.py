@@ -135,7 +135,7 @@ Interview Tip: Level-order traversal (BFS) is the foundation for many tree probl
         for nid in node_ids:
             label, left, right = tree[nid]
             tracer.set_label(nid, label)
-            tracer._positions[nid] = positions[nid]
+            tracer.set_position(nid, *positions[nid])
 
         # Add edges
         for nid in node_ids:
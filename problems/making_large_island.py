@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -107,6 +110,10 @@ class MakingLargeIsland(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(n, {"grid": random_grid(n, [0, 1], seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find the largest island achievable by changing at most one 0 to 1. First, label each island with a unique ID and compute its size using DFS/BFS. Then, for each 0-cell, check its 4 neighbors' island IDs, sum the distinct island sizes + 1, and track the maximum.
@@ -121,6 +128,10 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
+        return list(MakingLargeIsland.iter_steps(**kwargs))
+
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         preset = int(kwargs.get("preset", 1))
 
         presets = {
@@ -135,7 +146,7 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
             ],
         }
 
-        grid = [row[:] for row in presets.get(preset, presets[1])]
+        grid = [row[:] for row in kwargs.get("grid") or presets.get(preset, presets[1])]
         n = len(grid)
         total = n * n
 
@@ -144,7 +155,6 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
         size = [1] * total
 
         board = Board2DTracer(n, n)
-        steps: list[Step] = []
 
         # Island colors for visual distinction
         island_colors = [
@@ -152,8 +162,8 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
             "#f38ba8", "#89dceb", "#f9e2af", "#b4befe",
         ]
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(board.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return board.snapshot(line, desc)
 
         def find(x: int) -> int:
             if parent[x] != x:
@@ -177,11 +187,11 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
                 board.set_value(r, c, str(grid[r][c]))
 
         board.log(f"Grid: {n}x{n} binary grid")
-        snap(1, f"{n}x{n} grid, find largest island after one flip")
+        yield snap(1, f"{n}x{n} grid, find largest island after one flip")
 
         # Phase 1: Union all adjacent 1-cells
         board.log("Phase 1: Build islands with Union-Find")
-        snap(24, "Phase 1: union adjacent land cells")
+        yield snap(24, "Phase 1: union adjacent land cells")
 
         for r in range(n):
             for c in range(n):
@@ -214,7 +224,7 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
 
         island_count = len(root_to_color)
         board.log(f"Found {island_count} islands")
-        snap(53, f"Phase 1 done: {island_count} islands identified")
+        yield snap(53, f"Phase 1 done: {island_count} islands identified")
 
         # Compute initial best (largest existing island)
         best = 0
@@ -225,7 +235,7 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
 
         # Phase 2: Try flipping each 0 cell
         board.log("Phase 2: Try flipping each 0-cell")
-        snap(34, "Phase 2: evaluate each 0-cell")
+        yield snap(34, "Phase 2: evaluate each 0-cell")
 
         best_r, best_c, best_total = -1, -1, best
 
@@ -248,7 +258,7 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
 
                     board.set_overlay(r, c, str(candidate_total), "#f9e2af")
                     board.log(f"  ({r},{c}): flip 0->1, potential size = {candidate_total}")
-                    snap(45, f"({r},{c}): potential = {candidate_total}")
+                    yield snap(45, f"({r},{c}): potential = {candidate_total}")
 
                     if candidate_total > best_total:
                         # Clear previous best overlay if it was a 0 cell
@@ -284,5 +294,4 @@ Interview Tip: The edge case where the entire grid is land (no 0 to flip) must b
                                     board.mark_on_path(pr, pc)
 
         board.log(f"Best: flip ({best_r},{best_c}), island size = {best_total}")
-        snap(49, f"Answer: {best_total} (flip ({best_r},{best_c}))")
-        return steps
+        yield snap(49, f"Answer: {best_total} (flip ({best_r},{best_c}))")
@@ -3,7 +3,8 @@ from __future__ import annotations
 import heapq
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -82,6 +83,18 @@ class MaxProbabilityPath(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for v in GRAPH_SIZES:
+            edges = random_graph(v, 2 * v, seed=v, weights=(1, 9))
+            inputs.append((v, {
+                "n": v,
+                "edges": [(a, b) for a, b, _ in edges],
+                "succ_prob": [w / 10 for _, _, w in edges],
+            }))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find the path with maximum probability between two nodes. This is a shortest path variant where we maximize the product of probabilities instead of minimizing the sum of weights. Use a modified Dijkstra's with a max-heap.
@@ -113,6 +126,9 @@ Interview Tip: The key insight is recognizing this as a Dijkstra's variant. Alte
         }
 
         n, edge_list, succ_probs, start, end = presets.get(preset, presets[1])
+        if "edges" in kwargs:
+            n, edge_list, succ_probs = int(kwargs["n"]), kwargs["edges"], kwargs["succ_prob"]
+            start, end = int(kwargs.get("start", 0)), int(kwargs.get("end", n - 1))
 
         # Build adjacency list
         graph: list[list[tuple[int, float]]] = [[] for _ in range(n)]
@@ -133,6 +149,8 @@ Interview Tip: The key insight is recognizing this as a Dijkstra's variant. Alte
             if key not in added_edges:
                 tracer.add_edge(u, v, weight=succ_probs[i])
                 added_edges.add(key)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         # Initial state
         prob = [0.0] * n
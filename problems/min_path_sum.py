@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -66,6 +69,10 @@ class MinPathSum(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(n, {"grid": random_grid(n, range(1, 10), seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find the path from top-left to bottom-right with minimum sum, moving only right or down. DP recurrence: dp[i][j] = grid[i][j] + min(dp[i-1][j], dp[i][j-1]). Fill the table row by row.
@@ -80,8 +87,10 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
+        return list(MinPathSum.iter_steps(**kwargs))
 
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         grids = {
             1: [
                 [1, 3, 1, 8, 2, 6, 4],
@@ -94,15 +103,14 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
             ],
         }
 
-        grid = [row[:] for row in grids.get(grid_id, grids[1])]
+        grid = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         m, n = len(grid), len(grid[0])
         dp = [[0] * n for _ in range(m)]
 
         tracer = Board2DTracer(m, n)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         # Initialize grid display with cost values
         for r in range(m):
@@ -110,7 +118,7 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
                 tracer.set_value(r, c, str(grid[r][c]))
 
         tracer.log(f"Grid: {m}x{n} with costs 1-9")
-        snap(2, f"Initialize {m}x{n} cost grid")
+        yield snap(2, f"Initialize {m}x{n} cost grid")
 
         # Base case: dp[0][0]
         dp[0][0] = grid[0][0]
@@ -119,7 +127,7 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
         tracer.set_overlay(0, 0, str(dp[0][0]), color="#3b82f6")
         tracer.patch(0, 0)
         tracer.log(f"dp[0][0] = {dp[0][0]}")
-        snap(4, f"dp[0][0] = {dp[0][0]}")
+        yield snap(4, f"dp[0][0] = {dp[0][0]}")
 
         # Fill first column
         for i in range(1, m):
@@ -128,13 +136,13 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
             tracer.select(i, 0)
             tracer.select(i - 1, 0)
             tracer.log(f"dp[{i}][0] = dp[{i-1}][0]({dp[i-1][0]}) + {grid[i][0]} = {dp[i][0]}")
-            snap(8, f"dp[{i}][0] = {dp[i-1][0]} + {grid[i][0]}")
+            yield snap(8, f"dp[{i}][0] = {dp[i-1][0]} + {grid[i][0]}")
 
             tracer.deselect_all()
             tracer.set_overlay(i, 0, str(dp[i][0]), color="#3b82f6")
             tracer.set_arrow(i, 0, "down" if i < m - 1 else "")
             tracer.patch(i, 0)
-            snap(8, f"dp[{i}][0] = {dp[i][0]}")
+            yield snap(8, f"dp[{i}][0] = {dp[i][0]}")
 
         # Fill first row
         for j in range(1, n):
@@ -143,13 +151,13 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
             tracer.select(0, j)
             tracer.select(0, j - 1)
             tracer.log(f"dp[0][{j}] = dp[0][{j-1}]({dp[0][j-1]}) + {grid[0][j]} = {dp[0][j]}")
-            snap(11, f"dp[0][{j}] = {dp[0][j-1]} + {grid[0][j]}")
+            yield snap(11, f"dp[0][{j}] = {dp[0][j-1]} + {grid[0][j]}")
 
             tracer.deselect_all()
             tracer.set_overlay(0, j, str(dp[0][j]), color="#3b82f6")
             tracer.set_arrow(0, j, "right" if j < n - 1 else "")
             tracer.patch(0, j)
-            snap(11, f"dp[0][{j}] = {dp[0][j]}")
+            yield snap(11, f"dp[0][{j}] = {dp[0][j]}")
 
         # Fill rest of DP table
         for i in range(1, m):
@@ -164,7 +172,7 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
                 tracer.log(
                     f"dp[{i}][{j}] = {grid[i][j]} + min(top={from_top}, left={from_left})"
                 )
-                snap(13, f"dp[{i}][{j}] = {grid[i][j]} + min({from_top}, {from_left})")
+                yield snap(13, f"dp[{i}][{j}] = {grid[i][j]} + min({from_top}, {from_left})")
 
                 dp[i][j] = grid[i][j] + min(from_top, from_left)
 
@@ -174,7 +182,7 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
                 tracer.patch(i, j)
                 came_from = "top" if from_top <= from_left else "left"
                 tracer.log(f"  dp[{i}][{j}] = {dp[i][j]} (from {came_from})")
-                snap(13, f"dp[{i}][{j}] = {dp[i][j]} (via {came_from})")
+                yield snap(13, f"dp[{i}][{j}] = {dp[i][j]} (via {came_from})")
 
         # Trace back the minimum path
         tracer.deselect_all()
@@ -204,6 +212,5 @@ Interview Tip: Can be done in-place by overwriting the grid. If the interviewer
                     tracer.set_arrow(pr, pc, "right")
 
         tracer.log(f"Minimum path sum = {dp[m-1][n-1]}")
-        snap(15, f"Minimum path sum = {dp[m-1][n-1]}")
+        yield snap(15, f"Minimum path sum = {dp[m-1][n-1]}")
 
-        return steps
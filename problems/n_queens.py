@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Generator, Iterator
+
 from core.step import Step
 from core.tracer import Board2DTracer
 from problems.base_problem import Problem
@@ -83,6 +85,10 @@ class NQueens(Problem):
     def default_params() -> dict[str, object]:
         return {"n": 8}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(n, {"n": n}) for n in range(4, 11)]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Place N queens on an N×N chessboard so no two queens threaten each other. Use backtracking: try placing a queen in each column of the current row, check if it's safe (no conflicts with queens in previous rows), and recurse. If stuck, backtrack and try the next column.
@@ -97,27 +103,27 @@ Interview Tip: N-Queens is THE classic backtracking problem. The optimization of
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
+        return list(NQueens.iter_steps(**kwargs))
+
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         n = int(kwargs.get("n", 8))
         tracer = Board2DTracer(n, n)
-        steps: list[Step] = []
-
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
 
         # Line 2: initialize board
         tracer.log(f"Initialize {n}x{n} board")
-        snap(2, f"Initialize {n}x{n} board")
+        yield tracer.snapshot(2, f"Initialize {n}x{n} board")
 
-        def is_safe(row: int, col: int) -> bool:
+        def is_safe(row: int, col: int) -> Generator[Step, None, bool]:
             # Check column
             for i in range(row):
                 tracer.select(i, col)
-                snap(7, f"Check column: row {i}, col {col}")
-                if tracer._values[i][col] == 1:
+                yield tracer.snapshot(7, f"Check column: row {i}, col {col}")
+                if tracer.value(i, col) == 1:
                     tracer.mark_error(i, col)
                     tracer.mark_error(row, col)
                     tracer.log(f"Column conflict at ({i}, {col})")
-                    snap(8, f"Column conflict at ({i}, {col})")
+                    yield tracer.snapshot(8, f"Column conflict at ({i}, {col})")
                     tracer.clear_all_errors()
                     tracer.deselect(i, col)
                     return False
@@ -127,12 +133,12 @@ Interview Tip: N-Queens is THE classic backtracking problem. The optimization of
             i, j = row - 1, col - 1
             while i >= 0 and j >= 0:
                 tracer.select(i, j)
-                snap(11, f"Check diagonal: ({i}, {j})")
-                if tracer._values[i][j] == 1:
+                yield tracer.snapshot(11, f"Check diagonal: ({i}, {j})")
+                if tracer.value(i, j) == 1:
                     tracer.mark_error(i, j)
                     tracer.mark_error(row, col)
                     tracer.log(f"Diagonal conflict at ({i}, {j})")
-                    snap(12, f"Diagonal conflict at ({i}, {j})")
+                    yield tracer.snapshot(12, f"Diagonal conflict at ({i}, {j})")
                     tracer.clear_all_errors()
                     tracer.deselect(i, j)
                     return False
@@ -144,12 +150,12 @@ Interview Tip: N-Queens is THE classic backtracking problem. The optimization of
             i, j = row - 1, col + 1
             while i >= 0 and j < n:
                 tracer.select(i, j)
-                snap(16, f"Check diagonal: ({i}, {j})")
-                if tracer._values[i][j] == 1:
+                yield tracer.snapshot(16, f"Check diagonal: ({i}, {j})")
+                if tracer.value(i, j) == 1:
                     tracer.mark_error(i, j)
                     tracer.mark_error(row, col)
                     tracer.log(f"Diagonal conflict at ({i}, {j})")
-                    snap(17, f"Diagonal conflict at ({i}, {j})")
+                    yield tracer.snapshot(17, f"Diagonal conflict at ({i}, {j})")
                     tracer.clear_all_errors()
                     tracer.deselect(i, j)
                     return False
@@ -159,10 +165,10 @@ Interview Tip: N-Queens is THE classic backtracking problem. The optimization of
 
             return True
 
-        def backtrack(row: int) -> bool:
+        def backtrack(row: int) -> Generator[Step, None, bool]:
             if row == n:
                 tracer.log("All queens placed! Solution found.")
-                snap(26, "All queens placed! Solution found.")
+                yield tracer.snapshot(26, "All queens placed! Solution found.")
                 return True
 
             for col in range(n):
@@ -170,17 +176,17 @@ Interview Tip: N-Queens is THE classic backtracking problem. The optimization of
                 tracer.depatch_all()
                 tracer.select(row, col)
                 tracer.log(f"Try queen at ({row}, {col})")
-                snap(28, f"Try queen at ({row}, {col})")
+                yield tracer.snapshot(28, f"Try queen at ({row}, {col})")
 
-                if is_safe(row, col):
+                if (yield from is_safe(row, col)):
                     tracer.deselect_all()
                     tracer.set_value(row, col, 1)
                     tracer.patch(row, col)
                     tracer.log(f"Place queen at ({row}, {col})")
-                    snap(30, f"Place queen at ({row}, {col})")
+                    yield tracer.snapshot(30, f"Place queen at ({row}, {col})")
                     tracer.depatch(row, col)
 
-                    if backtrack(row + 1):
+                    if (yield from backtrack(row + 1)):
                         return True
 
                     # Backtrack
@@ -188,12 +194,11 @@ Interview Tip: N-Queens is THE classic backtracking problem. The optimization of
                     tracer.deselect_all()
                     tracer.select(row, col)
                     tracer.log(f"Remove queen from ({row}, {col})")
-                    snap(34, f"Backtrack: remove queen from ({row}, {col})")
+                    yield tracer.snapshot(34, f"Backtrack: remove queen from ({row}, {col})")
                     tracer.deselect(row, col)
                 else:
                     tracer.deselect_all()
 
             return False
 
-        backtrack(0)
-        return steps
+        yield from backtrack(0)
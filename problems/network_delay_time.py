@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -75,6 +76,15 @@ class NetworkDelayTime(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for v in GRAPH_SIZES:
+            # Nodes are 1-indexed; node 1 reaches every node.
+            edges = random_graph(v, 2 * v, seed=v, directed=True, weights=(1, 20))
+            inputs.append((v, {"n": v, "times": [(a + 1, b + 1, w) for a, b, w in edges]}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: This is a direct application of Dijkstra's algorithm. Model the network as a weighted directed graph and find the shortest path from the source to all nodes. The answer is the maximum shortest path distance — the time for the signal to reach the farthest node.
@@ -103,9 +113,9 @@ Interview Tip: This problem tests whether you can recognize the underlying short
             ],
         }
 
-        times_list = presets.get(preset, presets[1])
-        n = 8
-        k = 1
+        times_list = kwargs.get("times") or presets.get(preset, presets[1])
+        n = int(kwargs.get("n", 8))
+        k = int(kwargs.get("k", 1))
 
         # Build adjacency list (1-indexed)
         adj: list[list[tuple[int, int]]] = [[] for _ in range(n + 1)]
@@ -121,6 +131,8 @@ Interview Tip: This problem tests whether you can recognize the underlying short
         # Add edges to tracer
         for u, v, w in times_list:
             tracer.add_edge(u, v, weight=w)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         tracer.log(f"Network Delay: {n} nodes, source k={k}")
         snap(1, f"Network with {n} nodes, source k={k}")
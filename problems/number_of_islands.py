@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -86,6 +87,11 @@ class NumberOfIslands(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # Mostly land, so the recursive DFS goes deep.
+        return [(n, {"grid": random_grid(n, ["1", "0"], [3, 1], seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Count connected components of '1's in a 2D grid using DFS or BFS. For each unvisited '1', increment the island count and flood-fill (mark as visited) all connected '1's reachable by moving up, down, left, or right.
@@ -100,8 +106,7 @@ Interview Tip: You can modify the grid in-place (mark '1' → '0') to avoid extr
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
-        grid_template = _GRIDS.get(grid_id, _GRIDS[1])
+        grid_template = pick(kwargs.get("grid", 1), _GRIDS)
 
         # Deep copy the grid
         grid = [row[:] for row in grid_template]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -82,6 +83,17 @@ class NumberOfProvinces(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for v in GRAPH_SIZES:
+            # About v / 2 random links, which leaves several provinces.
+            matrix = [[int(i == j) for j in range(v)] for i in range(v)]
+            for a, b in random_graph(v, v // 2, seed=v, connected=False):
+                matrix[a][b] = matrix[b][a] = 1
+            inputs.append((v, {"is_connected": matrix}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: Count the number of connected components in an undirected graph given as an adjacency matrix. Each province is a connected component. Use DFS, BFS, or Union-Find to group connected cities.
@@ -112,7 +124,7 @@ Interview Tip: This is essentially the same as Number of Islands but on a graph
             ],
         }
 
-        is_connected = presets.get(preset, presets[1])
+        is_connected = kwargs.get("is_connected") or presets.get(preset, presets[1])
         n = len(is_connected)
 
         parent = list(range(n))
@@ -139,6 +151,8 @@ Interview Tip: This is essentially the same as Number of Islands but on a graph
             for j in range(i + 1, n):
                 if is_connected[i][j] == 1:
                     tracer.add_edge(i, j)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         tracer.log(f"Cities: {n}, each its own province")
         snap(3, f"{n} cities, each its own province")
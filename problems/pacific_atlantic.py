@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from collections import deque
+from collections.abc import Iterator
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -81,6 +83,10 @@ class PacificAtlantic(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(n, {"grid": random_grid(n, range(1, 10), seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find cells that can reach both the Pacific (top/left edges) and Atlantic (bottom/right edges) oceans. Instead of flowing water downhill from every cell, reverse the flow — BFS/DFS uphill from each ocean's boundary. A cell in both reachable sets can reach both oceans.
@@ -95,8 +101,10 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
+        return list(PacificAtlantic.iter_steps(**kwargs))
 
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         grids = {
             1: [
                 [1, 2, 2, 3, 5, 4, 2],
@@ -109,14 +117,13 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
             ],
         }
 
-        heights = [row[:] for row in grids.get(grid_id, grids[1])]
+        heights = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         m, n = len(heights), len(heights[0])
 
         tracer = Board2DTracer(m, n)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         # Initialize grid with height values
         for r in range(m):
@@ -124,7 +131,7 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
                 tracer.set_value(r, c, str(heights[r][c]))
 
         tracer.log(f"Heights: {m}x{n}. Pacific=top+left, Atlantic=bottom+right")
-        snap(2, f"{m}x{n} island heights grid")
+        yield snap(2, f"{m}x{n} island heights grid")
 
         # --- Phase 1: BFS from Pacific ---
         pacific: set[tuple[int, int]] = set()
@@ -140,14 +147,14 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
             tracer.select(r, c)
 
         tracer.log(f"Pacific border: {len(pac_starts)} cells")
-        snap(17, f"Pacific border cells ({len(pac_starts)} sources)")
+        yield snap(17, f"Pacific border cells ({len(pac_starts)} sources)")
 
         queue: deque[tuple[int, int]] = deque(pac_starts)
         while queue:
             r, c = queue.popleft()
             tracer.deselect_all()
             tracer.select(r, c)
-            snap(9, f"Pacific BFS: process ({r},{c}) h={heights[r][c]}")
+            yield snap(9, f"Pacific BFS: process ({r},{c}) h={heights[r][c]}")
 
             for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
                 nr, nc = r + dr, c + dc
@@ -158,11 +165,11 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
                             queue.append((nr, nc))
                             tracer.set_overlay(nr, nc, "P", color="#3b82f6")
                             tracer.log(f"  Pacific reaches ({nr},{nc}) h={heights[nr][nc]}")
-                            snap(15, f"Pacific reaches ({nr},{nc})")
+                            yield snap(15, f"Pacific reaches ({nr},{nc})")
 
         tracer.deselect_all()
         tracer.log(f"Pacific can reach {len(pacific)} cells")
-        snap(21, f"Pacific reachable: {len(pacific)} cells")
+        yield snap(21, f"Pacific reachable: {len(pacific)} cells")
 
         # --- Phase 2: BFS from Atlantic ---
         atlantic: set[tuple[int, int]] = set()
@@ -181,14 +188,14 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
             tracer.select(r, c)
 
         tracer.log(f"Atlantic border: {len(atl_starts)} cells")
-        snap(20, f"Atlantic border cells ({len(atl_starts)} sources)")
+        yield snap(20, f"Atlantic border cells ({len(atl_starts)} sources)")
 
         queue = deque(atl_starts)
         while queue:
             r, c = queue.popleft()
             tracer.deselect_all()
             tracer.select(r, c)
-            snap(9, f"Atlantic BFS: process ({r},{c}) h={heights[r][c]}")
+            yield snap(9, f"Atlantic BFS: process ({r},{c}) h={heights[r][c]}")
 
             for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
                 nr, nc = r + dr, c + dc
@@ -202,11 +209,11 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
                             else:
                                 tracer.set_overlay(nr, nc, "A", color="#ef4444")
                             tracer.log(f"  Atlantic reaches ({nr},{nc}) h={heights[nr][nc]}")
-                            snap(15, f"Atlantic reaches ({nr},{nc})")
+                            yield snap(15, f"Atlantic reaches ({nr},{nc})")
 
         tracer.deselect_all()
         tracer.log(f"Atlantic can reach {len(atlantic)} cells")
-        snap(24, f"Atlantic reachable: {len(atlantic)} cells")
+        yield snap(24, f"Atlantic reachable: {len(atlantic)} cells")
 
         # --- Phase 3: Find intersection ---
         both = pacific & atlantic
@@ -215,6 +222,5 @@ Interview Tip: The reverse-flow technique is a classic optimization. Similarly t
             tracer.patch(r, c)
 
         tracer.log(f"Cells reaching both oceans: {len(both)}")
-        snap(27, f"Result: {len(both)} cells reach both oceans")
+        yield snap(27, f"Result: {len(both)} cells reach both oceans")
 
-        return steps
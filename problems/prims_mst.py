@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import GraphTracer
+from core.tracer import FORCE_LAYOUT_MIN_NODES, GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -73,6 +74,10 @@ class PrimsMST(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(v, {"n": v, "edges": random_graph(v, 2 * v, seed=v, weights=(1, 20))}) for v in GRAPH_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Prim's algorithm builds a Minimum Spanning Tree by growing a single tree. Start from any node, and repeatedly add the cheapest edge that connects a visited node to an unvisited node. Uses a min-heap to efficiently find the next cheapest edge.
@@ -110,8 +115,8 @@ Interview Tip: Prim's is better for dense graphs (adjacency matrix). For sparse
             ],
         }
 
-        edge_list = presets.get(preset, presets[1])
-        n = 8
+        edge_list = kwargs.get("edges") or presets.get(preset, presets[1])
+        n = int(kwargs.get("n", 8))
 
         # Build adjacency list
         graph: list[list[tuple[int, int]]] = [[] for _ in range(n)]
@@ -128,6 +133,8 @@ Interview Tip: Prim's is better for dense graphs (adjacency matrix). For sparse
         # Add edges to tracer
         for u, v, w in edge_list:
             tracer.add_edge(u, v, weight=w)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            tracer.set_force_layout()
 
         tracer.log(f"Prim's MST: {n} nodes, {len(edge_list)} edges")
         snap(1, f"Prim's MST: {n} nodes")
@@ -167,9 +174,8 @@ Interview Tip: Prim's is better for dense graphs (adjacency matrix). For sparse
             # Patch the MST edge (parent[u] -> u)
             if parent[u] != -1:
                 p = parent[u]
-                edge_key = (p, u) if (p, u) in tracer._edge_selected else (u, p)
-                tracer.patch_edge(*edge_key)
-                tracer.set_edge_class(*edge_key, "relaxed")
+                tracer.patch_edge(p, u)
+                tracer.set_edge_class(p, u, "relaxed")
                 tracer.log(f"  MST edge: {p}-{u} (w={w}), total cost = {mst_cost}")
                 snap(14, f"MST edge {p}-{u}, cost = {mst_cost}")
             else:
@@ -178,12 +184,10 @@ Interview Tip: Prim's is better for dense graphs (adjacency matrix). For sparse
 
             # Examine neighbors
             for v, weight in graph[u]:
-                edge_key = (u, v) if (u, v) in tracer._edge_selected else (v, u)
-
                 if in_mst[v]:
                     continue
 
-                tracer.select_edge(*edge_key)
+                tracer.select_edge(u, v)
                 tracer.log(f"  Examine edge {u}-{v} (w={weight})")
                 snap(18, f"Check edge {u}-{v}, w={weight}")
 
@@ -200,7 +204,7 @@ Interview Tip: Prim's is better for dense graphs (adjacency matrix). For sparse
                     tracer.log(f"  No update for {v} (key={int(key[v])} <= {weight})")
                     snap(18, f"No update for {v}")
 
-                tracer.deselect_edge(*edge_key)
+                tracer.deselect_edge(u, v)
 
         # Final result
         tracer.deselect_all_nodes()
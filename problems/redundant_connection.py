@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from core.step import Step
 from core.tracer import GraphTracer
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -76,6 +77,14 @@ class RedundantConnection(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # A random tree plus one extra edge, 1-indexed.
+        return [
+            (v, {"edges": [[a + 1, b + 1] for a, b in random_graph(v, v, seed=v)]})
+            for v in GRAPH_SIZES
+        ]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find the edge that, when removed, makes the graph a tree (connected and acyclic). Process edges one by one using Union-Find. The first edge that connects two already-connected nodes creates a cycle — that's the redundant connection.
@@ -100,7 +109,7 @@ Interview Tip: Union-Find is the cleanest approach here. The problem guarantees
             ],
         }
 
-        edges = presets.get(preset, presets[1])
+        edges = kwargs.get("edges") or presets.get(preset, presets[1])
         # Collect all unique node IDs
         node_set = set()
         for u, v in edges:
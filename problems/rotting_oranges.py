@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from collections import deque
+from collections.abc import Iterator
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -82,6 +84,11 @@ class RottingOranges(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # Mostly fresh oranges, a few rotten ones to start from.
+        return [(n, {"grid": random_grid(n, [0, 1, 2], [2, 7, 1], seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Multi-source BFS from all initially rotten oranges. Each BFS layer represents one minute of spreading. Add all rotten oranges to the queue initially, then BFS level-by-level. Track the number of minutes (BFS levels) until no fresh oranges remain.
@@ -96,8 +103,10 @@ Interview Tip: Count fresh oranges at the start. Each time you rot one, decremen
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
+        return list(RottingOranges.iter_steps(**kwargs))
 
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         grids = {
             1: [
                 [2, 1, 1, 0, 0, 1, 1],
@@ -110,14 +119,13 @@ Interview Tip: Count fresh oranges at the start. Each time you rot one, decremen
             ],
         }
 
-        grid = [row[:] for row in grids.get(grid_id, grids[1])]
+        grid = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         m, n = len(grid), len(grid[0])
 
         tracer = Board2DTracer(m, n)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         # Initialize: 0=empty, 1=fresh, 2=rotten
         for r in range(m):
@@ -129,7 +137,7 @@ Interview Tip: Count fresh oranges at the start. Each time you rot one, decremen
                     pass  # fresh = green (land color)
 
         tracer.log(f"Grid: {m}x{n}")
-        snap(2, f"Initialize {m}x{n} grid")
+        yield snap(2, f"Initialize {m}x{n} grid")
 
         queue: deque[tuple[int, int]] = deque()
         fresh = 0
@@ -142,19 +150,19 @@ Interview Tip: Count fresh oranges at the start. Each time you rot one, decremen
                     fresh += 1
 
         tracer.log(f"Rotten sources: {len(queue)}, Fresh: {fresh}")
-        snap(8, f"Found {len(queue)} rotten, {fresh} fresh oranges")
+        yield snap(8, f"Found {len(queue)} rotten, {fresh} fresh oranges")
 
         if fresh == 0:
             tracer.log("No fresh oranges — done!")
-            snap(29, "Result: 0 minutes")
-            return steps
+            yield snap(29, "Result: 0 minutes")
+            return
 
         minutes = 0
         while queue:
             level_size = len(queue)
             tracer.deselect_all()
             tracer.log(f"--- Minute {minutes} (processing {level_size} rotten) ---")
-            snap(20, f"Minute {minutes}: {level_size} rotten spreading")
+            yield snap(20, f"Minute {minutes}: {level_size} rotten spreading")
 
             rotted_this_round = False
             for _ in range(level_size):
@@ -171,7 +179,7 @@ Interview Tip: Count fresh oranges at the start. Each time you rot one, decremen
                         tracer.set_value(nr, nc, str(2))
                         tracer.mark_error(nr, nc)
                         tracer.log(f"  Orange at ({nr},{nc}) rots!")
-                        snap(27, f"({nr},{nc}) rots! Fresh left: {fresh}")
+                        yield snap(27, f"({nr},{nc}) rots! Fresh left: {fresh}")
                         tracer.deselect(nr, nc)
 
             minutes += 1
@@ -181,5 +189,4 @@ Interview Tip: Count fresh oranges at the start. Each time you rot one, decremen
         tracer.deselect_all()
         result = minutes - 1 if fresh == 0 else -1
         tracer.log(f"Result: {result} minutes")
-        snap(29, f"Result: {result} minutes")
-        return steps
+        yield snap(29, f"Result: {result} minutes")
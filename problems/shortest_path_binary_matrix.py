@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from collections import deque
+from collections.abc import Iterator
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -75,6 +77,15 @@ class ShortestPathBinaryMatrix(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for n in GRID_SIZES:
+            grid = random_grid(n, [0, 1], [7, 3], seed=n)
+            grid[0][0] = grid[-1][-1] = 0
+            inputs.append((n, {"grid": grid}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: BFS from the top-left to bottom-right corner of a binary grid, moving in all 8 directions (including diagonals). BFS guarantees the shortest path in an unweighted graph. Return the path length (number of cells) or -1 if unreachable.
@@ -89,8 +100,10 @@ Interview Tip: Always check the start and end cells first — if either is block
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
+        return list(ShortestPathBinaryMatrix.iter_steps(**kwargs))
 
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         grids = {
             1: [
                 [0, 0, 1, 0, 0, 0, 0],
@@ -103,32 +116,31 @@ Interview Tip: Always check the start and end cells first — if either is block
             ],
         }
 
-        grid = [row[:] for row in grids.get(grid_id, grids[1])]
+        grid = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         n = len(grid)
 
         tracer = Board2DTracer(n, n)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         for r in range(n):
             for c in range(n):
                 tracer.set_value(r, c, str(grid[r][c]))
 
         tracer.log(f"Grid: {n}x{n}, 8-directional BFS")
-        snap(2, f"Initialize {n}x{n} grid")
+        yield snap(2, f"Initialize {n}x{n} grid")
 
         if grid[0][0] != 0 or grid[n - 1][n - 1] != 0:
             tracer.log("Start or end blocked!")
-            snap(4, "Blocked: return -1")
-            return steps
+            yield snap(4, "Blocked: return -1")
+            return
 
         queue: deque[tuple[int, int, int]] = deque([(0, 0, 1)])
         grid[0][0] = 1
         tracer.patch(0, 0)
         tracer.log("Start BFS from (0,0), path length = 1")
-        snap(7, "Start at (0,0)")
+        yield snap(7, "Start at (0,0)")
 
         dirs = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
 
@@ -138,11 +150,11 @@ Interview Tip: Always check the start and end cells first — if either is block
 
             tracer.deselect_all()
             tracer.select(r, c)
-            snap(13, f"Process ({r},{c}), dist={d}")
+            yield snap(13, f"Process ({r},{c}), dist={d}")
 
             if r == n - 1 and c == n - 1:
                 tracer.log(f"Reached target! Path length = {d}")
-                snap(15, f"Target reached! Path = {d}")
+                yield snap(15, f"Target reached! Path = {d}")
                 result = d
                 break
 
@@ -155,10 +167,9 @@ Interview Tip: Always check the start and end cells first — if either is block
                     tracer.set_value(nr, nc, str(1))
                     tracer.patch(nr, nc)
                     tracer.log(f"  Enqueue ({nr},{nc}), dist={d + 1}")
-                    snap(20, f"Enqueue ({nr},{nc}), dist={d+1}")
+                    yield snap(20, f"Enqueue ({nr},{nc}), dist={d+1}")
 
         tracer.deselect_all()
         if result == -1:
             tracer.log("No path found!")
-            snap(20, "No path: return -1")
-        return steps
+            yield snap(20, "No path: return -1")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -77,6 +78,10 @@ class SurroundedRegions(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(n, {"grid": random_grid(n, ["X", "O"], [6, 4], seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Capture all 'O' regions that are completely surrounded by 'X'. Key insight: instead of finding surrounded regions directly, find the UN-surrounded ones. Any 'O' connected to the border cannot be captured. DFS/BFS from all border 'O's, mark them safe, then flip all remaining 'O's to 'X'.
@@ -91,8 +96,6 @@ Interview Tip: The "think in reverse" pattern appears in many grid problems. Sta
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
-
         grids = {
             1: [
                 ["X", "X", "X", "X", "O", "X", "X"],
@@ -105,7 +108,7 @@ Interview Tip: The "think in reverse" pattern appears in many grid problems. Sta
             ],
         }
 
-        board = [row[:] for row in grids.get(grid_id, grids[1])]
+        board = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         m, n = len(board), len(board[0])
 
         tracer = Board2DTracer(m, n)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
+import random
+
 from core.step import Step
 from core.tracer import AuxPanelTracer, Board2DTracer, combine_step
+from problems._inputs import GRID_SIZES
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -90,6 +95,15 @@ class SwimInRisingWater(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for n in GRID_SIZES:
+            # Elevations are a permutation of 0 .. n*n - 1.
+            cells = random.Random(n).sample(range(n * n), n * n)
+            inputs.append((n, {"grid": [cells[r * n:(r + 1) * n] for r in range(n)]}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find the minimum time to swim from top-left to bottom-right, where time t lets you traverse any cell with elevation ≤ t. This is a shortest-path variant: use Dijkstra's (or binary search + BFS) where the "distance" to each cell is the maximum elevation along the path to it.
@@ -104,6 +118,10 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
+        return list(SwimInRisingWater.iter_steps(**kwargs))
+
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         preset = int(kwargs.get("preset", 1))
 
         presets = {
@@ -118,7 +136,7 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
             ],
         }
 
-        grid = presets.get(preset, presets[1])
+        grid = kwargs.get("grid") or presets.get(preset, presets[1])
         n = len(grid)
         total = n * n
 
@@ -128,10 +146,9 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
         board = Board2DTracer(n, n)
         aux = AuxPanelTracer()
         aux.add_panel("Time")
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(combine_step(board.snapshot(line, desc), aux))
+        def snap(line: int, desc: str = "") -> Step:
+            return combine_step(board.snapshot(line, desc), aux)
 
         def find(x: int) -> int:
             if parent[x] != x:
@@ -161,7 +178,7 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
 
         aux.set_items("Time", [("Water Level", "0")])
         board.log(f"Grid: {n}x{n}, swim from (0,0) to ({n-1},{n-1})")
-        snap(1, f"{n}x{n} grid, elevation values 0-{total - 1}")
+        yield snap(1, f"{n}x{n} grid, elevation values 0-{total - 1}")
 
         # Process cells in order of elevation
         underwater: set[tuple[int, int]] = set()
@@ -175,7 +192,7 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
             board.deselect_all()
             board.select(r, c)
             board.log(f"t={t}: cell ({r},{c}) now underwater")
-            snap(26, f"t={t}: cell ({r},{c}) elevation={t}")
+            yield snap(26, f"t={t}: cell ({r},{c}) elevation={t}")
 
             # Mark cell as underwater (patched)
             underwater.add((r, c))
@@ -192,7 +209,7 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
             if find(0) == find((n - 1) * n + (n - 1)):
                 answer = t
                 board.log(f"  Connected! (0,0) and ({n-1},{n-1}) in same component")
-                snap(33, f"t={t}: path found!")
+                yield snap(33, f"t={t}: path found!")
 
                 # Trace the path by marking connected cells
                 start_root = find(0)
@@ -202,7 +219,7 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
                             board.mark_on_path(pr, pc)
 
                 board.log(f"Answer: t = {answer}")
-                snap(34, f"Minimum time = {answer}")
+                yield snap(34, f"Minimum time = {answer}")
                 break
             else:
                 board.deselect(r, c)
@@ -210,6 +227,5 @@ Interview Tip: Three approaches work: Dijkstra's (most natural), binary search +
         if answer == -1:
             answer = total - 1
             board.log(f"Answer: t = {answer}")
-            snap(32, f"Minimum time = {answer}")
+            yield snap(32, f"Minimum time = {answer}")
 
-        return steps
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from core.step import Step
-from core.tracer import AuxPanelTracer, GraphTracer, combine_step
+from core.tracer import FORCE_LAYOUT_MIN_NODES, AuxPanelTracer, GraphTracer, combine_step
+from problems._inputs import GRAPH_SIZES, random_graph
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -99,6 +100,10 @@ class TarjanSCC(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(v, {"n": v, "edges": random_graph(v, 2 * v, seed=v, directed=True)}) for v in GRAPH_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Tarjan's algorithm finds all Strongly Connected Components (SCCs) in a directed graph using a single DFS. It maintains a discovery time and a low-link value for each node. Nodes are pushed onto a stack during DFS and popped as complete SCCs when a root node is found.
@@ -134,6 +139,8 @@ Interview Tip: Tarjan's finds SCCs in one pass (vs. Kosaraju's two passes). The
         }
 
         n, edges = presets.get(preset, presets[1])
+        if "edges" in kwargs:
+            n, edges = int(kwargs["n"]), kwargs["edges"]
         adj: list[list[int]] = [[] for _ in range(n)]
         for u, v in edges:
             adj[u].append(v)
@@ -149,6 +156,8 @@ Interview Tip: Tarjan's finds SCCs in one pass (vs. Kosaraju's two passes). The
         # Add edges to graph
         for u, v in edges:
             graph.add_edge(u, v)
+        if n > FORCE_LAYOUT_MIN_NODES:
+            graph.set_force_layout()
 
         edge_str = ", ".join(f"{u}->{v}" for u, v in edges)
         graph.log(f"Directed graph: {n} nodes, edges: {edge_str}")
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -66,6 +69,10 @@ class UniquePaths(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(n, {"m": n, "n": n}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Count the number of unique paths from top-left to bottom-right of a grid, moving only right or down. Use dynamic programming: dp[i][j] = dp[i-1][j] + dp[i][j-1]. The first row and column are all 1's (only one way to reach them).
@@ -80,16 +87,17 @@ Interview Tip: Mention the math formula as an O(min(m,n)) alternative. If the in
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
+        return list(UniquePaths.iter_steps(**kwargs))
 
-        m, n = 7, 7
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
+        m, n = int(kwargs.get("m", 7)), int(kwargs.get("n", 7))
         dp = [[0] * n for _ in range(m)]
 
         tracer = Board2DTracer(m, n)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         # Initialize grid display
         for r in range(m):
@@ -97,7 +105,7 @@ Interview Tip: Mention the math formula as an O(min(m,n)) alternative. If the in
                 tracer.set_value(r, c, ".")
 
         tracer.log(f"Grid: {m}x{n}, count unique paths top-left to bottom-right")
-        snap(2, f"Initialize {m}x{n} DP grid")
+        yield snap(2, f"Initialize {m}x{n} DP grid")
 
         # Fill first column
         for i in range(m):
@@ -108,7 +116,7 @@ Interview Tip: Mention the math formula as an O(min(m,n)) alternative. If the in
             tracer.set_arrow(i, 0, "down" if i < m - 1 else "")
             tracer.patch(i, 0)
             tracer.log(f"dp[{i}][0] = 1 (only one way: straight down)")
-            snap(5, f"dp[{i}][0] = 1")
+            yield snap(5, f"dp[{i}][0] = 1")
 
         # Fill first row
         for j in range(1, n):
@@ -119,7 +127,7 @@ Interview Tip: Mention the math formula as an O(min(m,n)) alternative. If the in
             tracer.set_arrow(0, j, "right" if j < n - 1 else "")
             tracer.patch(0, j)
             tracer.log(f"dp[0][{j}] = 1 (only one way: straight right)")
-            snap(7, f"dp[0][{j}] = 1")
+            yield snap(7, f"dp[0][{j}] = 1")
 
         # Fill rest of the DP table
         for i in range(1, m):
@@ -131,7 +139,7 @@ Interview Tip: Mention the math formula as an O(min(m,n)) alternative. If the in
                 tracer.select(i - 1, j)
                 tracer.select(i, j - 1)
                 tracer.log(f"Computing dp[{i}][{j}] = dp[{i-1}][{j}] + dp[{i}][{j-1}]")
-                snap(13, f"dp[{i}][{j}] = dp[{i-1}][{j}]({dp[i-1][j]}) + dp[{i}][{j-1}]({dp[i][j-1]})")
+                yield snap(13, f"dp[{i}][{j}] = dp[{i-1}][{j}]({dp[i-1][j]}) + dp[{i}][{j-1}]({dp[i][j-1]})")
 
                 dp[i][j] = dp[i - 1][j] + dp[i][j - 1]
 
@@ -140,7 +148,7 @@ Interview Tip: Mention the math formula as an O(min(m,n)) alternative. If the in
                 tracer.set_overlay(i, j, str(dp[i][j]))
                 tracer.patch(i, j)
                 tracer.log(f"  dp[{i}][{j}] = {dp[i][j]}")
-                snap(13, f"dp[{i}][{j}] = {dp[i][j]}")
+                yield snap(13, f"dp[{i}][{j}] = {dp[i][j]}")
 
         # Trace one optimal path (always go right then down, or along edge)
         tracer.deselect_all()
@@ -170,6 +178,5 @@ Interview Tip: Mention the math formula as an O(min(m,n)) alternative. If the in
                     tracer.set_arrow(pr, pc, "right")
 
         tracer.log(f"Answer: {dp[m-1][n-1]} unique paths. One path highlighted.")
-        snap(13, f"Result: {dp[m-1][n-1]} unique paths")
+        yield snap(13, f"Result: {dp[m-1][n-1]} unique paths")
 
-        return steps
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from collections import deque
+from collections.abc import Iterator
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -72,6 +74,11 @@ class WallsAndGates(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # Empty rooms (INF), with some walls and a few gates.
+        return [(n, {"grid": random_grid(n, [2147483647, -1, 0], [80, 15, 5], seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Multi-source BFS from all gates simultaneously. Start by adding all gate positions (cells with value 0) to a queue, then BFS outward. Each empty room gets filled with its distance to the nearest gate on first visit.
@@ -86,7 +93,10 @@ Interview Tip: Single-source BFS from each gate would be O(M²N²). Multi-source
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
+        return list(WallsAndGates.iter_steps(**kwargs))
+
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         INF = 2147483647
 
         grids = {
@@ -101,14 +111,13 @@ Interview Tip: Single-source BFS from each gate would be O(M²N²). Multi-source
             ],
         }
 
-        rooms = [row[:] for row in grids.get(grid_id, grids[1])]
+        rooms = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         m, n = len(rooms), len(rooms[0])
 
         tracer = Board2DTracer(m, n)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         # Display: gates=0, walls=-1, rooms=INF shown as "."
         for r in range(m):
@@ -123,7 +132,7 @@ Interview Tip: Single-source BFS from each gate would be O(M²N²). Multi-source
                     tracer.set_value(r, c, ".")
 
         tracer.log(f"Rooms: {m}x{n} (0=gate, W=wall, .=empty)")
-        snap(4, f"Initialize {m}x{n} grid")
+        yield snap(4, f"Initialize {m}x{n} grid")
 
         queue: deque[tuple[int, int]] = deque()
         for i in range(m):
@@ -132,14 +141,14 @@ Interview Tip: Single-source BFS from each gate would be O(M²N²). Multi-source
                     queue.append((i, j))
 
         tracer.log(f"Gates found: {len(queue)}")
-        snap(11, f"{len(queue)} gates enqueued as BFS sources")
+        yield snap(11, f"{len(queue)} gates enqueued as BFS sources")
 
         while queue:
             r, c = queue.popleft()
 
             tracer.deselect_all()
             tracer.select(r, c)
-            snap(15, f"Process ({r},{c}), dist={rooms[r][c]}")
+            yield snap(15, f"Process ({r},{c}), dist={rooms[r][c]}")
 
             for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
                 nr, nc = r + dr, c + dc
@@ -150,11 +159,10 @@ Interview Tip: Single-source BFS from each gate would be O(M²N²). Multi-source
                     tracer.set_value(nr, nc, str(rooms[nr][nc]))
                     tracer.patch(nr, nc)
                     tracer.log(f"  Room ({nr},{nc}) = {rooms[nr][nc]}")
-                    snap(20, f"Room ({nr},{nc}) dist = {rooms[nr][nc]}")
+                    yield snap(20, f"Room ({nr},{nc}) dist = {rooms[nr][nc]}")
 
             tracer.deselect(r, c)
 
         tracer.deselect_all()
         tracer.log("All reachable rooms filled!")
-        snap(19, "All rooms filled with distances")
-        return steps
+        yield snap(19, "All rooms filled with distances")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -80,6 +81,11 @@ class WordSearch(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        # Worst case: the last letter is missing, so every prefix path is explored.
+        return [(n, {"grid": random_grid(n, "ABC", seed=n), "word": "ABCABD"}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Search for a word in a 2D grid by DFS with backtracking. From each cell matching the first character, explore all 4 directions recursively. Mark cells as visited during exploration and unmark when backtracking to allow other paths.
@@ -94,8 +100,6 @@ Interview Tip: Prune early — if the current cell doesn't match the expected ch
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
-
         grids = {
             1: (
                 [
@@ -111,7 +115,11 @@ Interview Tip: Prune early — if the current cell doesn't match the expected ch
             ),
         }
 
-        board_data, word = grids.get(grid_id, grids[1])
+        grid = kwargs.get("grid", 1)
+        if isinstance(grid, list):
+            board_data, word = grid, str(kwargs.get("word", ""))
+        else:
+            board_data, word = grids.get(int(grid), grids[1])
         board = [row[:] for row in board_data]
         m, n = len(board), len(board[0])
 
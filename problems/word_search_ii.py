@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import random
+
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -97,6 +100,15 @@ class WordSearchII(Problem):
     def default_params() -> dict[str, object]:
         return {"preset": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        inputs = []
+        for n in GRID_SIZES:
+            rng = random.Random(n)
+            words = ["".join(rng.choices("abcde", k=rng.randint(3, 6))) for _ in range(10)]
+            inputs.append((n, {"board": random_grid(n, "abcde", seed=n), "words": words}))
+        return inputs
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find all words from a dictionary that exist in the grid. Build a Trie from the word list, then DFS from every cell using the Trie to guide the search. This avoids redundant searches — shared prefixes are explored only once.
@@ -127,8 +139,8 @@ Interview Tip: This is a classic Trie + backtracking combination. Remember to re
         }
 
         data = presets.get(preset, presets[1])
-        board_data = data["board"]
-        words = data["words"]
+        board_data = kwargs.get("board") or data["board"]
+        words = kwargs.get("words") or data["words"]
         m = len(board_data)
         n = len(board_data[0])
         board = [row[:] for row in board_data]
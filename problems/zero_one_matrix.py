@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from collections import deque
+from collections.abc import Iterator
 
 from core.step import Step
 from core.tracer import Board2DTracer
+from problems._inputs import GRID_SIZES, pick, random_grid
 from problems.base_problem import Problem
 
 _SOURCE = """\
@@ -77,6 +79,10 @@ class ZeroOneMatrix(Problem):
     def default_params() -> dict[str, object]:
         return {"grid": 1}
 
+    @staticmethod
+    def scaling_inputs() -> list[tuple[int, dict[str, object]]]:
+        return [(n, {"grid": random_grid(n, [0, 1], [3, 7], seed=n)}) for n in GRID_SIZES]
+
     @staticmethod
     def theory() -> str:
         return """Approach: Find the distance of each cell to the nearest 0 in a binary matrix. Use multi-source BFS: start from all 0-cells simultaneously and expand outward. Each cell's distance is set when first reached by the BFS wavefront.
@@ -91,8 +97,10 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
 
     @staticmethod
     def generate_steps(**kwargs: object) -> list[Step]:
-        grid_id = int(kwargs.get("grid", 1))
+        return list(ZeroOneMatrix.iter_steps(**kwargs))
 
+    @staticmethod
+    def iter_steps(**kwargs: object) -> Iterator[Step]:
         grids = {
             1: [
                 [1, 1, 1, 0, 1, 1, 1],
@@ -105,16 +113,15 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
             ],
         }
 
-        mat = [row[:] for row in grids.get(grid_id, grids[1])]
+        mat = [row[:] for row in pick(kwargs.get("grid", 1), grids)]
         m, n = len(mat), len(mat[0])
         INF = float("inf")
         dist = [[INF] * n for _ in range(m)]
 
         tracer = Board2DTracer(m, n)
-        steps: list[Step] = []
 
-        def snap(line: int, desc: str = "") -> None:
-            steps.append(tracer.snapshot(line, desc))
+        def snap(line: int, desc: str = "") -> Step:
+            return tracer.snapshot(line, desc)
 
         # Initialize display
         for r in range(m):
@@ -122,7 +129,7 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
                 tracer.set_value(r, c, str(mat[r][c]))
 
         tracer.log(f"Matrix: {m}x{n} binary. Find distance to nearest 0.")
-        snap(2, f"Initialize {m}x{n} binary matrix")
+        yield snap(2, f"Initialize {m}x{n} binary matrix")
 
         # Enqueue all zero cells
         queue: deque[tuple[int, int]] = deque()
@@ -137,7 +144,7 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
                     zero_count += 1
 
         tracer.log(f"Found {zero_count} zero cells as BFS sources")
-        snap(10, f"{zero_count} zero cells enqueued (dist=0)")
+        yield snap(10, f"{zero_count} zero cells enqueued (dist=0)")
 
         # BFS: expand level by level
         level = 0
@@ -151,7 +158,7 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
 
                 tracer.deselect_all()
                 tracer.select(r, c)
-                snap(14, f"Process ({r},{c}), dist={dist[r][c]}")
+                yield snap(14, f"Process ({r},{c}), dist={dist[r][c]}")
 
                 for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
                     nr, nc = r + dr, c + dc
@@ -168,7 +175,7 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
                             tracer.log(
                                 f"  ({nr},{nc}) dist = {dist[nr][nc]}"
                             )
-                            snap(
+                            yield snap(
                                 19,
                                 f"({nr},{nc}) distance = {dist[nr][nc]}",
                             )
@@ -180,7 +187,7 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
 
             if level_cells:
                 tracer.deselect_all()
-                snap(21, f"Level {dist[level_cells[0][0]][level_cells[0][1]]} complete: {len(level_cells)} cells")
+                yield snap(21, f"Level {dist[level_cells[0][0]][level_cells[0][1]]} complete: {len(level_cells)} cells")
 
         # Final summary
         tracer.deselect_all()
@@ -191,6 +198,5 @@ Interview Tip: DP also works (two passes: top-left to bottom-right, then bottom-
                     max_dist = int(dist[r][c])
 
         tracer.log(f"All distances computed. Max distance = {max_dist}")
-        snap(21, f"Complete. Max distance to nearest 0 = {max_dist}")
+        yield snap(21, f"Complete. Max distance to nearest 0 = {max_dist}")
 
-        return steps
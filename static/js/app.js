@@ -45,6 +45,10 @@ document.addEventListener('DOMContentLoaded', () => {
     const codePanel = new CodePanel(codeDisplay);
     const auxContainer = document.getElementById('aux-panel-container');
     const auxRenderer = new AuxPanelRenderer(auxContainer);
+    // Run-level log for `log_timeline` payloads; steps only carry cursors.
+    let runLog = null;
+    let runLogWindow = 50;
+    let activeStream = null;        // AbortController for a streamed run still arriving
 
     // --- Player ---
     const player = new Player((step, index, total, isPlaying) => {
@@ -59,9 +63,15 @@ document.addEventListener('DOMContentLoaded', () => {
         progressFill.style.width = pct + '%';
         btnPlay.textContent = isPlaying ? '\u23F8' : '\u25B6';
         btnPlay.classList.toggle('playing', isPlaying);
-        updateLog(step.log_messages || []);
+        updateLog(stepLog(step));
     });
 
+    function stepLog(step) {
+        if (!runLog || step.log_end === undefined) return step.log_messages || [];
+        const start = step.log_start ?? Math.max(0, step.log_end - runLogWindow);
+        return runLog.slice(start, step.log_end);
+    }
+
     function updateLog(messages) {
         logContent.innerHTML = '';
         const toShow = messages.slice(-50);
@@ -288,6 +298,34 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // --- Run problem ---
+    function startRun(name, data) {
+        // Switch to viz screen
+        currentProblemName.textContent = name;
+        showViz();
+
+        // Set up renderer
+        if (data.renderer_type === 'board') {
+            currentRenderer = new BoardRenderer(canvas, data.board_tables);
+        } else if (data.renderer_type === 'array') {
+            currentRenderer = new ArrayRenderer(canvas);
+        } else if (data.renderer_type === 'graph') {
+            currentRenderer = new GraphRenderer(canvas, data.header);
+        } else if (data.renderer_type === 'dsu') {
+            currentRenderer = new DSURenderer(canvas);
+        } else if (data.renderer_type === 'trie') {
+            currentRenderer = new TrieRenderer(canvas, data.header);
+        }
+
+        runLog = data.log || null;
+        runLogWindow = data.log_window || 50;
+
+        // Load code
+        codePanel.loadCode(data.source_code);
+
+        // Load problem content (question + theory)
+        loadProblemPanel(selectedProblem);
+    }
+
     async function runProblem() {
         if (!selectedProblem) return;
 
@@ -297,50 +335,77 @@ document.addEventListener('DOMContentLoaded', () => {
         visualizeBtn.textContent = '...';
         visualizeBtn.disabled = true;
 
+        // A newer run replaces any stream that is still arriving.
+        if (activeStream) activeStream.abort();
+        const controller = new AbortController();
+        activeStream = controller;
+
         try {
+            // `?wire=binary` opts into the binary step format (see wire.js) and
+            // `?paged=1` into server-side paging (PagedSteps); otherwise the run
+            // is streamed so playback starts on the first chunk.
+            const query = new URLSearchParams(window.location.search);
+            const useBinary = query.get('wire') === 'binary';
+            const usePaged = !useBinary && query.get('paged') === '1';
+            const headers = { 'Content-Type': 'application/json' };
+            if (useBinary) headers.Accept = WIRE_MEDIA_TYPE;
             const res = await fetch('/api/run', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ problem: name, params, compact: true }),
+                headers,
+                signal: controller.signal,
+                body: JSON.stringify({
+                    problem: name,
+                    params,
+                    compact: true,
+                    delta: true,
+                    header: true,
+                    board_format: 'columnar',
+                    log_timeline: true,
+                    stream: !useBinary && !usePaged,
+                    paged: usePaged,
+                }),
             });
-            const data = await res.json();
 
-            if (data.error) {
-                alert(data.error);
+            if (res.ok && (res.headers.get('Content-Type') || '').startsWith('application/x-ndjson')) {
+                await readStreamedRun(res, async run => {
+                    startRun(name, run);
+                    player.load(run.encoding === 'delta' ? new DeltaFrames([]) : [], false);
+                    visualizeBtn.textContent = 'Visualize';
+                    visualizeBtn.disabled = false;
+                    // Wait a frame so the canvas has layout dimensions
+                    await new Promise(resolve => requestAnimationFrame(resolve));
+                }, items => player.append(items));
+                player.finish();
                 return;
             }
 
-            // Switch to viz screen
-            currentProblemName.textContent = name;
-            showViz();
-
-            // Set up renderer
-            if (data.renderer_type === 'board') {
-                currentRenderer = new BoardRenderer(canvas);
-            } else if (data.renderer_type === 'array') {
-                currentRenderer = new ArrayRenderer(canvas);
-            } else if (data.renderer_type === 'graph') {
-                currentRenderer = new GraphRenderer(canvas);
-            } else if (data.renderer_type === 'dsu') {
-                currentRenderer = new DSURenderer(canvas);
-            } else if (data.renderer_type === 'trie') {
-                currentRenderer = new TrieRenderer(canvas);
+            const data = useBinary && res.ok
+                ? decodeWireRun(await res.arrayBuffer())
+                : await res.json();
+
+            if (data.error) {
+                alert(data.error);
+                return;
             }
 
-            // Load code
-            codePanel.loadCode(data.source_code);
+            startRun(name, data);
 
-            // Load problem content (question + theory)
-            loadProblemPanel(selectedProblem);
+            let source = data.frames ? new DeltaFrames(data.frames) : data.steps;
+            if (data.run_id) {
+                source = new PagedSteps(data.run_id, data.step_count, data.page_size);
+                source.onLoad = () => player.notify();
+            }
 
             // Wait a frame so the canvas has layout dimensions
             requestAnimationFrame(() => {
-                player.load(data.steps);
+                player.load(source);
             });
         } catch (err) {
+            if (err.name === 'AbortError') return;
             console.error('Run error:', err);
             alert('Error running problem: ' + err.message);
         } finally {
+            if (activeStream === controller) activeStream = null;
             visualizeBtn.textContent = 'Visualize';
             visualizeBtn.disabled = false;
         }
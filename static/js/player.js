@@ -1,6 +1,133 @@
+// Rebuilds full steps from a delta-encoded run: {k: step} keyframes and
+// {d: {key: op}, x: [removed]} diffs against the previous step (see
+// core/encoding.py for the op format). Materialized steps share unchanged
+// rows/lists with their predecessor, so caching them stays cheap.
+function applyDeltaOp(prev, op) {
+    switch (op[0]) {
+        case '=':
+            return op[1];
+        case 'T':
+            return prev.slice(op[1]).concat(op[2]);
+        case 'L': {
+            const out = prev.slice();
+            const patch = op[1];
+            for (let j = 0; j < patch.length; j += 2) {
+                out[patch[j]] = applyDeltaOp(prev[patch[j]], patch[j + 1]);
+            }
+            return out;
+        }
+        case 'O':
+            return applyDeltaPatch(prev, op[1], op[2]);
+    }
+    return prev;
+}
+
+function applyDeltaPatch(prev, changed, removed) {
+    const out = Object.assign({}, prev);
+    for (const key in changed) {
+        out[key] = applyDeltaOp(prev ? prev[key] : undefined, changed[key]);
+    }
+    (removed || []).forEach(key => { delete out[key]; });
+    return out;
+}
+
+class DeltaFrames {
+    constructor(frames) {
+        this.frames = frames;
+        this._cache = new Array(frames.length);
+    }
+
+    get length() {
+        return this.frames.length;
+    }
+
+    append(frames) {
+        for (let i = 0; i < frames.length; i++) this.frames.push(frames[i]);
+    }
+
+    get(index) {
+        if (this._cache[index] !== undefined) return this._cache[index];
+        let start = index;
+        while (start > 0 && this._cache[start] === undefined && !this.frames[start].k) {
+            start--;
+        }
+        let step = this._cache[start] !== undefined ? this._cache[start] : this.frames[start].k;
+        this._cache[start] = step;
+        for (let i = start + 1; i <= index; i++) {
+            const frame = this.frames[i];
+            step = frame.k || applyDeltaPatch(step, frame.d, frame.x);
+            this._cache[i] = step;
+        }
+        return step;
+    }
+}
+
+// Random-access view of a paged run (`paged: true`): fetches pages from
+// /api/run/<run_id>/steps around the requested index and keeps only the
+// `maxPages` most recently used ones. get() returns null until the page
+// arrives; `onLoad` is called then so the player can re-render.
+class PagedSteps {
+    constructor(runId, stepCount, pageSize = 256, maxPages = 8) {
+        this.runId = runId;
+        this.stepCount = stepCount;
+        this.pageSize = pageSize;
+        this.maxPages = maxPages;
+        this.pages = new Map();     // page number -> steps array or DeltaFrames, in LRU order
+        this.pending = new Set();
+        this.onLoad = null;
+    }
+
+    get length() {
+        return this.stepCount;
+    }
+
+    get(index) {
+        const page = Math.floor(index / this.pageSize);
+        const steps = this._page(page);
+        // Prefetch the next page once playback is halfway through this one.
+        if (index % this.pageSize >= this.pageSize / 2) this._page(page + 1);
+        if (!steps) return null;
+        const offset = index - page * this.pageSize;
+        return Array.isArray(steps) ? steps[offset] : steps.get(offset);
+    }
+
+    _page(page) {
+        if (page * this.pageSize >= this.stepCount) return null;
+        const steps = this.pages.get(page);
+        if (steps) {
+            this.pages.delete(page);
+            this.pages.set(page, steps);
+            return steps;
+        }
+        this._fetch(page);
+        return null;
+    }
+
+    async _fetch(page) {
+        if (this.pending.has(page)) return;
+        this.pending.add(page);
+        const from = page * this.pageSize;
+        try {
+            const res = await fetch(`/api/run/${this.runId}/steps?from=${from}&to=${from + this.pageSize}`);
+            const data = await res.json();
+            if (data.error) throw new Error(data.error);
+            this.pages.set(page, data.frames ? new DeltaFrames(data.frames) : data.steps);
+            while (this.pages.size > this.maxPages) {
+                this.pages.delete(this.pages.keys().next().value);
+            }
+            if (this.onLoad) this.onLoad(page);
+        } catch (err) {
+            console.error('Page load error:', err);
+        } finally {
+            this.pending.delete(page);
+        }
+    }
+}
+
 class Player {
     constructor(onStepChanged) {
         this.steps = [];
+        this.complete = true;           // false while a streamed run is still arriving
         this.currentIndex = 0;
         this.isPlaying = false;
         this.intervalId = null;
@@ -11,16 +138,34 @@ class Player {
         this._rangeTarget = undefined;
     }
 
-    load(steps) {
+    // `steps` is a plain array, a DeltaFrames or a PagedSteps instance. Pass
+    // `complete = false` for a streamed run, then append() chunks as they
+    // arrive and finish() once the stream ends.
+    load(steps, complete = true) {
         this.pause();
         this.steps = steps;
+        this.complete = complete;
         this.currentIndex = 0;
         this.notify();
     }
 
+    append(items) {
+        if (Array.isArray(this.steps)) {
+            for (let i = 0; i < items.length; i++) this.steps.push(items[i]);
+        } else {
+            this.steps.append(items);
+        }
+        this.notify();
+    }
+
+    finish() {
+        this.complete = true;
+        this.notify();
+    }
+
     play() {
         if (this.steps.length === 0) return;
-        if (this.currentIndex >= this.steps.length - 1) {
+        if (this.complete && this.currentIndex >= this.steps.length - 1) {
             this.currentIndex = 0;
         }
         this.isPlaying = true;
@@ -93,9 +238,10 @@ class Player {
         if (this.currentIndex < this.steps.length - 1) {
             this.currentIndex++;
             this.notify();
-        } else {
+        } else if (this.complete) {
             this.pause();
         }
+        // Otherwise keep ticking until the next streamed chunk arrives.
     }
 
     playRange(fromIndex, toIndex) {
@@ -126,10 +272,17 @@ class Player {
         }
     }
 
+    _stepAt(index) {
+        return Array.isArray(this.steps) ? this.steps[index] : this.steps.get(index);
+    }
+
     notify() {
         if (this.steps.length > 0) {
+            const step = this._stepAt(this.currentIndex);
+            // A paged source returns null until the page arrives, then re-notifies.
+            if (!step) return;
             this.onStepChanged(
-                this.steps[this.currentIndex],
+                step,
                 this.currentIndex,
                 this.steps.length,
                 this.isPlaying
@@ -141,6 +294,6 @@ class Player {
     }
 
     get currentStep() {
-        return this.steps.length > 0 ? this.steps[this.currentIndex] : null;
+        return this.steps.length > 0 ? this._stepAt(this.currentIndex) : null;
     }
 }
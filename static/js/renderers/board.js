@@ -1,11 +1,79 @@
 class BoardRenderer {
-    constructor(canvas) {
+    // `tables` is the run's `board_tables` when it was requested with
+    // `board_format: 'columnar'`; see ColumnarBoard in core/encoding.py.
+    constructor(canvas, tables = null) {
         this.canvas = canvas;
         this.ctx = canvas.getContext('2d');
+        this.tables = tables;
+        this._decoded = new WeakMap();
+    }
+
+    _decodeBase64(b64) {
+        if (!b64) return null;
+        const raw = atob(b64);
+        const bytes = new Uint8Array(raw.length);
+        for (let i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+        return bytes;
+    }
+
+    _decodeValues(board) {
+        if (typeof board.values !== 'string') return board.values;
+        const bytes = this._decodeBase64(board.values);
+        const view = new DataView(bytes.buffer);
+        const width = board.value_width || 1;
+        const out = new Array(bytes.length / width);
+        for (let i = 0; i < out.length; i++) {
+            if (width === 1) out[i] = bytes[i];
+            else if (width === 2) out[i] = view.getUint16(i * 2, true);
+            else out[i] = view.getUint32(i * 4, true);
+        }
+        return out;
+    }
+
+    // Expand a columnar board into rows of cell objects (cached per board).
+    _cells(board) {
+        if (Array.isArray(board)) return board;
+        const cached = this._decoded.get(board);
+        if (cached) return cached;
+
+        const values = this.tables.values;
+        const strings = this.tables.strings;
+        const indices = this._decodeValues(board);
+        const grid = [];
+        const cells = [];
+        for (let r = 0; r < board.rows; r++) {
+            const row = [];
+            for (let c = 0; c < board.cols; c++) {
+                const cell = {
+                    value: values[indices[r * board.cols + c]],
+                    overlay_text: '',
+                    overlay_color: '',
+                    arrow_dir: '',
+                };
+                row.push(cell);
+                cells.push(cell);
+            }
+            grid.push(row);
+        }
+        ['selected', 'patched', 'error', 'on_path'].forEach(plane => {
+            const bits = this._decodeBase64(board[plane]);
+            cells.forEach((cell, i) => {
+                cell[plane] = bits ? ((bits[i >> 3] >> (i & 7)) & 1) === 1 : false;
+            });
+        });
+        ['overlay_text', 'overlay_color', 'arrow_dir'].forEach(plane => {
+            const pairs = board[plane] || [];
+            for (let j = 0; j < pairs.length; j += 2) {
+                cells[pairs[j]][plane] = strings[pairs[j + 1]];
+            }
+        });
+        this._decoded.set(board, grid);
+        return grid;
     }
 
     render(step) {
         if (!step.board) return;
+        const board = this._cells(step.board);
 
         const canvas = this.canvas;
         const ctx = this.ctx;
@@ -23,8 +91,8 @@ class BoardRenderer {
         // Clear
         ctx.clearRect(0, 0, W, H);
 
-        const rows = step.board.length;
-        const cols = step.board[0].length;
+        const rows = board.length;
+        const cols = board[0].length;
 
         // Calculate cell size
         const maxCellSize = 72;
@@ -56,7 +124,7 @@ class BoardRenderer {
         };
 
         // Detect mode: string values = grid problem, integer values = chess/queen
-        const isGridProblem = step.board.some(row =>
+        const isGridProblem = board.some(row =>
             row.some(c => typeof c.value === 'string')
         );
 
@@ -86,7 +154,7 @@ class BoardRenderer {
         // Draw cells
         for (let r = 0; r < rows; r++) {
             for (let c = 0; c < cols; c++) {
-                const cell = step.board[r][c];
+                const cell = board[r][c];
                 const x = offsetX + c * cellSize;
                 const y = offsetY + r * cellSize;
 
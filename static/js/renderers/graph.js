@@ -1,7 +1,16 @@
 class GraphRenderer {
-    constructor(canvas) {
+    // `header` holds run-level graph_nodes/graph_edges tables when the run was
+    // requested with `header: true`; steps then reference rows by `n`/`e`.
+    constructor(canvas, header = null) {
         this.canvas = canvas;
         this.ctx = canvas.getContext('2d');
+        this.header = header;
+    }
+
+    _resolve(items, table, key) {
+        const rows = this.header && this.header[table];
+        if (!rows) return items;
+        return items.map(item => (key in item ? Object.assign({}, rows[item[key]], item) : item));
     }
 
     render(step) {
@@ -21,8 +30,8 @@ class GraphRenderer {
         const H = rect.height;
         ctx.clearRect(0, 0, W, H);
 
-        const nodes = step.graph_nodes;
-        const edges = step.graph_edges || [];
+        const nodes = this._resolve(step.graph_nodes, 'graph_nodes', 'n');
+        const edges = this._resolve(step.graph_edges || [], 'graph_edges', 'e');
 
         // Layout: nodes have x,y in 0..1 range, map to canvas
         const padding = 60;
@@ -1,7 +1,16 @@
 class TrieRenderer {
-    constructor(canvas) {
+    // `header` holds run-level trie_nodes/trie_edges tables when the run was
+    // requested with `header: true`; steps then reference rows by `n`/`e`.
+    constructor(canvas, header = null) {
         this.canvas = canvas;
         this.ctx = canvas.getContext('2d');
+        this.header = header;
+    }
+
+    _resolve(items, table, key) {
+        const rows = this.header && this.header[table];
+        if (!rows) return items;
+        return items.map(item => (key in item ? Object.assign({}, rows[item[key]], item) : item));
     }
 
     render(step) {
@@ -20,8 +29,8 @@ class TrieRenderer {
         const H = rect.height;
         ctx.clearRect(0, 0, W, H);
 
-        const nodes = step.trie_nodes;
-        const edges = step.trie_edges || [];
+        const nodes = this._resolve(step.trie_nodes, 'trie_nodes', 'n');
+        const edges = this._resolve(step.trie_edges || [], 'trie_edges', 'e');
 
         const padding = 40;
         const areaW = W - padding * 2;
@@ -0,0 +1,62 @@
+// Reader for streamed runs (`stream: true`, served as application/x-ndjson
+// by main.py). The first line is the run metadata, then one line per chunk
+// of steps/frames plus the header, board-table and log rows that chunk
+// introduced, then {done, step_count} (or {error}). Run-level tables are
+// appended in place, so renderers holding them see new rows as they arrive.
+async function readNdjson(response, onLine) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        let newline;
+        while ((newline = buffered.indexOf('\n')) >= 0) {
+            const line = buffered.slice(0, newline);
+            buffered = buffered.slice(newline + 1);
+            if (line) await onLine(JSON.parse(line));
+        }
+    }
+    buffered += decoder.decode();
+    if (buffered.trim()) await onLine(JSON.parse(buffered));
+}
+
+function appendRows(target, rows) {
+    for (let i = 0; i < rows.length; i++) target.push(rows[i]);
+}
+
+// Merge a chunk's run-level rows into `run` and return its steps/frames.
+function mergeRunChunk(run, chunk) {
+    for (const table in chunk.header || {}) {
+        if (!run.header[table]) run.header[table] = [];
+        appendRows(run.header[table], chunk.header[table]);
+    }
+    for (const table in chunk.board_tables || {}) {
+        if (!run.board_tables[table]) run.board_tables[table] = [];
+        appendRows(run.board_tables[table], chunk.board_tables[table]);
+    }
+    if (chunk.log) appendRows(run.log, chunk.log);
+    return chunk.frames || chunk.steps || [];
+}
+
+// Read a streamed run. `onMeta(run)` is called once with the metadata (and
+// empty tables) before any steps; `onItems(items)` for each chunk's
+// steps/frames; resolves with the final step count.
+async function readStreamedRun(response, onMeta, onItems) {
+    let run = null;
+    let stepCount = null;
+    await readNdjson(response, async line => {
+        if (line.error) throw new Error(line.error);
+        if (run === null) {
+            run = Object.assign({ header: {}, board_tables: {}, log: [] }, line);
+            await onMeta(run);
+        } else if (line.done) {
+            stepCount = line.step_count;
+        } else {
+            onItems(mergeRunChunk(run, line));
+        }
+    });
+    if (stepCount === null) throw new Error('Stream ended early');
+    return stepCount;
+}
@@ -0,0 +1,245 @@
+// Decoder for the binary step format produced by core/wire.py
+// (served for `Accept: application/vnd.algoviz.steps`). Produces the same
+// step objects the JSON path returns, so renderers are unaffected.
+const WIRE_MEDIA_TYPE = 'application/vnd.algoviz.steps';
+
+class WireReader {
+    constructor(buffer) {
+        this.view = new DataView(buffer);
+        this.bytes = new Uint8Array(buffer);
+        this.offset = 0;
+        this.strings = [''];
+    }
+
+    u8() {
+        return this.view.getUint8(this.offset++);
+    }
+
+    u16() {
+        const v = this.view.getUint16(this.offset, true);
+        this.offset += 2;
+        return v;
+    }
+
+    u32() {
+        const v = this.view.getUint32(this.offset, true);
+        this.offset += 4;
+        return v;
+    }
+
+    tag() {
+        const t = String.fromCharCode(...this.bytes.subarray(this.offset, this.offset + 4));
+        this.offset += 4;
+        return t;
+    }
+
+    u8s(n) {
+        const out = this.bytes.subarray(this.offset, this.offset + n);
+        this.offset += n;
+        return out;
+    }
+
+    u32s(n) {
+        const out = new Array(n);
+        for (let i = 0; i < n; i++) out[i] = this.view.getUint32(this.offset + i * 4, true);
+        this.offset += n * 4;
+        return out;
+    }
+
+    i32s(n) {
+        const out = new Array(n);
+        for (let i = 0; i < n; i++) out[i] = this.view.getInt32(this.offset + i * 4, true);
+        this.offset += n * 4;
+        return out;
+    }
+
+    f64s(n) {
+        const out = new Array(n);
+        for (let i = 0; i < n; i++) out[i] = this.view.getFloat64(this.offset + i * 8, true);
+        this.offset += n * 8;
+        return out;
+    }
+
+    strs(n) {
+        return this.u32s(n).map(i => this.strings[i]);
+    }
+
+    values(n) {
+        const tags = this.u8s(n);
+        const nums = this.f64s(n);
+        const out = new Array(n);
+        for (let i = 0; i < n; i++) {
+            switch (tags[i]) {
+                case 0: out[i] = null; break;
+                case 1: out[i] = false; break;
+                case 2: out[i] = true; break;
+                case 3: out[i] = nums[i]; break;
+                case 4: out[i] = this.strings[nums[i]]; break;
+                case 5: out[i] = JSON.parse(this.strings[nums[i]]); break;
+            }
+        }
+        return out;
+    }
+}
+
+function wireFlags(flags) {
+    return { selected: (flags & 1) !== 0, patched: (flags & 2) !== 0, error: (flags & 4) !== 0 };
+}
+
+function readWireStep(r) {
+    const lineNumber = r.u32();
+    const description = r.strings[r.u32()];
+    const logCount = r.u32();
+    const step = {
+        line_number: lineNumber,
+        description,
+        log_messages: r.strs(logCount),
+    };
+    const presence = r.u8();
+
+    if (presence & 1) {
+        const rows = r.u32();
+        const cols = r.u32();
+        const n = rows * cols;
+        const values = r.values(n);
+        const flags = r.u8s(n);
+        const overlayText = r.strs(n);
+        const overlayColor = r.strs(n);
+        const arrowDir = r.strs(n);
+        step.board = [];
+        for (let row = 0; row < rows; row++) {
+            const cells = [];
+            for (let col = 0; col < cols; col++) {
+                const i = row * cols + col;
+                cells.push(Object.assign({ value: values[i] }, wireFlags(flags[i]), {
+                    on_path: (flags[i] & 8) !== 0,
+                    overlay_text: overlayText[i],
+                    overlay_color: overlayColor[i],
+                    arrow_dir: arrowDir[i],
+                }));
+            }
+            step.board.push(cells);
+        }
+    }
+    if (presence & 2) {
+        const n = r.u32();
+        const values = r.values(n);
+        const flags = r.u8s(n);
+        step.array = values.map((value, i) => Object.assign({ value }, wireFlags(flags[i])));
+    }
+    if (presence & 4) {
+        const n = r.u32();
+        const ids = r.values(n);
+        const labels = r.strs(n);
+        const flags = r.u8s(n);
+        const colors = r.strs(n);
+        const badges = r.strs(n);
+        const badgeColors = r.strs(n);
+        const xs = r.f64s(n);
+        const ys = r.f64s(n);
+        const groups = r.i32s(n);
+        step.graph_nodes = ids.map((id, i) => Object.assign({ id, label: labels[i] }, wireFlags(flags[i]), {
+            color: colors[i],
+            x: xs[i],
+            y: ys[i],
+            badge: badges[i],
+            badge_color: badgeColors[i],
+            group: (flags[i] & 8) ? groups[i] : null,
+        }));
+        const m = r.u32();
+        const sources = r.values(m);
+        const targets = r.values(m);
+        const edgeFlags = r.u8s(m);
+        const weights = r.f64s(m);
+        const edgeLabels = r.strs(m);
+        const classes = r.strs(m);
+        const curves = r.f64s(m);
+        step.graph_edges = sources.map((source, i) => Object.assign(
+            { source, target: targets[i] }, wireFlags(edgeFlags[i]), {
+                directed: (edgeFlags[i] & 8) !== 0,
+                weight: (edgeFlags[i] & 16) ? weights[i] : null,
+                label: edgeLabels[i],
+                edge_class: classes[i],
+                curve_offset: curves[i],
+            }));
+    }
+    if (presence & 8) {
+        const panels = r.u32();
+        step.aux_panels = [];
+        for (let p = 0; p < panels; p++) {
+            const title = r.strings[r.u32()];
+            const n = r.u32();
+            const labels = r.strs(n);
+            const values = r.values(n);
+            const flags = r.u8s(n);
+            step.aux_panels.push({
+                title,
+                items: labels.map((label, i) => Object.assign({ label, value: values[i] }, wireFlags(flags[i]))),
+            });
+        }
+    }
+    if (presence & 16) {
+        const n = r.u32();
+        const ids = r.values(n);
+        const labels = r.strs(n);
+        const parents = r.values(n);
+        const ranks = r.i32s(n);
+        const flags = r.u8s(n);
+        step.dsu_nodes = ids.map((id, i) => Object.assign(
+            { id, label: labels[i], parent_id: parents[i], rank: ranks[i] }, wireFlags(flags[i])));
+    }
+    if (presence & 32) {
+        const n = r.u32();
+        const ids = r.values(n);
+        const labels = r.strs(n);
+        const xs = r.f64s(n);
+        const ys = r.f64s(n);
+        const flags = r.u8s(n);
+        step.trie_nodes = ids.map((id, i) => Object.assign(
+            { id, label: labels[i], x: xs[i], y: ys[i] }, wireFlags(flags[i]), { is_end: (flags[i] & 8) !== 0 }));
+        const m = r.u32();
+        const sources = r.values(m);
+        const targets = r.values(m);
+        const edgeLabels = r.strs(m);
+        const edgeFlags = r.u8s(m);
+        step.trie_edges = sources.map((source, i) => Object.assign(
+            { source, target: targets[i], label: edgeLabels[i] }, wireFlags(edgeFlags[i])));
+    }
+    return step;
+}
+
+// Decode a full binary run into {source_code, renderer_type, ..., steps}.
+function decodeWireRun(buffer) {
+    const r = new WireReader(buffer);
+    if (r.tag() !== 'AVZB') throw new Error('Not an AVZB step payload');
+    const version = r.u16();
+    if (version !== 1) throw new Error(`Unsupported wire version ${version}`);
+    const sectionCount = r.u16();
+
+    let run = {};
+    let stepSection = null;
+    for (let s = 0; s < sectionCount; s++) {
+        const tag = r.tag();
+        const length = r.u32();
+        const end = r.offset + length;
+        if (tag === 'META') {
+            run = JSON.parse(new TextDecoder().decode(r.u8s(length)));
+        } else if (tag === 'STRS') {
+            const count = r.u32();
+            const lengths = r.u32s(count);
+            const decoder = new TextDecoder();
+            r.strings = lengths.map(len => decoder.decode(r.u8s(len)));
+        } else if (tag === 'STEP') {
+            stepSection = r.offset;
+        }
+        r.offset = end;
+    }
+
+    if (stepSection === null) throw new Error('Missing STEP section');
+    // STEP references the string table, so decode it after all sections.
+    r.offset = stepSection;
+    const count = r.u32();
+    run.steps = new Array(count);
+    for (let i = 0; i < count; i++) run.steps[i] = readWireStep(r);
+    return run;
+}
@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+import main
+from core.admission import AdmissionControl, AdmissionRejected
+from core.response_cache import ResponseCache
+from core.trace_store import TraceStore
+
+
+def test_full_queue_rejects_immediately():
+    admission = AdmissionControl(max_active=1, max_queued=0, queue_timeout=5)
+    admission.acquire()
+    with pytest.raises(AdmissionRejected) as exc:
+        admission.acquire()
+    assert exc.value.reason == "full"
+    assert exc.value.retry_after >= 1
+    assert admission.stats()["rejected"] == 1
+
+
+def test_queue_wait_times_out():
+    admission = AdmissionControl(max_active=1, max_queued=1, queue_timeout=0.05)
+    admission.acquire()
+    with pytest.raises(AdmissionRejected) as exc:
+        admission.acquire()
+    assert exc.value.reason == "timeout"
+    assert admission.stats()["timed_out"] == 1
+    assert admission.queued == 0
+
+
+def test_queued_caller_gets_released_slot():
+    admission = AdmissionControl(max_active=1, max_queued=1, queue_timeout=5)
+    admission.acquire()
+    waited = []
+    waiter = threading.Thread(target=lambda: waited.append(admission.acquire()))
+    waiter.start()
+    while admission.queued == 0:
+        time.sleep(0.001)
+    admission.release(0.01)
+    waiter.join(5)
+    assert len(waited) == 1
+    assert admission.active == 1
+    assert admission.stats()["admitted"] == 2
+
+
+def test_uncached_run_beyond_queue_gets_429(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "_admission", AdmissionControl(max_active=1, max_queued=0, queue_timeout=5))
+    monkeypatch.setattr(main, "_response_cache", ResponseCache(max_bytes=1 << 20))
+    monkeypatch.setattr(main, "_trace_store", TraceStore(str(tmp_path), max_bytes=1 << 20))
+    monkeypatch.setattr(main, "_baked", {})
+    main._admission.acquire()
+
+    response = main.app.test_client().post("/api/run", json={"problem": "Bellman-Ford Algorithm"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.get_json()["retry_after"] == int(response.headers["Retry-After"])
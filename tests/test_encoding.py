@@ -0,0 +1,47 @@
+from core.encoding import _tail_op, encode_delta
+
+
+def _apply(prev, op):
+    # Mirrors applyDeltaOp in static/js/player.js.
+    kind = op[0]
+    if kind == "=":
+        return op[1]
+    if kind == "T":
+        return prev[op[1]:] + op[2]
+    if kind == "L":
+        out = list(prev)
+        patch = op[1]
+        for i in range(0, len(patch), 2):
+            out[patch[i]] = _apply(prev[patch[i]], patch[i + 1])
+        return out
+    changed, removed = op[1], op[2]
+    out = {key: value for key, value in prev.items() if key not in removed}
+    for key, sub in changed.items():
+        out[key] = _apply(prev.get(key), sub)
+    return out
+
+
+def test_tail_op_append_only():
+    assert _tail_op(["a", "b"], ["a", "b", "c"]) == ["T", 0, ["c"]]
+    assert _tail_op(["a"], ["a", "b", "c"]) == ["T", 0, ["b", "c"]]
+
+
+def test_tail_op_drop_and_append():
+    assert _tail_op(["a", "b", "c"], ["b", "c", "d"]) == ["T", 1, ["d"]]
+    assert _tail_op(["a", "b", "c"], ["c", "d", "e", "f"]) == ["T", 2, ["d", "e", "f"]]
+
+
+def test_tail_op_rejects_unrelated_lists():
+    assert _tail_op(["a", "b"], ["x", "y", "z"]) is None
+    assert _tail_op([], ["a"]) is None
+
+
+def test_growing_list_is_sent_as_tail_ops():
+    steps = [{"log": [f"m{j}" for j in range(i + 1)], "n": i} for i in range(6)]
+    frames = encode_delta(steps, keyframe_interval=100)
+    assert frames[0] == {"k": steps[0]}
+    state = steps[0]
+    for step, frame in zip(steps[1:], frames[1:]):
+        assert frame["d"]["log"][0] == "T"
+        state = _apply(state, ["O", frame["d"], frame.get("x", [])])
+        assert state == step
@@ -0,0 +1,76 @@
+import gzip
+
+import brotli
+
+import main
+from core.admission import AdmissionControl
+from core.response_cache import CachedResponse, ResponseCache
+from core.trace_store import TraceStore
+
+
+def _entry(body: bytes) -> CachedResponse:
+    return CachedResponse.build(body, "application/json", 5, 6)
+
+
+def test_entry_decodes_in_each_encoding():
+    body = b'{"steps": [' + b"1, " * 500 + b"1]}"
+    entry = _entry(body)
+    assert brotli.decompress(entry.body("br")) == body
+    assert gzip.decompress(entry.body("gzip")) == body
+    assert entry.body(None) == body
+    assert entry.etag == _entry(body).etag != _entry(body + b" ").etag
+
+
+def test_lru_evicts_by_stored_size():
+    a, b, c = (_entry(bytes([i]) * 64) for i in range(3))
+    cache = ResponseCache(max_bytes=a.size + b.size)
+    cache.put("a", a)
+    cache.put("b", b)
+    assert cache.get("a") is a  # now most recently used
+    cache.put("c", c)
+    assert cache.get("b") is None
+    assert cache.get("a") is a and cache.get("c") is c
+
+
+def test_oversized_and_pinned_entries():
+    big = _entry(bytes(range(256)) * 64)
+    cache = ResponseCache(max_bytes=big.size - 1)
+    assert cache.put("big", big) is big
+    assert cache.get("big") is None
+
+    cache.pin("pinned", big)
+    cache.put("small", _entry(b"x"))
+    assert cache.get("pinned") is big
+    assert len(cache) == 2
+
+
+def test_etag_revalidation_returns_304(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "_admission", AdmissionControl(max_active=1, max_queued=0, queue_timeout=5))
+    monkeypatch.setattr(main, "_response_cache", ResponseCache(max_bytes=1 << 24))
+    monkeypatch.setattr(main, "_trace_store", TraceStore(str(tmp_path), max_bytes=1 << 24))
+    monkeypatch.setattr(main, "_baked", {})
+    monkeypatch.setattr(main, "_run_pool", None)
+    client = main.app.test_client()
+    request = {"problem": "Bellman-Ford Algorithm"}
+    headers = {"Accept-Encoding": "br"}
+
+    with client.post("/api/run", json=request, headers=headers) as miss:
+        assert miss.status_code == 200
+        assert miss.headers["X-Cache"] == "miss"
+        assert miss.headers["Content-Encoding"] == "br"
+        etag = miss.headers["ETag"]
+        body = brotli.decompress(miss.get_data())
+
+    with client.post("/api/run", json=request, headers=headers) as hit:
+        assert hit.headers["X-Cache"] == "hit"
+        assert hit.headers["ETag"] == etag
+        assert brotli.decompress(hit.get_data()) == body
+
+    with client.post("/api/run", json=request, headers={**headers, "If-None-Match": etag}) as fresh:
+        assert fresh.status_code == 304
+        assert fresh.get_data() == b""
+
+    # ETags are per encoding, so a gzip client's copy doesn't match the br one.
+    with client.post("/api/run", json=request, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}) as other:
+        assert other.status_code == 200
+        assert gzip.decompress(other.get_data()) == body
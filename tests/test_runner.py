@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from core.runner import (
+    RunBudgetExceeded,
+    RunLimits,
+    RunPool,
+    build_steps,
+    collect_steps,
+    load_problem,
+    run_limits_from_env,
+)
+
+PROBLEM = ("problems.bellman_ford", "BellmanFord")
+
+
+def _sleep(seconds, max_steps=None, progress=None):
+    progress.value = 3
+    time.sleep(seconds)
+
+
+def _count(n, max_steps=None, progress=None):
+    for i in range(n):
+        yield i
+    return n
+
+
+def _fail(max_steps=None, progress=None):
+    raise ValueError("bad input")
+
+
+def test_pool_matches_inline_run():
+    pool = RunPool(1, RunLimits(timeout=30))
+    steps = pool.run(build_steps, *PROBLEM, {})
+    inline = collect_steps(load_problem(*PROBLEM), {})
+    assert [step.to_dict() for step in steps] == [step.to_dict() for step in inline]
+
+
+def test_step_budget():
+    pool = RunPool(1, RunLimits(timeout=30, max_steps=5))
+    with pytest.raises(RunBudgetExceeded) as exc:
+        pool.run(build_steps, *PROBLEM, {})
+    assert exc.value.reason == "steps"
+    assert exc.value.limit == 5
+    assert exc.value.to_dict()["error"] == "Run exceeded the 5-step limit"
+
+
+def test_timeout_kills_the_run_and_reports_progress():
+    pool = RunPool(1, RunLimits(timeout=0.3))
+    started = time.monotonic()
+    with pytest.raises(RunBudgetExceeded) as exc:
+        pool.run(_sleep, 30)
+    assert time.monotonic() - started < 5
+    assert exc.value.reason == "timeout"
+    assert exc.value.partial_steps == 3
+
+
+def test_cancelled_run():
+    pool = RunPool(1, RunLimits(timeout=30))
+    with pytest.raises(RunBudgetExceeded) as exc:
+        pool.run(_sleep, 30, cancelled=lambda: True)
+    assert exc.value.reason == "cancelled"
+
+
+def test_errors_from_the_job_are_reraised():
+    pool = RunPool(1, RunLimits(timeout=30))
+    with pytest.raises(ValueError, match="bad input"):
+        pool.run(_fail)
+
+
+def test_stream_yields_items_then_returns():
+    pool = RunPool(1, RunLimits(timeout=30))
+    items = pool.stream(_count, 4)
+    received = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            received.append(next(items))
+    assert received == [0, 1, 2, 3]
+    assert stop.value.value == 4
+
+
+def test_limits_from_env():
+    limits = run_limits_from_env({"RUN_TIMEOUT": "1.5", "RUN_MAX_STEPS": "10", "RUN_MAX_MEMORY_MB": "64"})
+    assert limits == RunLimits(timeout=1.5, max_steps=10, max_memory=64 * 1024 * 1024)
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from core.single_flight import SingleFlight
+
+
+def _wait_for_waiter(flight, key):
+    while flight.waiters(key) == 0:
+        time.sleep(0.001)
+
+
+def _follow(flight, key, fn, out, retry=None):
+    try:
+        out.append(flight.do(key, fn, retry=retry))
+    except Exception as exc:
+        out.append(exc)
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def slow():
+        runs.append(1)
+        release.wait(5)
+        return "body"
+
+    out = []
+    leader = threading.Thread(target=_follow, args=(flight, "k", slow, out))
+    leader.start()
+    while not flight.in_flight("k"):
+        time.sleep(0.001)
+    follower = threading.Thread(target=_follow, args=(flight, "k", slow, out))
+    follower.start()
+    _wait_for_waiter(flight, "k")
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(runs) == 1
+    assert sorted(out, key=lambda r: r[1]) == [("body", False), ("body", True)]
+    assert flight.stats()["collapsed"] == 1
+    assert not flight.in_flight("k")
+
+
+def test_leader_error_is_shared_unless_retried():
+    flight = SingleFlight()
+    call = flight.lead("k")
+    out = []
+    follower = threading.Thread(target=_follow, args=(flight, "k", lambda: "mine", out))
+    follower.start()
+    _wait_for_waiter(flight, "k")
+    flight.finish("k", call, error=ValueError("boom"))
+    follower.join(5)
+    assert isinstance(out[0], ValueError)
+
+    call = flight.lead("k")
+    out = []
+    retry = threading.Thread(
+        target=_follow, args=(flight, "k", lambda: "mine", out, lambda exc: isinstance(exc, ValueError)),
+    )
+    retry.start()
+    _wait_for_waiter(flight, "k")
+    flight.finish("k", call, error=ValueError("cancelled"))
+    retry.join(5)
+    assert out == [("mine", False)]
+
+
+def test_lead_returns_none_while_in_flight():
+    flight = SingleFlight()
+    call = flight.lead("k")
+    assert flight.lead("k") is None
+    flight.finish("k", call, result="body")
+    flight.finish("k", call, error=ValueError("ignored"))
+    assert call.result == "body" and call.error is None
+
+
+def test_file_lock_is_removed_on_release(tmp_path):
+    pytest.importorskip("fcntl")
+    flight = SingleFlight(tmp_path)
+    with flight.file_lock("k") as waited:
+        assert waited is False
+        assert len(list(tmp_path.iterdir())) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_file_lock_waits_for_holder(tmp_path):
+    pytest.importorskip("fcntl")
+    holder, waiter = SingleFlight(tmp_path), SingleFlight(tmp_path, lock_timeout=5)
+    locked = threading.Event()
+
+    def hold():
+        with holder.file_lock("k"):
+            locked.set()
+            time.sleep(0.2)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    locked.wait(5)
+    started = time.monotonic()
+    with waiter.file_lock("k") as waited:
+        assert waited is True
+        assert time.monotonic() - started >= 0.1
+    thread.join(5)
+    assert waiter.stats()["lock_waits"] == 1
+    assert waiter.stats()["lock_timeouts"] == 0
+
+
+def test_file_lock_gives_up_after_timeout(tmp_path):
+    pytest.importorskip("fcntl")
+    holder, waiter = SingleFlight(tmp_path), SingleFlight(tmp_path, lock_timeout=0.1)
+    with holder.file_lock("k"):
+        started = time.monotonic()
+        with waiter.file_lock("k") as waited:
+            assert waited is True
+        assert time.monotonic() - started < 1
+    assert waiter.stats()["lock_timeouts"] == 1
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,130 @@
+import pytest
+
+from core.tracer import Board2DTracer, GraphTracer
+
+
+def _cells(step, attr):
+    return {(r, c) for r, row in enumerate(step.board) for c, cell in enumerate(row) if getattr(cell, attr)}
+
+
+def _edges(step, attr):
+    return {(edge.source, edge.target) for edge in step.graph_edges if getattr(edge, attr)}
+
+
+def test_board_clears_reset_only_their_flag():
+    board = Board2DTracer(3, 4)
+    board.select(0, 0)
+    board.select(2, 3)
+    board.patch(2, 3)
+    board.mark_error(1, 1)
+    board.mark_on_path(1, 2)
+    step = board.snapshot(1)
+    assert _cells(step, "selected") == {(0, 0), (2, 3)}
+
+    board.deselect_all()
+    step = board.snapshot(2)
+    assert _cells(step, "selected") == set()
+    assert _cells(step, "patched") == {(2, 3)}
+    assert _cells(step, "error") == {(1, 1)}
+    assert _cells(step, "on_path") == {(1, 2)}
+
+    board.depatch_all()
+    board.clear_all_errors()
+    board.clear_all_paths()
+    step = board.snapshot(3)
+    assert not any(_cells(step, attr) for attr in ("selected", "patched", "error", "on_path"))
+
+
+def test_board_clear_all_overlays():
+    board = Board2DTracer(2, 2)
+    board.set_overlay(0, 1, "3", "red")
+    board.set_arrow(1, 0, "up")
+    cell = board.snapshot(1).board[0][1]
+    assert (cell.overlay_text, cell.overlay_color) == ("3", "red")
+
+    board.clear_all_overlays()
+    step = board.snapshot(2)
+    assert all(
+        (cell.overlay_text, cell.overlay_color, cell.arrow_dir) == ("", "", "")
+        for row in step.board for cell in row
+    )
+
+
+def test_board_snapshot_reuses_untouched_rows():
+    board = Board2DTracer(3, 3)
+    first = board.snapshot(1)
+    assert board.snapshot(2).board is first.board
+
+    board.set_value(1, 1, 7)
+    second = board.snapshot(3)
+    assert second.board[1][1].value == 7
+    assert second.board[0] is first.board[0] and second.board[2] is first.board[2]
+    assert second.board[1][0] is first.board[1][0]
+
+
+def test_board_rejects_cells_outside_the_grid():
+    board = Board2DTracer(2, 3)
+    with pytest.raises(IndexError):
+        board.select(2, 0)
+    with pytest.raises(IndexError):
+        board.set_value(0, -1, 1)
+
+
+def test_graph_undirected_edges_match_either_way():
+    graph = GraphTracer([0, 1, 2], directed=False)
+    eid = graph.add_edge(0, 1, 5)
+    assert graph.add_edge(0, 1) == eid
+    assert graph.edge_id(1, 0) == eid
+    assert graph.edge_key(1, 0) == (0, 1)
+
+    graph.select_edge(1, 0)
+    assert graph.is_edge_selected(0, 1)
+    assert _edges(graph.snapshot(1), "selected") == {(0, 1)}
+
+    # Adding the other orientation explicitly makes a separate edge.
+    assert graph.add_edge(1, 0) != eid
+    assert len(graph.snapshot(2).graph_edges) == 2
+
+
+def test_graph_bulk_edge_ops():
+    graph = GraphTracer(list(range(4)))
+    for source, target in [(0, 1), (1, 2), (2, 3), (3, 0)]:
+        graph.add_edge(source, target)
+    assert not graph.has_edge(1, 0)
+
+    graph.select_edges([(0, 1), (1, 2), (2, 3), (1, 0)])
+    graph.patch_edges([(2, 3), (3, 0)])
+    step = graph.snapshot(1)
+    assert _edges(step, "selected") == {(0, 1), (1, 2), (2, 3)}
+    assert _edges(step, "patched") == {(2, 3), (3, 0)}
+
+    graph.deselect_edges([(1, 2)])
+    graph.depatch_edges([(3, 0)])
+    graph.set_edges_class([(0, 1), (2, 3)], "tree")
+    step = graph.snapshot(2)
+    assert _edges(step, "selected") == {(0, 1), (2, 3)}
+    assert _edges(step, "patched") == {(2, 3)}
+    assert {(e.source, e.target) for e in step.graph_edges if e.edge_class == "tree"} == {(0, 1), (2, 3)}
+
+
+def test_graph_clear_all_edge_flags():
+    graph = GraphTracer(list(range(3)))
+    graph.add_edge(0, 1)
+    graph.add_edge(1, 2)
+    graph.select_edge(0, 1)
+    graph.patch_edge(1, 2)
+    graph.mark_edge_error(0, 1)
+    first = graph.snapshot(1)
+
+    graph.deselect_all_edges()
+    step = graph.snapshot(2)
+    assert _edges(step, "selected") == set()
+    assert _edges(step, "patched") == {(1, 2)}
+    assert _edges(step, "error") == {(0, 1)}
+    assert step.graph_edges[1] is first.graph_edges[1]
+
+    graph.depatch_all_edges()
+    graph.clear_all_edge_errors()
+    step = graph.snapshot(3)
+    assert not any(_edges(step, attr) for attr in ("selected", "patched", "error"))
+    assert graph.snapshot(4).graph_edges is step.graph_edges
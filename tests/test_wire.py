@@ -0,0 +1,68 @@
+import json
+import shutil
+import struct
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from core.runner import collect_steps, encode_body, load_problem
+from core.wire import WIRE_MAGIC, WIRE_MEDIA_TYPE, WIRE_VERSION
+
+WIRE_JS = Path(__file__).resolve().parent.parent / "static" / "js" / "wire.js"
+
+# One problem per renderer.
+PROBLEMS = [
+    ("problems.flood_fill", "FloodFill"),
+    ("problems.bellman_ford", "BellmanFord"),
+    ("problems.accounts_merge", "AccountsMerge"),
+    ("problems.implement_trie", "ImplementTrie"),
+]
+
+# Decodes a payload from stdin with static/js/wire.js and prints it as JSON.
+_DECODE = """
+const fs = require('fs');
+eval(fs.readFileSync(process.argv[1], 'utf8') + ';globalThis.decodeWireRun = decodeWireRun;');
+const buf = fs.readFileSync(0);
+const run = decodeWireRun(buf.buffer.slice(buf.byteOffset, buf.byteOffset + buf.length));
+process.stdout.write(JSON.stringify(run));
+"""
+
+
+def _canon(value):
+    # JSON steps omit default fields (empty labels, zero curve offsets, ...)
+    # that the decoder fills in; renderers treat both the same.
+    if isinstance(value, list):
+        return [_canon(v) for v in value]
+    if isinstance(value, dict):
+        return {
+            k: _canon(v) for k, v in value.items()
+            if v is not None and v != "" and v is not False and not (k == "curve_offset" and v == 0)
+        }
+    return value
+
+
+def test_header():
+    cls = load_problem(*PROBLEMS[0])
+    body, mimetype = encode_body(cls, collect_steps(cls, {}), {}, binary=True)
+    assert mimetype == WIRE_MEDIA_TYPE
+    magic, version, _ = struct.unpack_from("<4sHH", body)
+    assert (magic, version) == (WIRE_MAGIC, WIRE_VERSION)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run static/js/wire.js")
+@pytest.mark.parametrize("problem", PROBLEMS, ids=[qualname for _, qualname in PROBLEMS])
+def test_round_trip_matches_json_steps(problem):
+    cls = load_problem(*problem)
+    steps = collect_steps(cls, {})
+    body, _ = encode_body(cls, steps, {}, binary=True)
+    decoded = subprocess.run(
+        ["node", "-e", _DECODE, str(WIRE_JS)], input=body, capture_output=True, check=True,
+    )
+    run = json.loads(decoded.stdout)
+
+    assert run["source_code"] == cls.source_code()
+    assert run["renderer_type"] == cls.renderer_type()
+    assert len(run["steps"]) == len(steps)
+    for step, got in zip(steps, run["steps"]):
+        assert _canon(got) == _canon(step.to_dict())